@@ -1,7 +1,9 @@
-from typing import Any, Union
+from typing import Union
 from pathlib import Path
 import pandas as pd
 from ant_upload_checker import constants
+from ant_upload_checker.film_list_types import restore_compact_df_types
+from ant_upload_checker.torrent import Torrent
 
 
 class DupeChecker:
@@ -43,7 +45,9 @@ class DupeChecker:
             )
         )
 
-        return combined_films
+        return restore_compact_df_types(
+            combined_films, self.films_to_dupe_check.dtypes
+        )
 
     def check_if_film_is_duplicate(
         self,
@@ -52,7 +56,7 @@ class DupeChecker:
         codec: str,
         source: str,
         release_group: str,
-        api_response: list[dict[str, Any]],
+        api_response: list[Torrent],
     ) -> str:
         if not api_response:
             return self.not_found_message
@@ -76,23 +80,19 @@ class DupeChecker:
         return self.check_remaining_dupe_properties(dupe_properties, api_response)
 
     def check_if_filename_exists_on_ant(
-        self, file_name: str, api_response: list[dict[str, Any]]
+        self, file_name: str, api_response: list[Torrent]
     ) -> Union[str, None]:
         for existing_upload in api_response:
-            uploaded_files = existing_upload.get("files", [])
-
-            if uploaded_files:
-                for file_info in uploaded_files:
-                    if file_name == file_info.get("name", ""):
-                        return (
-                            "Duplicate",
-                            f"Exact filename already exists: {existing_upload.get('guid',self.guid_missing_message)}",
-                        )
+            if file_name in existing_upload.file_names:
+                return (
+                    "Duplicate",
+                    f"Exact filename already exists: {self.get_guid(existing_upload)}",
+                )
 
     def check_remaining_dupe_properties(
         self,
         dupe_properties,
-        api_response: list[dict[str, Any]],
+        api_response: list[Torrent],
     ) -> str:
         missing_properties = [k for k, v in dupe_properties.items() if not v]
         available_properties = {k: v for k, v in dupe_properties.items() if v}
@@ -101,7 +101,7 @@ class DupeChecker:
             return (
                 "Duplicate - potentially",
                 f"On ANT, but could not dupe check (could not extract {'/'.join(missing_properties)} from filename). "
-                f"{api_response[0].get('guid',self.guid_missing_message)}",
+                f"{self.get_guid(api_response[0])}",
             )
 
         return self.perform_dupe_check(
@@ -112,7 +112,7 @@ class DupeChecker:
         self,
         available_properties: dict[str, str],
         missing_properties: list[str],
-        api_response: list[dict[str, Any]],
+        api_response: list[Torrent],
     ) -> str:
         """
         With the available properties, check if the film is a full duplicate, partial duplicate,
@@ -123,11 +123,11 @@ class DupeChecker:
         existing_guid = self.guid_missing_message
 
         for existing_upload in api_response:
-            existing_guid = existing_upload.get("guid", self.guid_missing_message)
+            existing_guid = self.get_guid(existing_upload)
 
             is_duplicate = all(
                 available_properties[prop].lower()
-                == existing_upload.get(prop, "").lower()
+                == getattr(existing_upload, prop).lower()
                 for prop in available_properties
             )
             if is_duplicate:
@@ -145,3 +145,9 @@ class DupeChecker:
             "Uploadable",
             f"A film with {available_properties_str} does not already exist. {existing_guid}",
         )
+
+    def get_guid(self, existing_upload: Torrent) -> str:
+        if existing_upload.guid is None:
+            return self.guid_missing_message
+
+        return existing_upload.guid
@@ -0,0 +1,57 @@
+import os
+from pathlib import Path
+
+
+class FileRecord:
+    """
+    Compact record of a film file found while scanning the input folders.
+    Holds the stat information the rest of the process needs,
+    so each file only has to be stat'ed once.
+    """
+
+    __slots__ = ("path", "size", "mtime", "inode")
+
+    def __init__(self, path: Path, size: int, mtime: float, inode: int):
+        self.path: Path = path
+        self.size: int = size
+        self.mtime: float = mtime
+        self.inode: int = inode
+
+    @classmethod
+    def from_dir_entry(cls, entry: os.DirEntry) -> "FileRecord":
+        """
+        Create a record from an os.scandir entry. The entry caches its stat
+        result, so no further stat calls are made for this file.
+        """
+        file_stat = entry.stat()
+
+        # On Windows, st_ino is 0 in a scandir entry's cached stat result
+        return cls(
+            Path(entry.path), file_stat.st_size, file_stat.st_mtime, entry.inode()
+        )
+
+    @classmethod
+    def from_path(cls, path: Path) -> "FileRecord":
+        file_stat = path.stat()
+
+        return cls(path, file_stat.st_size, file_stat.st_mtime, file_stat.st_ino)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FileRecord):
+            return NotImplemented
+
+        return (self.path, self.size, self.mtime, self.inode) == (
+            other.path,
+            other.size,
+            other.mtime,
+            other.inode,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.path, self.size, self.mtime, self.inode))
+
+    def __repr__(self) -> str:
+        return (
+            f"FileRecord(path={self.path!r}, size={self.size}, "
+            f"mtime={self.mtime}, inode={self.inode})"
+        )
@@ -0,0 +1,88 @@
+from importlib.util import find_spec
+import pandas as pd
+
+
+FILM_LIST_DF_TYPES = {
+    "Full file path": "string",
+    "Parsed film title": "string",
+    "Film size (GB)": "float64",
+    "Resolution": "string",
+    "Codec": "string",
+    "Source": "string",
+    "Release group": "string",
+    "Already on ANT?": "string",
+    "Info": "string",
+}
+# Columns with only a handful of distinct values across the whole film list
+CATEGORY_COLUMNS = ["Resolution", "Codec", "Source", "Release group", "Already on ANT?"]
+PYARROW_INSTALLED = find_spec("pyarrow") is not None
+# Arrow backed strings are much smaller, but need the optional pyarrow package
+COMPACT_STRING_TYPE = "string[pyarrow]" if PYARROW_INSTALLED else "string"
+
+
+def get_film_list_df_types(compact_dtypes: bool = False) -> dict[str, str]:
+    """
+    Get the film list column types. The compact types store columns with
+    few distinct values as categories, and the remaining text as Arrow strings
+    where pyarrow is installed, which greatly reduces memory use for large lists.
+    """
+    if not compact_dtypes:
+        return FILM_LIST_DF_TYPES.copy()
+
+    return {
+        column: (
+            "category"
+            if column in CATEGORY_COLUMNS
+            else COMPACT_STRING_TYPE if column_type == "string" else column_type
+        )
+        for column, column_type in FILM_LIST_DF_TYPES.items()
+    }
+
+
+def convert_to_film_list_df_types(
+    film_list_df: pd.DataFrame, film_list_df_types: dict[str, str]
+) -> pd.DataFrame:
+    """
+    Convert film list columns to the given types, filling missing text first,
+    since an empty string is not one of the categories of a category column.
+    """
+    text_columns = {
+        column: ""
+        for column, column_type in film_list_df_types.items()
+        if column_type != "float64" and column in film_list_df.columns
+    }
+
+    return film_list_df.fillna(text_columns).astype(
+        {
+            column: column_type
+            for column, column_type in film_list_df_types.items()
+            if column in film_list_df.columns
+        }
+    )
+
+
+def restore_compact_df_types(
+    film_list_df: pd.DataFrame, original_df_types: pd.Series
+) -> pd.DataFrame:
+    """
+    Concatenating or overwriting columns turns category columns back into
+    plain text, so convert them back if the original film list used compact types.
+    """
+    is_compact = any(
+        isinstance(column_type, pd.CategoricalDtype)
+        for column_type in original_df_types
+    )
+    if not is_compact:
+        return film_list_df
+
+    compact_df_types = {
+        column: (
+            "category"
+            if isinstance(column_type, pd.CategoricalDtype)
+            else column_type
+        )
+        for column, column_type in original_df_types.items()
+        if column in film_list_df.columns
+    }
+
+    return film_list_df.astype(compact_df_types)
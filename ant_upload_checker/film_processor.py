@@ -1,76 +1,446 @@
 import pandas as pd
 import numpy as np
-from rebulk.match import MatchesDict
 import logging
+import babelfish
 from guessit import guessit
+from importlib.resources import files
 from pathlib import Path
+from typing import Any, Callable, Optional, Union
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+import hashlib
+import json
+import os
 import re
-import sys
+import stat
+import time
 import shutil
+from ant_upload_checker.file_record import FileRecord
+from ant_upload_checker.film_list_types import (
+    convert_to_film_list_df_types,
+    get_film_list_df_types,
+    restore_compact_df_types,
+)
+from ant_upload_checker.guessit_cache import GuessitCache
+from ant_upload_checker.output import CACHE_FOLDER_NAME, FILM_LIST_STATE_FILE_NAME
+from ant_upload_checker.scan_index import ScanIndex, ScannedFolder
+
+
+# Only these guessit properties are used, so only these are kept
+GUESSIT_PROPERTIES = [
+    "title",
+    "year",
+    "screen_size",
+    "video_codec",
+    "source",
+    "release_group",
+    "type",
+]
+
+# Guessit properties that are never used and can be skipped without changing
+# the properties above. Most unused properties cannot be skipped, since a token
+# they would have claimed (e.g. 10bit or DTS) then ends up in the release group
+GUESSIT_EXCLUDED_PROPERTIES = [
+    "absolute_episode",
+    "aspect_ratio",
+    "bonus_title",
+    "cd_count",
+    "episode_count",
+    "mimetype",
+    "proper_count",
+    "uuid",
+    "video_api",
+    "week",
+    "weekday",
+]
+GUESSIT_OPTIONS = {"excludes": GUESSIT_EXCLUDED_PROPERTIES}
+
+# Columns holding the result of checking a film on ANT
+VERDICT_COLUMNS = ["Already on ANT?", "Info"]
+
+
+# Sections of the guessit config holding words that could appear in a film title
+GUESSIT_KEYWORD_SECTIONS = [
+    "audio_codec",
+    "container",
+    "country",
+    "edition",
+    "language",
+    "other",
+    "part",
+    "source",
+    "streaming_service",
+]
+# Config entries that are not words guessit matches on their own
+GUESSIT_OPTION_KEYS = {
+    "validator",
+    "conflict_solver",
+    "formatter",
+    "tags",
+    "name",
+    "complete_article_words",
+    "season_number_separators",
+    "weak_affixes",
+    "language_prefixes",
+    "language_suffixes",
+}
+# Guessit matches sources, codecs, episode details and websites with patterns
+# built in its code rather than its config
+GUESSIT_BUILT_IN_PATTERN = (
+    r"(?:ahd|hd-?|sd-?|pd-?)?tv(?:-?hd)?|(?:hd-?)?(?:cam|ts|telesync|tc|telecine)"
+    r"|vhs|workprint|wp|ppv|dvb|vod|(?:hd-?)?dvd|ld|laserdisc|dm|web(?:-?dl|-?cap)?"
+    r"|blu-?ray|bd|br|u?hd|sd|rip|divx|dvdivx|xvid|avc(?:hd)?|hevc|[hx]-?26\d"
+    r"|mpe?g|vc-?1|vp\d+|rv\d+|audio|special|pilot|unaired|final|op|ed|oped"
+    r"|cap|enc|www|com|net|org|co"
+)
+
+# Common scene release name tokens understood by the fast parser
+FAST_PARSE_RESOLUTIONS = {"480p", "576p", "720p", "1080p", "1080i", "2160p"}
+FAST_PARSE_SOURCES = {
+    "bluray": "Blu-ray",
+    "blu-ray": "Blu-ray",
+    "bdrip": "Blu-ray",
+    "brrip": "Blu-ray",
+    "web": "Web",
+    "web-dl": "Web",
+    "webrip": "Web",
+    "hdtv": "HDTV",
+    "dvdrip": "DVD",
+}
+FAST_PARSE_CODECS = {
+    "x264": "H.264",
+    "h264": "H.264",
+    "avc": "H.264",
+    "x265": "H.265",
+    "h265": "H.265",
+    "hevc": "H.265",
+    "xvid": "Xvid",
+}
+# Tags allowed between the source and codec, and after the codec
+FAST_PARSE_VIDEO_TAGS = ["hdr", "hdr10", "dv", "10bit", "hdr.dv", "hdr.10bit"]
+FAST_PARSE_AUDIO_TAGS = ["dts", "aac", "ac3", "flac", "truehd", "truehd.atmos"]
+# Release groups that are also tags, e.g. -x264 or -HDR, confuse guessit
+FAST_PARSE_TOKENS = {
+    *FAST_PARSE_RESOLUTIONS,
+    *FAST_PARSE_SOURCES,
+    *FAST_PARSE_CODECS,
+    *FAST_PARSE_VIDEO_TAGS,
+    *FAST_PARSE_AUDIO_TAGS,
+    "uhd",
+    "remux",
+}
+# The tags after the resolution must be in this order:
+# [UHD.]Source[.REMUX][.Video tags].Codec[.Audio tags]. Guessit was checked to
+# agree with every combination in this order, apart from the few the fast parser
+# rejects itself. In other orders guessit can drop or change the source or codec,
+# or take a tag into the release group, so those names are left to guessit.
+FAST_PARSE_RELEASE_TAGS = re.compile(
+    rf"(?P<uhd>uhd\.)?(?P<source>{'|'.join(map(re.escape, FAST_PARSE_SOURCES))})"
+    r"(?:\.remux)?"
+    rf"(?:\.(?P<video_tags>{'|'.join(map(re.escape, FAST_PARSE_VIDEO_TAGS))}))?"
+    rf"\.(?P<codec>{'|'.join(map(re.escape, FAST_PARSE_CODECS))})"
+    rf"(?:\.(?:{'|'.join(map(re.escape, FAST_PARSE_AUDIO_TAGS))}))?"
+)
+# Bump when the fast parser changes which names it accepts or what it returns
+FAST_PARSER_VERSION = "3"
+FAST_PARSE_TITLE_WORD = re.compile(r"[A-Za-z]+(?:['-][A-Za-z]+)*")
+FAST_PARSE_YEAR = re.compile(r"(?:19|20)\d{2}")
+FAST_PARSE_RELEASE_GROUP = re.compile(r"(?!by$|[Xx])[A-Za-z]{2,}", re.IGNORECASE)
+# Folder names guessit may take the title, year or episode details from
+AMBIGUOUS_FOLDER_NAME = re.compile(
+    r"(?<!\d)(?:19|20)\d{2}(?!\d)|\b(?:s\d{1,2}|season\W*\d+|episode\W*\d+|e\d{1,3})\b",
+    re.IGNORECASE,
+)
+
+# Parsed film information depends on the fast parser and the guessit options,
+# so the scan index and guessit cache are cleared whenever either changes
+GUESSIT_OPTIONS_HASH = hashlib.sha256(
+    json.dumps(GUESSIT_OPTIONS, sort_keys=True).encode()
+).hexdigest()[:12]
+PARSER_REVISION = (
+    f"fast-parser-{FAST_PARSER_VERSION}-guessit-options-{GUESSIT_OPTIONS_HASH}"
+)
+
+# Title acronym fixes, e.g. L A Confidential -> L.A Confidential -> L.A. Confidential
+ACRONYM_SPACE = re.compile(r"(?<=\b[A-Za-z]{1})\s(?=[A-Za-z]{1}\b)")
+ACRONYM_WITHOUT_FULL_STOP = re.compile(r"(?<=\.[A-Za-z])(\s|$)(?=[^\s])")
+ACRONYM_AT_END_WITHOUT_FULL_STOP = re.compile(r"(?<=\..$)")
+# Matches any title one of the acronym fixes could change,
+# so titles without acronyms skip the fixes entirely
+ACRONYM_CANDIDATE = re.compile(r"\b[A-Za-z]\s[A-Za-z]\b|\.[A-Za-z](?:\s|$)|\..$")
+
+
+def load_guessit_config() -> dict[str, Any]:
+    return json.loads(
+        files("guessit.config").joinpath("options.json").read_text(encoding="utf-8")
+    )["advanced_config"]
+
+
+def collect_guessit_keywords(
+    value: Any, keywords: set[str], keyword_patterns: list[str], key: str = ""
+) -> None:
+    """
+    Add the words and regex patterns in a section of the guessit config.
+    """
+    if isinstance(value, dict):
+        for child_key, child_value in value.items():
+            collect_guessit_keywords(child_value, keywords, keyword_patterns, child_key)
+    elif isinstance(value, list):
+        for child_value in value:
+            collect_guessit_keywords(child_value, keywords, keyword_patterns, key)
+    elif isinstance(value, str):
+        if key == "regex":
+            keyword_patterns.append(re.sub(r"\(\?P<\w+>", "(?:", value))
+        elif key not in GUESSIT_OPTION_KEYS and re.fullmatch(r"[\w'-]+", value):
+            keywords.add(value.lower())
+
+
+def load_guessit_keywords() -> tuple[frozenset[str], re.Pattern]:
+    """
+    Collect the words and patterns guessit reads as release tags rather than
+    title words, e.g. Limited, Trailer or Directors Cut. Names with title words
+    matching one of these are left to guessit, which may not treat them as a title.
+    """
+    config = load_guessit_config()
+    keywords = set()
+    keyword_patterns = [GUESSIT_BUILT_IN_PATTERN]
+
+    for section in GUESSIT_KEYWORD_SECTIONS:
+        collect_guessit_keywords(config.get(section, {}), keywords, keyword_patterns)
+
+    episodes_config = config.get("episodes", {})
+    for word in episodes_config.get("season_words", []) + episodes_config.get(
+        "episode_words", []
+    ):
+        keywords.add((word["value"] if isinstance(word, dict) else word).lower())
+
+    keyword_pattern = re.compile(
+        rf"(?<![^\W_])(?:{'|'.join(keyword_patterns)})(?![^\W_])", re.IGNORECASE
+    )
+
+    return frozenset(keywords), keyword_pattern
+
+
+def load_guessit_audio_pattern() -> re.Pattern:
+    """
+    Collect the audio codecs, profiles and channels guessit looks for. Guessit
+    can find these at the start or end of a release group, e.g. -HEs or -MADTS.
+    """
+    keywords = set()
+    keyword_patterns = []
+    collect_guessit_keywords(
+        load_guessit_config().get("audio_codec", {}), keywords, keyword_patterns
+    )
+    keyword_patterns.extend(re.escape(keyword) for keyword in keywords)
+
+    return re.compile("|".join(keyword_patterns), re.IGNORECASE)
+
+
+def load_language_words() -> frozenset[str]:
+    """
+    Collect the language and country names and codes guessit looks for,
+    which it removes from the start or end of a title.
+    """
+    converters = babelfish.language_converters
+    language_words = {
+        code.lower()
+        for converter in ("alpha2", "alpha3b", "opensubtitles")
+        for code in converters[converter].codes
+        if isinstance(code, str)
+    }
+    language_words.update(
+        language.name.lower()
+        for language in babelfish.LANGUAGE_MATRIX
+        if language.alpha2 or language.alpha3b
+    )
+    for country in babelfish.COUNTRY_MATRIX:
+        language_words.update([country.name.lower(), country.alpha2.lower()])
+
+    return frozenset(language_words)
+
+
+GUESSIT_KEYWORDS, GUESSIT_KEYWORD_PATTERN = load_guessit_keywords()
+GUESSIT_AUDIO_PATTERN = load_guessit_audio_pattern()
+LANGUAGE_WORDS = load_language_words()
+
+
+def initialise_guessit_worker() -> None:
+    """
+    Guessit builds its rules on first use, so do this once
+    when each parsing process starts rather than on its first film.
+    """
+    guessit("Film.2000.1080p.BluRay.x264-GROUP.mkv", GUESSIT_OPTIONS)
+
+
+def guess_film_properties(file_path: Union[str, Path]) -> dict[str, Any]:
+    """
+    Use guessit to extract film information, returning a plain dictionary
+    of the required properties, which is cheap to send between processes.
+    """
+    guessed_media = guessit(file_path, GUESSIT_OPTIONS)
+
+    return {
+        film_property: guessed_media[film_property]
+        for film_property in GUESSIT_PROPERTIES
+        if film_property in guessed_media
+    }
 
 
 class FilmProcessor:
-    def __init__(self, input_folders: list[str], output_folder: str):
+    def __init__(
+        self,
+        input_folders: list[str],
+        output_folder: str,
+        scan_workers: int = 1,
+        reparse_films: bool = False,
+        full_scan: bool = False,
+        parse_workers: int = 1,
+        compact_dtypes: bool = False,
+    ):
         self.file_extensions: list[str] = ["mp4", "avi", "mkv", "mpeg", "m2ts"]
+        self.film_file_suffixes: set[str] = {
+            os.path.normcase(f".{ext}") for ext in self.file_extensions
+        }
         self.input_folders: list[str] = input_folders
         self.output_folder: Path = Path(output_folder)
-        self.film_list_df_types: dict[str, str] = {
-            "Full file path": "string",
-            "Parsed film title": "string",
-            "Film size (GB)": "float64",
-            "Resolution": "string",
-            "Codec": "string",
-            "Source": "string",
-            "Release group": "string",
-            "Already on ANT?": "string",
-            "Info": "string",
-        }
+        self.scan_workers: int = scan_workers
+        self.reparse_films: bool = reparse_films
+        self.full_scan: bool = full_scan
+        self.parse_workers: int = parse_workers
+        self.film_list_df_types: dict[str, str] = get_film_list_df_types(
+            compact_dtypes
+        )
         self.csv_file_path: Path = self.output_folder / "Film list.csv"
         self.backup_csv_file_path: Path = (
             self.output_folder / "Film list old version backup.csv"
         )
+        self.cache_folder: Path = self.output_folder / CACHE_FOLDER_NAME
+        self.state_file_path: Path = self.cache_folder / FILM_LIST_STATE_FILE_NAME
+        self.run_journal_file_path: Path = self.cache_folder / "run_journal.jsonl"
+        self.scan_index_file_path: Path = self.cache_folder / "scan_index.sqlite"
+        self.guessit_cache_file_path: Path = self.cache_folder / "guessit_cache.sqlite"
+        self.search_cache_file_path: Path = self.cache_folder / "search_cache.sqlite"
+        self.strategy_stats_file_path: Path = (
+            self.cache_folder / "search_strategy_stats.json"
+        )
+        self.previously_scanned_folders: dict[str, ScannedFolder] = {}
+        self.scanned_folders: dict[str, ScannedFolder] = {}
+        self.parsed_film_counts: dict[str, int] = {}
+        self.film_list_changed: bool = True
 
-    def get_film_file_paths(self) -> list[Path]:
+    def get_film_file_records(self) -> list[FileRecord]:
         """
-        Scan the input folder from parameters for the given file extensions,
-        adding any files to a list.
+        Walk each input folder from parameters once, adding a record of any
+        files matching the given file extensions to a list.
+        If more than one scan worker is set, folders are walked in parallel.
+        Unless a full scan is requested, folders that have not been modified
+        since the last run reuse their stored listing instead of being listed again.
         """
-        paths = []
-        for ext in self.file_extensions:
+        scan_index = ScanIndex(self.scan_index_file_path, PARSER_REVISION)
+        if not self.full_scan:
+            self.previously_scanned_folders = scan_index.load_scanned_folders()
+        self.scanned_folders = {}
+
+        if self.scan_workers > 1:
+            film_records = self.scan_input_folders_in_parallel()
+        else:
+            film_records = []
             for folder in self.input_folders:
-                paths.extend(Path(folder).glob(f"**/*.{ext}"))
+                scan_start = time.perf_counter()
+                film_records.extend(self.scan_folder_for_film_records(folder))
+                logging.info(
+                    "Scanned %s in %.2f seconds",
+                    folder,
+                    time.perf_counter() - scan_start,
+                )
+
+        scan_index.save_scanned_folders(self.scanned_folders)
+        scan_index.close()
 
-        filtered_paths = self.remove_paths_containing_extras_folder(paths)
-        cleaned_paths = self.remove_paths_if_unopenable(filtered_paths)
+        if self.previously_scanned_folders:
+            unchanged_folder_count = sum(
+                self.previously_scanned_folders.get(path) is folder
+                for path, folder in self.scanned_folders.items()
+            )
+            logging.info(
+                "%s of %s folders were unchanged since the last run",
+                unchanged_folder_count,
+                len(self.scanned_folders),
+            )
 
-        if not cleaned_paths:
+        if not film_records:
             raise ValueError(
                 "No films were found, check the INPUT_FOLDERS value in parameters.py"
             )
 
-        cleaned_paths.sort()
+        film_records.sort(key=lambda record: record.path)
 
-        return cleaned_paths
+        return film_records
 
-    def get_film_info_from_file_paths(
-        self, film_file_paths: list[Path]
+    def get_film_info_from_file_records(
+        self, film_file_records: list[FileRecord]
     ) -> pd.DataFrame:
-        film_sizes = self.get_film_sizes_from_file_paths(film_file_paths)
-        guessed_films = self.get_guessit_info_from_film_paths(film_file_paths)
-        film_titles = self.get_formatted_titles_from_guessed_films(guessed_films)
-        film_resolutions = self.get_film_resolutions_from_guessed_films(guessed_films)
-        film_codecs = self.get_codec_from_guessed_films(guessed_films)
-        film_sources = self.get_source_from_guessed_films(guessed_films)
-        release_groups = self.get_release_groups_from_guessed_films(guessed_films)
+        """
+        Look up each file in the scan index, only parsing files that are new
+        or have changed size or modification time since the last run.
+        """
+        scan_index = ScanIndex(self.scan_index_file_path, PARSER_REVISION)
 
-        film_list_df = self.create_film_list_dataframe(
-            film_file_paths,
-            film_sizes,
-            film_titles,
-            film_resolutions,
-            film_codecs,
-            film_sources,
-            release_groups,
+        if self.reparse_films:
+            unchanged_films, changed_records = [], film_file_records
+        else:
+            unchanged_films, changed_records = scan_index.split_unchanged_films(
+                film_file_records
+            )
+
+        logging.info(
+            "%s files are unchanged since the last run, %s new or changed files to parse",
+            len(film_file_records) - len(changed_records),
+            len(changed_records),
+        )
+
+        parsed_film_df = self.parse_film_info_from_file_records(changed_records)
+        scan_index.update(changed_records, parsed_film_df, film_file_records)
+        scan_index.close()
+
+        indexed_film_df = self.create_film_list_dataframe(
+            [record.path for record, _ in unchanged_films],
+            [self.convert_bytes_to_gb(record.size) for record, _ in unchanged_films],
+            [film.title for _, film in unchanged_films],
+            [film.resolution for _, film in unchanged_films],
+            [film.codec for _, film in unchanged_films],
+            [film.source for _, film in unchanged_films],
+            [film.release_group for _, film in unchanged_films],
+        )
+
+        # Keep films in the same order as the scanned file records
+        record_order = {
+            str(record.path): position
+            for position, record in enumerate(film_file_records)
+        }
+        film_list_df = (
+            pd.concat([indexed_film_df, parsed_film_df])
+            .sort_values(
+                by="Full file path", key=lambda paths: paths.map(record_order)
+            )
+            .reset_index(drop=True)
+            .pipe(restore_compact_df_types, parsed_film_df.dtypes)
+        )
+
+        return film_list_df
+
+    def parse_film_info_from_file_records(
+        self, film_file_records: list[FileRecord]
+    ) -> pd.DataFrame:
+        film_file_paths = [record.path for record in film_file_records]
+        guessed_media = self.get_guessit_info_from_film_paths(film_file_paths)
+
+        film_list_df = self.create_film_list_dataframe_from_guessed_media(
+            film_file_records, guessed_media
         )
 
         return film_list_df
@@ -83,7 +453,7 @@ class FilmProcessor:
         if not should_read_csv:
             return film_list_df
 
-        existing_film_list = pd.read_csv(self.csv_file_path)
+        existing_film_list = self.read_existing_film_list()
 
         should_combine_film_lists = self.check_if_existing_csv_is_compatible(
             existing_film_list
@@ -98,83 +468,274 @@ class FilmProcessor:
 
         return film_list_df
 
+    def read_existing_film_list(self) -> pd.DataFrame:
+        """
+        Load the existing film list from the state file saved alongside the CSV,
+        which keeps its column types and loads much faster. Fall back to the CSV
+        if there is no state file, or the CSV has been edited since it was saved.
+        """
+        if self.check_if_state_file_is_current():
+            try:
+                return pd.read_parquet(self.state_file_path)
+            except (ImportError, OSError, ValueError) as err:
+                logging.warning(
+                    "Could not load the film list state file, reading %s instead: %s",
+                    self.csv_file_path,
+                    err,
+                )
+
+        return pd.read_csv(self.csv_file_path)
+
+    def check_if_state_file_is_current(self) -> bool:
+        try:
+            state_file_mtime = self.state_file_path.stat().st_mtime
+        except OSError:
+            return False
+
+        return state_file_mtime >= self.csv_file_path.stat().st_mtime
+
     def combine_current_film_list_with_existing_csv(
         self, existing_film_list: pd.DataFrame, current_film_list: pd.DataFrame
     ) -> pd.DataFrame:
+        """
+        Join the existing film list onto the current one by full file path,
+        reusing the existing verdict of files whose size and parsed title are
+        unchanged. Changed files are searched again, and files that no longer
+        exist are dropped, which marks the film list as changed.
+        """
+        logging.info("Combining existing output file with current list of films...")
 
-        logging.info(
-            "Combining existing output file with current list of films "
-            "and dropping duplicate film titles..."
-        )
-        existing_film_list_formatted = existing_film_list.astype(
-            self.film_list_df_types
+        existing_films_by_path = (
+            convert_to_film_list_df_types(existing_film_list, self.film_list_df_types)
+            .drop_duplicates(subset=["Full file path"], keep="last")
+            .set_index("Full file path")
         )
+        combined_film_list = current_film_list.reset_index(drop=True)
+        previous_films = existing_films_by_path.reindex(
+            combined_film_list["Full file path"]
+        ).reset_index(drop=True)
+
+        is_unchanged = (
+            previous_films["Film size (GB)"].eq(combined_film_list["Film size (GB)"])
+            & previous_films["Parsed film title"].eq(
+                combined_film_list["Parsed film title"]
+            )
+        ).fillna(False).astype(bool)
 
-        combined_film_list = (
-            pd.concat([current_film_list, existing_film_list_formatted])
-            .drop_duplicates(subset=["Parsed film title"], keep="last")
-            .reset_index(drop=True)
-            .fillna("")  # Fill NAs with empty strings for later dupe handling
+        for column in VERDICT_COLUMNS:
+            combined_film_list[column] = (
+                previous_films[column]
+                .astype(object)
+                .where(is_unchanged, combined_film_list[column].astype(object))
+            )
+
+        deleted_film_count = len(existing_films_by_path) - int(
+            combined_film_list["Full file path"].isin(existing_films_by_path.index).sum()
+        )
+        self.film_list_changed = deleted_film_count > 0 or not is_unchanged.all()
+        logging.info(
+            "Reusing the existing results of %s unchanged files, "
+            "%s files are new or changed, %s deleted files were dropped",
+            int(is_unchanged.sum()),
+            len(combined_film_list) - int(is_unchanged.sum()),
+            deleted_film_count,
         )
 
-        self.stop_process_if_all_films_already_in_existing_csv(combined_film_list)
+        combined_film_list = convert_to_film_list_df_types(
+            combined_film_list, self.film_list_df_types
+        )
 
         return combined_film_list
 
-    def stop_process_if_all_films_already_in_existing_csv(
-        self, combined_film_list_df: pd.DataFrame
-    ) -> None:
-        if all(
-            combined_film_list_df["Already on ANT?"].str.contains(
-                r"^Duplicate:", regex=True, na=False
-            )
-        ):
+    def scan_input_folders_in_parallel(self) -> list[FileRecord]:
+        """
+        Walk the input folders on a bounded thread pool. The top level of each
+        input folder is listed first, then each of its sub folders is walked as
+        a separate task, so a single large or slow folder is also split up.
+        Each input folder's scan time adds up the time spent on its own tasks,
+        since tasks from different input folders run at the same time.
+        """
+        film_records = []
+        scan_start = time.perf_counter()
+        scan_times = {folder: 0.0 for folder in self.input_folders}
+        finish_times = {}
+
+        with ThreadPoolExecutor(max_workers=self.scan_workers) as executor:
+            pending_scans = {
+                executor.submit(
+                    self.run_timed_scan, self.scan_single_folder, folder
+                ): (folder, True)
+                for folder in self.input_folders
+            }
+
+            while pending_scans:
+                finished_scans, _ = wait(pending_scans, return_when=FIRST_COMPLETED)
+                for scan in finished_scans:
+                    input_folder, is_top_level = pending_scans.pop(scan)
+                    scan_result, scan_time = scan.result()
+
+                    if is_top_level:
+                        folder_records, sub_folders = scan_result
+                        for sub_folder in sub_folders:
+                            sub_folder_scan = executor.submit(
+                                self.run_timed_scan,
+                                self.scan_folder_for_film_records,
+                                sub_folder,
+                            )
+                            pending_scans[sub_folder_scan] = (input_folder, False)
+                    else:
+                        folder_records = scan_result
+
+                    film_records.extend(folder_records)
+                    scan_times[input_folder] += scan_time
+                    finish_times[input_folder] = time.perf_counter() - scan_start
+
+        for folder, scan_time in scan_times.items():
             logging.info(
-                "All films have already been searched and are duplicates. "
-                "\n\nEnding the process early.\n\n----"
+                "Scanned %s in %.2f seconds, finished after %.2f seconds",
+                folder,
+                scan_time,
+                finish_times[folder],
             )
-            sys.exit(0)
 
-    def remove_paths_containing_extras_folder(
-        self, file_paths: list[Path]
-    ) -> list[Path]:
+        return film_records
+
+    def run_timed_scan(
+        self, scan_function: Callable[[Union[str, Path]], Any], folder: Union[str, Path]
+    ) -> tuple[Any, float]:
+        scan_start = time.perf_counter()
+        scan_result = scan_function(folder)
+
+        return scan_result, time.perf_counter() - scan_start
+
+    def scan_folder_for_film_records(
+        self, folder: Union[str, Path]
+    ) -> list[FileRecord]:
         """
-        Remove any file file paths containing Extras as their parent folder.
+        Walk a folder and its sub folders with os.scandir, matching every
+        film file extension in a single pass.
+        Extras folders are skipped while walking rather than filtered out afterwards.
         """
-        cleaned_paths = [path for path in file_paths if path.parent.name != "Extras"]
+        film_records = []
+        folders_to_scan = [folder]
 
-        return cleaned_paths
+        while folders_to_scan:
+            folder_records, sub_folders = self.scan_single_folder(
+                folders_to_scan.pop()
+            )
+            film_records.extend(folder_records)
+            folders_to_scan.extend(sub_folders)
 
-    def get_film_sizes_from_file_paths(self, file_paths: list[Path]) -> list[float]:
-        film_sizes = [self.get_file_size_from_path(path) for path in file_paths]
+        return film_records
 
-        return film_sizes
+    def scan_single_folder(
+        self, folder: Union[str, Path]
+    ) -> tuple[list[FileRecord], list[str]]:
+        """
+        List a single folder, returning records of the film files it contains
+        and the sub folders that should be walked next.
+        A folder's modification time only changes when files or folders are
+        added, removed or renamed directly inside it, so if it matches the
+        last run, the previous listing is reused, with its film files re-stat'ed.
+        """
+        folder_key = str(folder)
+        try:
+            folder_mtime = os.stat(folder).st_mtime
+        except OSError as err:
+            logging.warning("Folder %s could not be scanned, skipping: %s", folder, err)
+            return [], []
+
+        previous_scan = self.previously_scanned_folders.get(folder_key)
+        if previous_scan is not None and previous_scan.mtime == folder_mtime:
+            current_scan = self.refresh_reused_folder(previous_scan)
+            self.scanned_folders[folder_key] = current_scan
+            return current_scan.film_records, current_scan.sub_folders
+
+        film_records = []
+        sub_folders = []
 
-    def remove_paths_if_unopenable(self, paths):
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if self.should_walk_folder(entry.name, entry.is_symlink()):
+                            sub_folders.append(entry.path)
+                    elif self.is_film_file_name(entry.name):
+                        film_record = self.create_file_record_if_openable(entry)
+                        if film_record is not None:
+                            film_records.append(film_record)
+        except OSError as err:
+            logging.warning("Folder %s could not be scanned, skipping: %s", folder, err)
+            return film_records, sub_folders
+
+        self.scanned_folders[folder_key] = ScannedFolder(
+            folder_mtime, film_records, sub_folders
+        )
+
+        return film_records, sub_folders
+
+    def refresh_reused_folder(self, previous_scan: ScannedFolder) -> ScannedFolder:
         """
-        If file does not exist or is not openable, remove from paths.
-        Warn user if path exceeds 260 characters.
+        Files replaced in place, e.g. a film overwritten with a new copy, do not
+        change their folder's modification time, so stat each reused film file
+        again. This still skips listing the folder and any files that are not films.
+        The previous listing is returned as is if none of its films have changed.
         """
-        cleaned_paths = []
-        for path in paths:
-            if not path.is_file():
-                file_name = path.stem
-                warning_message = (
-                    f"{file_name} could not be opened or does not exist, skipping."
+        film_records = []
+        for record in previous_scan.film_records:
+            try:
+                film_records.append(FileRecord.from_path(record.path))
+            except OSError:
+                logging.warning(
+                    "%s could not be opened or does not exist, skipping.",
+                    record.path.stem,
                 )
-                if len(str(path)) > 260:
-                    warning_message += " This may be caused by a file path exceeding 260 characters. Try shortening the folder or file name."
-                logging.warning(warning_message)
-            else:
-                cleaned_paths.append(path)
 
-        return cleaned_paths
+        if film_records == previous_scan.film_records:
+            return previous_scan
+
+        return ScannedFolder(
+            previous_scan.mtime, film_records, previous_scan.sub_folders
+        )
+
+    def should_walk_folder(self, folder_name: str, is_symlink: bool) -> bool:
+        """
+        Extras folders are skipped along with everything inside them,
+        and like glob, symlinked folders are not followed.
+        """
+        return folder_name != "Extras" and not is_symlink
+
+    def is_film_file_name(self, file_name: str) -> bool:
+        file_suffix = os.path.splitext(file_name)[1]
 
-    def get_file_size_from_path(self, file_path: Path) -> float:
-        file_size_in_bytes = file_path.stat().st_size
-        file_size = self.convert_bytes_to_gb(file_size_in_bytes)
+        return os.path.normcase(file_suffix) in self.film_file_suffixes
 
-        return file_size
+    def create_file_record_if_openable(
+        self, entry: os.DirEntry
+    ) -> Optional[FileRecord]:
+        """
+        Create a file record from a scanned folder entry, using its cached stat result.
+        If file does not exist or is not openable, warn the user and return None.
+        Warn user if path exceeds 260 characters.
+        """
+        try:
+            film_record = FileRecord.from_dir_entry(entry)
+            is_openable = stat.S_ISREG(entry.stat().st_mode)
+        except OSError:
+            is_openable = False
+
+        if not is_openable:
+            file_name = Path(entry.name).stem
+            warning_message = (
+                f"{file_name} could not be opened or does not exist, skipping."
+            )
+            if len(entry.path) > 260:
+                warning_message += " This may be caused by a file path exceeding 260 characters. Try shortening the folder or file name."
+            logging.warning(warning_message)
+
+            return None
+
+        return film_record
 
     def convert_bytes_to_gb(self, num_in_bytes: int) -> float:
         """
@@ -186,94 +747,274 @@ class FilmProcessor:
 
     def get_guessit_info_from_film_paths(
         self, file_paths: list[Path]
-    ) -> list[MatchesDict]:
+    ) -> list[dict[str, Any]]:
         """
-        Use guessit package to extract film information
-        into ordered dictionary.
+        Extract film information into dictionaries, one for each path in the same
+        order. Standard scene release names are parsed directly by the fast parser,
+        and only the remaining names use the guessit package.
+        Paths already in the guessit cache are not guessed again.
         """
-        logging.info("Using Guessit to extract film information, may take a while...")
-        guessed_media = [guessit(path) for path in file_paths]
-        guessed_films = [media for media in guessed_media if media.get("type") == "movie"]
+        fast_parsed_films = {}
+        for path in file_paths:
+            fast_parsed_film = self.fast_parse_film_properties(path)
+            if fast_parsed_film is not None:
+                fast_parsed_films[path] = fast_parsed_film
+
+        paths_to_look_up = [path for path in file_paths if path not in fast_parsed_films]
+
+        guessit_cache = GuessitCache(
+            self.guessit_cache_file_path, parser_revision=PARSER_REVISION
+        )
+        cached_guesses = guessit_cache.get_cached_guesses(paths_to_look_up)
+
+        paths_to_guess = [
+            path
+            for path in paths_to_look_up
+            if guessit_cache.normalise_path(path) not in cached_guesses
+        ]
+        self.parsed_film_counts = {
+            "fast parser": len(fast_parsed_films),
+            "guessit cache": len(paths_to_look_up) - len(paths_to_guess),
+            "guessit": len(paths_to_guess),
+        }
+        logging.info(
+            "Parsed %s files with the fast parser",
+            self.parsed_film_counts["fast parser"],
+        )
+        logging.info(
+            "Using Guessit to extract film information for %s files "
+            "(%s already cached), may take a while...",
+            self.parsed_film_counts["guessit"],
+            self.parsed_film_counts["guessit cache"],
+        )
+        new_guesses = self.guess_film_properties_from_paths(paths_to_guess)
 
+        guessit_cache.store_guesses(paths_to_guess, new_guesses)
+        guessit_cache.close()
+
+        all_guesses = {
+            **cached_guesses,
+            **{
+                guessit_cache.normalise_path(path): guess
+                for path, guess in zip(paths_to_guess, new_guesses)
+            },
+        }
+        guessed_media = [
+            fast_parsed_films[path]
+            if path in fast_parsed_films
+            else all_guesses[guessit_cache.normalise_path(path)]
+            for path in file_paths
+        ]
         logging.info("Finished using Guessit to extract film information")
 
-        return guessed_films
+        return guessed_media
 
-    def get_formatted_titles_from_guessed_films(
-        self, guessed_films: list[MatchesDict]
-    ) -> list[str]:
+    def fast_parse_film_properties(
+        self, file_path: Union[str, Path]
+    ) -> Optional[dict[str, Any]]:
         """
-        Get film titles from guessit objects, then fix titles missing
-        full stops within acronyms
+        Parse a standard scene release name, e.g. Title.Year.Resolution.Source.Codec-GROUP,
+        into the same properties guessit would return, without using guessit.
+        Returns None for any name that does not follow this pattern, or that
+        guessit could read differently, so it can be left to guessit instead.
         """
-        titles = [
-            self.get_film_attribute_from_guessed_film(film, "title")
-            for film in guessed_films
-        ]
-        cleaned_titles = [self.fix_title_if_contains_acronym(title) for title in titles]
+        file_path = Path(file_path)
+        release_name, _, release_group = file_path.stem.rpartition("-")
+        if not self.is_fast_parseable_release_group(release_group):
+            return None
+
+        tokens = release_name.split(".")
+        year_position = next(
+            (
+                position
+                for position, token in enumerate(tokens)
+                if not FAST_PARSE_TITLE_WORD.fullmatch(token)
+            ),
+            len(tokens),
+        )
+        title_words = tokens[:year_position]
+        if (
+            not title_words
+            or year_position + 2 > len(tokens)
+            or not FAST_PARSE_YEAR.fullmatch(tokens[year_position])
+            or not self.is_fast_parseable_title(title_words)
+        ):
+            return None
 
-        return cleaned_titles
+        year = tokens[year_position]
+        resolution = tokens[year_position + 1].lower()
+        if resolution not in FAST_PARSE_RESOLUTIONS:
+            return None
 
-    def get_film_attribute_from_guessed_film(
-        self, guessed_film: MatchesDict, attribute: str
-    ) -> str:
+        release_tags = FAST_PARSE_RELEASE_TAGS.fullmatch(
+            ".".join(tokens[year_position + 2 :]).lower()
+        )
+        if release_tags is None:
+            return None
+
+        source = FAST_PARSE_SOURCES[release_tags["source"]]
+        # Guessit finds no source in e.g. WEB.HDR.H264, so leave these to guessit
+        if source == "Web" and release_tags["video_tags"]:
+            return None
+        if source == "Blu-ray" and (resolution == "2160p" or release_tags["uhd"]):
+            source = "Ultra HD Blu-ray"
+        elif release_tags["uhd"]:
+            return None
+
+        title = " ".join(title_words)
+        # Guessit also reads film details from folder names that include a year,
+        # or season and episode numbers, unless they match the file name
+        for folder_name in file_path.parent.parts:
+            if (
+                folder_name not in (file_path.stem, f"{title} ({year})")
+                and AMBIGUOUS_FOLDER_NAME.search(folder_name)
+            ):
+                return None
+
+        return {
+            "title": title,
+            "year": int(year),
+            "screen_size": resolution,
+            "video_codec": FAST_PARSE_CODECS[release_tags["codec"]],
+            "source": source,
+            "release_group": release_group,
+            "type": "movie",
+        }
+
+    def is_fast_parseable_title(self, title_words: list[str]) -> bool:
         """
-        Extract the given guessit attribute from a given guessit object.
+        Guessit joins consecutive single letters in different ways,
+        e.g. L.A.Confidential -> L A Confidential but E.T -> E.T., may read title
+        words as release tags, and removes languages from the start or end of
+        a title, so leave these titles to guessit.
         """
-        try:
-            film_attribute = guessed_film[attribute]
-            if isinstance(film_attribute, list):
-                film_attribute = ", ".join(film_attribute)
-        except:
-            film_attribute = ""
-
-        return film_attribute
-
-    def get_film_resolutions_from_guessed_films(
-        self, guessed_films: list[MatchesDict]
-    ) -> list[str]:
-        film_resolutions = [
-            self.get_film_attribute_from_guessed_film(film, "screen_size")
-            for film in guessed_films
-        ]
+        single_letter_count = sum(len(word) == 1 for word in title_words)
+        if single_letter_count > 1 or len(title_words[-1]) == 1:
+            return False
 
-        return film_resolutions
+        if {title_words[0].lower(), title_words[-1].lower()} & LANGUAGE_WORDS:
+            return False
 
-    def get_codec_from_guessed_films(
-        self, guessed_films: list[MatchesDict]
-    ) -> list[str]:
-        film_codecs = [
-            self.get_film_attribute_from_guessed_film(film, "video_codec")
-            for film in guessed_films
-        ]
+        for word in title_words:
+            for word_part in re.split(r"['-]", word):
+                if word_part.lower() in GUESSIT_KEYWORDS:
+                    return False
+
+        return not GUESSIT_KEYWORD_PATTERN.search("-".join(title_words))
+
+    def is_fast_parseable_release_group(self, release_group: str) -> bool:
+        """
+        Guessit reads release groups that look like release tags as tags,
+        e.g. -x264, -HDR or -2160p, can read a tag at the start or end of a
+        group as part of the release tags, e.g. -TVRip, -DTSES or -ScrBD, and
+        reads numbers as part numbers, e.g. -CD1, so leave these names to guessit.
+        """
+        if not FAST_PARSE_RELEASE_GROUP.fullmatch(release_group):
+            return False
 
-        film_codecs_cleaned = [re.sub(r"\.", "", codec) for codec in film_codecs]
+        if release_group.lower() in GUESSIT_KEYWORDS:
+            return False
 
-        return film_codecs_cleaned
+        return not any(
+            word_part.lower() in FAST_PARSE_TOKENS
+            or GUESSIT_KEYWORD_PATTERN.fullmatch(word_part)
+            or GUESSIT_AUDIO_PATTERN.fullmatch(word_part)
+            for end in range(2, len(release_group) + 1)
+            for word_part in (release_group[:end], release_group[-end:])
+        )
 
-    def get_source_from_guessed_films(
-        self, guessed_films: list[MatchesDict]
-    ) -> list[str]:
-        film_sources = [
-            self.get_film_attribute_from_guessed_film(film, "source")
-            for film in guessed_films
-        ]
+    def guess_film_properties_from_paths(
+        self, file_paths: list[Path]
+    ) -> list[dict[str, Any]]:
+        """
+        If more than one parse worker is set, files are split into chunks
+        and parsed by a pool of processes, keeping the original order.
+        """
+        if self.parse_workers > 1 and len(file_paths) > 1:
+            chunk_size = max(1, len(file_paths) // (self.parse_workers * 4))
+            with ProcessPoolExecutor(
+                max_workers=self.parse_workers, initializer=initialise_guessit_worker
+            ) as executor:
+                return list(
+                    executor.map(guess_film_properties, file_paths, chunksize=chunk_size)
+                )
 
-        film_sources_cleaned = [
-            re.sub("Ultra HD Blu-ray", "Blu-ray", source) for source in film_sources
-        ]
+        return [guess_film_properties(path) for path in file_paths]
+
+    def create_film_list_dataframe_from_guessed_media(
+        self, film_file_records: list[FileRecord], guessed_media: list[dict[str, Any]]
+    ) -> pd.DataFrame:
+        """
+        Fill each film list column in a single pass over the guessed media,
+        keeping each film's path and size alongside its properties.
+        Anything guessit did not recognise as a film is left out.
+        """
+        film_file_paths = []
+        film_sizes = []
+        film_titles = []
+        film_resolutions = []
+        film_codecs = []
+        film_sources = []
+        film_release_groups = []
+
+        for record, media in zip(film_file_records, guessed_media):
+            if media.get("type") != "movie":
+                continue
+
+            film_file_paths.append(record.path)
+            film_sizes.append(self.convert_bytes_to_gb(record.size))
+            film_titles.append(self.format_guessed_property(media.get("title")))
+            film_resolutions.append(
+                self.format_guessed_property(media.get("screen_size"))
+            )
+            film_codecs.append(
+                self.format_guessed_property(media.get("video_codec")).replace(".", "")
+            )
+            film_sources.append(
+                self.format_guessed_property(media.get("source")).replace(
+                    "Ultra HD Blu-ray", "Blu-ray"
+                )
+            )
+            film_release_groups.append(
+                self.format_guessed_property(media.get("release_group")).lower()
+            )
 
-        return film_sources_cleaned
+        film_list_df = self.create_film_list_dataframe(
+            film_file_paths,
+            film_sizes,
+            self.fix_titles_if_contain_acronyms(film_titles),
+            film_resolutions,
+            film_codecs,
+            film_sources,
+            film_release_groups,
+        )
 
-    def get_release_groups_from_guessed_films(
-        self, guessed_films: list[MatchesDict]
-    ) -> list[str]:
-        release_groups = [
-            self.get_film_attribute_from_guessed_film(film, "release_group").lower()
-            for film in guessed_films
-        ]
+        return film_list_df
 
-        return release_groups
+    def format_guessed_property(self, film_property: Any) -> str:
+        """
+        Convert a guessed property to a string, joining properties
+        guessit found more than once. Missing properties become "".
+        """
+        if film_property is None:
+            return ""
+        if isinstance(film_property, list):
+            return ", ".join(str(value) for value in film_property)
+
+        return str(film_property)
+
+    def fix_titles_if_contain_acronyms(self, film_titles: list[str]) -> list[str]:
+        """
+        Fix acronyms in a whole column of titles at once. Only titles that could
+        contain an acronym are fixed, and each distinct title only once.
+        """
+        fixed_titles = {
+            title: self.fix_title_if_contains_acronym(title)
+            for title in set(film_titles)
+            if ACRONYM_CANDIDATE.search(title)
+        }
+
+        return [fixed_titles.get(title, title) for title in film_titles]
 
     def fix_title_if_contains_acronym(self, film_title: str) -> str:
         """
@@ -282,18 +1023,14 @@ class FilmProcessor:
         e.g. L A Confidential -> L.A Confidential -> L.A. Confidential
         e.g. S W A T -> S.W.A.T -> S.W.A.T.
         """
-        acronym_spaces_as_full_stops = re.sub(
-            r"(?<=\b[A-Za-z]{1})\s(?=[A-Za-z]{1}\b)", ".", film_title
-        )
+        acronym_spaces_as_full_stops = ACRONYM_SPACE.sub(".", film_title)
 
-        acronym_suffixed_with_a_full_stop = re.sub(
-            r"(?<=\.[A-Za-z])(\s|$)(?=[^\s])", ". ", acronym_spaces_as_full_stops
+        acronym_suffixed_with_a_full_stop = ACRONYM_WITHOUT_FULL_STOP.sub(
+            ". ", acronym_spaces_as_full_stops
         )
 
-        acronym_at_end_of_title_suffixed_with_full_stop = re.sub(
-            r"(?<=\..$)",
-            ".",
-            acronym_suffixed_with_a_full_stop,
+        acronym_at_end_of_title_suffixed_with_full_stop = (
+            ACRONYM_AT_END_WITHOUT_FULL_STOP.sub(".", acronym_suffixed_with_a_full_stop)
         )
 
         return acronym_at_end_of_title_suffixed_with_full_stop
@@ -1,25 +1,69 @@
 import pandas as pd
 import requests
 import logging
-from pathlib import Path
-from typing import Any, Union
-from ratelimit import limits, sleep_and_retry
-import re
+import threading
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 from requests.adapters import HTTPAdapter, Retry
+from ant_upload_checker.film_list_types import restore_compact_df_types
+from ant_upload_checker.json_decoding import decode_json
+from ant_upload_checker.rate_limiter import RateLimiter, parse_retry_after
+from ant_upload_checker.run_journal import RunJournal
+from ant_upload_checker.search_cache import SearchCache, normalise_search_title
+from ant_upload_checker.torrent import Torrent, parse_api_response
+from ant_upload_checker.search_strategies import (
+    TITLE_STRATEGY,
+    SearchStrategyStats,
+    get_candidate_queries,
+)
+
+
+ANT_API_URL = "https://anthelion.me/api.php"
+# Films with these verdicts in the existing film list are not searched for again
+SKIPPED_VERDICT_REGEX = r"^Duplicate|^Banned"
+SEARCH_RATE_LIMIT_CALLS = 1
+SEARCH_RATE_LIMIT_PERIOD = 2
+# ANT responds with these when searches are too frequent or it is overloaded
+RATE_LIMITED_STATUS_CODES = [429, 503]
 
 
 class FilmSearcher:
-    def __init__(self, film_list_df: pd.DataFrame, api_key: str):
+    def __init__(
+        self,
+        film_list_df: pd.DataFrame,
+        api_key: str,
+        run_journal: Optional[RunJournal] = None,
+        search_cache: Optional[SearchCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        search_workers: int = 1,
+        strategy_stats: Optional[SearchStrategyStats] = None,
+        ant_url: str = ANT_API_URL,
+    ):
         self.film_list_df: pd.DataFrame = film_list_df
         self.api_key: str = api_key
-        self.ant_url = "https://anthelion.me/api.php"
+        self.run_journal: Optional[RunJournal] = run_journal
+        self.search_cache: Optional[SearchCache] = search_cache
+        self.cached_search_count: int = 0
+        self.rate_limiter: RateLimiter = rate_limiter or RateLimiter(
+            SEARCH_RATE_LIMIT_CALLS / SEARCH_RATE_LIMIT_PERIOD
+        )
+        self.max_rate_limited_retries: int = 5
+        self.search_workers: int = search_workers
+        self.strategy_stats: SearchStrategyStats = (
+            strategy_stats or SearchStrategyStats()
+        )
+        self.lock: threading.Lock = threading.Lock()
+        self.ant_url: str = ant_url
         self.session: requests.Session = requests.Session()
         self.not_found_value: str = "NOT FOUND"
 
-        retries = Retry(
-            total=3, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504]
+        # 503s are retried by the rate limiter, so they also slow down later searches
+        retries = Retry(total=3, backoff_factor=0.1, status_forcelist=[500, 502, 504])
+        adapter = HTTPAdapter(
+            max_retries=retries, pool_maxsize=max(search_workers, 10)
         )
-        self.session.mount("https://", HTTPAdapter(max_retries=retries))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def check_if_films_exist_on_ant(self) -> pd.DataFrame:
         """
@@ -28,11 +72,9 @@ class FilmSearcher:
         For any not found, non-dupes, or new films in the list,
         search for these on ANT, indicating whether they exist on ANT or not.
         """
-        regex_to_skip = r"^Duplicate|^Banned"
-
         self.film_list_df["Should skip"] = self.film_list_df[
             "Already on ANT?"
-        ].str.contains(regex_to_skip, regex=True, na=False)
+        ].str.contains(SKIPPED_VERDICT_REGEX, regex=True, na=False)
 
         films_to_skip = self.film_list_df.loc[self.film_list_df["Should skip"]]
 
@@ -51,10 +93,22 @@ class FilmSearcher:
             .sort_values(by="Parsed film title")
             .reset_index(drop=True)
         )
-        films_to_process["API response"] = films_to_process["Parsed film title"].apply(
-            self.check_if_film_exists_on_ant
+        films_to_process["API response"] = self.search_each_title_once(
+            films_to_process["Parsed film title"]
         )
 
+        self.strategy_stats.log_run_stats()
+        if self.rate_limiter.waited_seconds:
+            logging.info(
+                "Waited %.0f seconds in total for the ANT search rate limit",
+                self.rate_limiter.waited_seconds,
+            )
+        if self.cached_search_count:
+            logging.info(
+                "Reused %s recently saved search results instead of searching ANT",
+                self.cached_search_count,
+            )
+
         films_to_dupe_check = (
             pd.concat([films_to_skip, films_to_process])
             .sort_values(by="Parsed film title")
@@ -66,115 +120,133 @@ class FilmSearcher:
             films_to_dupe_check["API response"].fillna("").apply(list)
         )
 
-        return films_to_dupe_check
+        return restore_compact_df_types(
+            films_to_dupe_check, self.film_list_df.dtypes
+        )
 
-    def check_if_film_exists_on_ant(self, film_title: str) -> list[dict[str, Any]]:
+    def search_each_title_once(self, film_titles: pd.Series) -> pd.Series:
         """
-        Take a film title, and search for it using the ANT API.
-        If an initial match is not found, re-search for a
-        modified version of the film title if it meets certain conditions.
+        Several copies of a film, e.g. a 1080p and a 2160p version, share a title.
+        Search for each title once, then use the response for every copy.
         """
-        logging.info("\nSearching for %s...", film_title)
-        title_checks = [
-            (self.search_for_film_title_on_ant, ""),
-            (self.search_for_film_if_contains_and, ""),
-            (self.search_for_film_if_contains_potential_date_or_time, "time"),
-            (self.search_for_film_if_contains_potential_date_or_time, "date"),
-            (self.search_for_film_if_contains_aka, ""),
-        ]
-        for search_function, optional_argument in title_checks:
-            try:
-                if optional_argument:
-                    search_result = search_function(film_title, optional_argument)
-                else:
-                    search_result = search_function(film_title)
+        normalised_titles = film_titles.map(normalise_search_title)
+        titles_to_search = film_titles.groupby(normalised_titles, sort=False).first()
 
-                if search_result:
-                    return search_result
-            except Exception as err:
-                logging.error(
-                    "An unexpected error occured, skipping film:\n%s", str(err)
+        saved_search_count = len(film_titles) - len(titles_to_search)
+        if saved_search_count:
+            logging.info(
+                "Searching for %s distinct titles, saving %s searches "
+                "for films with more than one copy",
+                len(titles_to_search),
+                saved_search_count,
+            )
+
+        if self.search_workers > 1:
+            # Keep up to search_workers searches in flight at once. Every search
+            # still waits for the shared rate limiter, but waiting for one
+            # response overlaps with waiting for the next rate limit slot
+            executor = ThreadPoolExecutor(max_workers=self.search_workers)
+            try:
+                api_responses = dict(
+                    zip(
+                        titles_to_search.index,
+                        executor.map(
+                            self.check_if_film_exists_on_ant_unless_journaled,
+                            titles_to_search,
+                        ),
+                    )
+                )
+            finally:
+                # Don't start any more searches if one of them ended the run
+                executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            api_responses = {
+                normalised_title: self.check_if_film_exists_on_ant_unless_journaled(
+                    film_title
                 )
+                for normalised_title, film_title in titles_to_search.items()
+            }
 
-        logging.info("--- Not found on ANT ---")
-        return []
+        return normalised_titles.map(api_responses)
 
-    def search_for_film_if_contains_and(self, film_title: str) -> list[dict[str, Any]]:
+    def check_if_film_exists_on_ant_unless_journaled(
+        self, film_title: str
+    ) -> list[Torrent]:
         """
-        If film title contains and or &, replace with the oppposite
-        and search for the new title on ANT. Else, return NOT FOUND.
+        Reuse the result of a search already completed by a resumed run,
+        otherwise search ANT and record the result in the run journal.
         """
-        and_word_regex = r"(?i)\sand\s"
-        and_symbol_regex = r"(?i)\s&\s"
-
-        if re.search(and_word_regex, film_title):
-            logging.info("-- Film contains 'and'")
-            return self.replace_word_and_re_search(film_title, and_word_regex, " & ")
-        elif re.search(and_symbol_regex, film_title):
-            logging.info("-- Film contains '&'")
-            return self.replace_word_and_re_search(
-                film_title, and_symbol_regex, " and "
-            )
+        if self.run_journal is None:
+            return self.check_if_film_exists_on_ant(film_title)
 
-        return []
+        journaled_search = self.run_journal.get_search(film_title)
+        if journaled_search is not None:
+            logging.info("\nAlready searched for %s before resuming", film_title)
+            return journaled_search
 
-    def search_for_film_if_contains_potential_date_or_time(
-        self, film_title: str, format: str
-    ) -> list[dict[str, Any]]:
+        search_result = self.check_if_film_exists_on_ant(film_title)
+        self.run_journal.record_search(film_title, search_result)
+
+        return search_result
+
+    def check_if_film_exists_on_ant(self, film_title: str) -> list[Torrent]:
         """
-        If film title 4 numbers e.g. 1208 East of Bucharest,
-        add colon in middle, re-search title on ANT.
-        Else, return NOT FOUND.
+        Take a film title, and search for it using the ANT API.
+        If an initial match is not found, re-search for
+        modified versions of the film title if it meets certain conditions.
         """
-        if format == "time":
-            numbers_regex = r"(?<=\b\d\d)(?=\d\d\b)"
-            replacement_value = ":"
-        elif format == "date":
-            numbers_regex = r"(?<=\b\d)(?=\d{1,2}\b)"
-            replacement_value = "/"
-        else:
-            raise ValueError("The format argument must be 'time' or 'date'")
+        logging.info("\nSearching for %s...", film_title)
+        candidate_queries = self.strategy_stats.order_candidate_queries(
+            get_candidate_queries(film_title)
+        )
 
-        if re.search(numbers_regex, film_title):
-            logging.info(
-                "-- Film title may contain a date or time without punctuation."
-            )
-            return self.replace_word_and_re_search(
-                film_title, numbers_regex, replacement_value
-            )
+        for candidate_query in candidate_queries:
+            if candidate_query.strategy != TITLE_STRATEGY:
+                logging.info("-- Searching for %s as well...", candidate_query.query)
 
-        return []
+            try:
+                search_result, is_cached = self.search_for_film_title(
+                    candidate_query.query
+                )
+            except Exception as err:
+                logging.error(
+                    "An unexpected error occured, skipping film:\n%s", str(err)
+                )
+                continue
 
-    def search_for_film_if_contains_aka(self, film_title: str) -> list[dict[str, Any]]:
-        aka_regex = r"(?i)\saka\s"
+            # Saved responses say nothing new about how well a strategy works
+            if not is_cached:
+                self.strategy_stats.record_query(
+                    candidate_query.strategy, bool(search_result)
+                )
+            if search_result:
+                return search_result
 
-        if re.search(aka_regex, film_title):
-            logging.info("-- Film title may contain an alternate title")
+        logging.info("--- Not found on ANT ---")
+        return []
 
-            split_titles = re.split(aka_regex, film_title)
+    def search_for_film_title(self, film_title: str) -> tuple[list[Torrent], bool]:
+        """
+        Reuse a recently saved response for the same search if there is one,
+        otherwise search ANT and save the response.
+        Also returns whether the saved response was used.
+        """
+        if self.search_cache is None:
+            return self.search_for_film_title_on_ant(film_title), False
 
-            for title in split_titles:
-                logging.info("-- Searching for %s as well...", title)
-                film_search = self.search_for_film_title_on_ant(title)
-                if film_search != []:
-                    return film_search
-        return []
+        cached_search = self.search_cache.get_search(film_title)
+        if cached_search is not None:
+            logging.info("-- Using the saved search results for %s", film_title)
+            with self.lock:
+                self.cached_search_count += 1
+            return cached_search, True
 
-    def replace_word_and_re_search(
-        self, film_title: str, regex_pattern: str, replacement: str
-    ) -> list[dict[str, Any]]:
-        cleaned_film_title = re.sub(
-            regex_pattern,
-            replacement,
-            film_title,
-        )
-        logging.info("-- Searching for %s as well...", cleaned_film_title)
+        search_result = self.search_for_film_title_on_ant(film_title)
+        self.search_cache.store_search(film_title, search_result)
 
-        return self.search_for_film_title_on_ant(cleaned_film_title)
+        return search_result, False
 
-    @sleep_and_retry
-    @limits(calls=1, period=2)
-    def search_for_film_title_on_ant(self, film_title: str) -> list[dict[str, Any]]:
+    def search_for_film_title_on_ant(self, film_title: str) -> list[Torrent]:
         """
         Use the ANT API to search for a film title and
         return the first URL if found, else a NOT FOUND string
@@ -193,10 +265,10 @@ class FilmSearcher:
             "o": "json",
         }
 
-        response = self.session.get(self.ant_url, params=payload)
+        response = self.get_search_response(payload)
         try:
             response.raise_for_status()
-            response_json = response.json()
+            response_json = decode_json(response.content)
         except requests.exceptions.HTTPError as err:
             logging.error(
                 "HTTP Error: %s",
@@ -204,7 +276,9 @@ class FilmSearcher:
             )
             if response.status_code == 429:
                 logging.error(
-                    "Try increasing the API search period limit to greater than 2"
+                    "ANT is still limiting searches after slowing down %s times. "
+                    "Wait a while before running the script again",
+                    self.max_rate_limited_retries,
                 )
             elif response.status_code == 403:
                 logging.error(
@@ -220,8 +294,35 @@ class FilmSearcher:
         except requests.exceptions.RequestException as err:
             logging.error("The following error occured: %s", err)
             raise SystemExit(err)
+        except ValueError as err:
+            logging.error("ANT responded with invalid JSON: %s", err)
+            raise SystemExit(err)
 
         if response_json["response"]["total"] > 0:
-            return response_json["item"]
+            return parse_api_response(response_json["item"])
         else:
             return []
+
+    def get_search_response(self, payload: dict[str, str]) -> requests.Response:
+        """
+        Send a search once the rate limiter allows it. If ANT responds that
+        searches are too frequent, slow down and send the search again.
+        """
+        for attempt in range(self.max_rate_limited_retries + 1):
+            self.rate_limiter.acquire()
+            response = self.session.get(self.ant_url, params=payload)
+
+            if response.status_code not in RATE_LIMITED_STATUS_CODES:
+                self.rate_limiter.recover()
+                return response
+
+            if attempt < self.max_rate_limited_retries:
+                logging.warning(
+                    "-- ANT responded with HTTP %s, slowing down searches",
+                    response.status_code,
+                )
+                self.rate_limiter.back_off(
+                    parse_retry_after(response.headers.get("Retry-After"))
+                )
+
+        return response
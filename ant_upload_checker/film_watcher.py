@@ -0,0 +1,321 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Union
+import pandas as pd
+from ant_upload_checker.dupe_checker import DupeChecker
+from ant_upload_checker.file_record import FileRecord
+from ant_upload_checker.film_list_types import (
+    convert_to_film_list_df_types,
+    restore_compact_df_types,
+)
+from ant_upload_checker.film_processor import FilmProcessor
+from ant_upload_checker.film_searcher import (
+    ANT_API_URL,
+    SEARCH_RATE_LIMIT_CALLS,
+    SEARCH_RATE_LIMIT_PERIOD,
+    FilmSearcher,
+)
+from ant_upload_checker.output import write_film_list_to_csv
+from ant_upload_checker.rate_limiter import RateLimiter
+from ant_upload_checker.search_cache import SearchCache
+
+
+# Flags from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class FilmWatcher:
+    """
+    Watch the input folders using Linux inotify, and check new films on ANT
+    as they land, instead of re-scanning the whole library.
+    Films are checked in batches, once they have not changed for settle_seconds.
+    """
+
+    def __init__(
+        self,
+        film_processor: FilmProcessor,
+        api_key: str,
+        settle_seconds: float = 5.0,
+        search_cache: Optional[SearchCache] = None,
+        search_workers: int = 1,
+        ant_url: str = ANT_API_URL,
+    ):
+        if not sys.platform.startswith("linux"):
+            raise OSError("Watch mode is only supported on Linux")
+
+        self.film_processor: FilmProcessor = film_processor
+        self.api_key: str = api_key
+        self.settle_seconds: float = settle_seconds
+        self.search_cache: Optional[SearchCache] = search_cache
+        self.search_workers: int = search_workers
+        self.ant_url: str = ant_url
+        # Shared by every batch, so batches close together still respect the rate limit
+        self.rate_limiter: RateLimiter = RateLimiter(
+            SEARCH_RATE_LIMIT_CALLS / SEARCH_RATE_LIMIT_PERIOD
+        )
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.inotify_fd: int = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.inotify_fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"Could not start inotify: {os.strerror(errno)}")
+
+        self.watched_folders: dict[int, str] = {}
+        self.pending_films: dict[str, float] = {}
+        self.pending_film_states: dict[str, Optional[tuple[int, int]]] = {}
+
+    def watch(self) -> None:
+        for folder in self.film_processor.input_folders:
+            self.add_folder_watches(str(folder))
+
+        logging.info(
+            "Watching %s folders for new films, press Ctrl+C to stop...",
+            len(self.watched_folders),
+        )
+
+        try:
+            while True:
+                settled_films = self.wait_for_settled_films()
+                if settled_films:
+                    self.check_films(settled_films)
+        except KeyboardInterrupt:
+            logging.info("\nStopped watching for new films")
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        os.close(self.inotify_fd)
+
+    def add_folder_watches(
+        self, folder: Union[str, Path], queue_existing_films: bool = False
+    ) -> None:
+        """
+        inotify watches are not recursive, so add a watch to the folder and
+        every sub folder that a full scan would walk. For folders that have
+        just appeared, any films already inside them are queued to be checked.
+        """
+        folders_to_watch = [str(folder)]
+
+        while folders_to_watch:
+            current_folder = folders_to_watch.pop()
+
+            watch_descriptor = self.libc.inotify_add_watch(
+                self.inotify_fd, os.fsencode(current_folder), WATCH_MASK
+            )
+            if watch_descriptor < 0:
+                logging.warning(
+                    "Could not watch folder %s: %s",
+                    current_folder,
+                    os.strerror(ctypes.get_errno()),
+                )
+                continue
+            self.watched_folders[watch_descriptor] = current_folder
+
+            try:
+                with os.scandir(current_folder) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            if self.film_processor.should_walk_folder(
+                                entry.name, entry.is_symlink()
+                            ):
+                                folders_to_watch.append(entry.path)
+                        elif (
+                            queue_existing_films
+                            and self.film_processor.is_film_file_name(entry.name)
+                        ):
+                            self.queue_film(entry.path)
+            except OSError as err:
+                logging.warning(
+                    "Folder %s could not be scanned, skipping: %s", current_folder, err
+                )
+
+    def wait_for_settled_films(self, max_wait: Optional[float] = None) -> list[Path]:
+        """
+        Read inotify events until at least one new film has settled, returning
+        every settled film. If max_wait seconds pass first, return an empty list.
+        """
+        wait_until = None if max_wait is None else time.monotonic() + max_wait
+
+        while True:
+            settled_films = self.get_settled_films()
+            if settled_films:
+                return settled_films
+
+            now = time.monotonic()
+
+            timeouts = []
+            if self.pending_films:
+                next_settled = min(self.pending_films.values()) + self.settle_seconds
+                timeouts.append(next_settled - now)
+            if wait_until is not None:
+                if now >= wait_until:
+                    return []
+                timeouts.append(wait_until - now)
+
+            timeout = max(min(timeouts), 0) if timeouts else None
+            readable, _, _ = select.select([self.inotify_fd], [], [], timeout)
+            if readable:
+                self.read_events()
+
+    def get_settled_films(self) -> list[Path]:
+        """
+        Torrent clients can close a film many times while downloading it,
+        so a film has only settled once its size and modification time have
+        also stayed the same for settle_seconds. Films that are still changing
+        wait for another settle_seconds.
+        """
+        now = time.monotonic()
+        settled_films = []
+
+        for film, last_changed in list(self.pending_films.items()):
+            if now - last_changed < self.settle_seconds:
+                continue
+
+            if self.get_film_state(film) != self.pending_film_states[film]:
+                self.queue_film(film)
+                continue
+
+            del self.pending_films[film]
+            del self.pending_film_states[film]
+            settled_films.append(Path(film))
+
+        return sorted(settled_films)
+
+    def queue_film(self, path: str) -> None:
+        self.pending_films[path] = time.monotonic()
+        self.pending_film_states[path] = self.get_film_state(path)
+
+    def get_film_state(self, path: str) -> Optional[tuple[int, int]]:
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return None
+
+        return file_stat.st_size, file_stat.st_mtime_ns
+
+    def read_events(self) -> None:
+        data = os.read(self.inotify_fd, 65536)
+        offset = 0
+
+        while offset < len(data):
+            watch_descriptor, mask, _, name_length = EVENT_HEADER.unpack_from(
+                data, offset
+            )
+            name_start = offset + EVENT_HEADER.size
+            name = os.fsdecode(data[name_start : name_start + name_length].rstrip(b"\0"))
+            offset = name_start + name_length
+
+            self.handle_event(watch_descriptor, mask, name)
+
+    def handle_event(self, watch_descriptor: int, mask: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            logging.warning(
+                "Too many file changes at once, some new films may have been missed. "
+                "Run a full check to pick these up."
+            )
+            return
+
+        if mask & IN_IGNORED:
+            self.watched_folders.pop(watch_descriptor, None)
+            return
+
+        folder = self.watched_folders.get(watch_descriptor)
+        if folder is None or not name:
+            return
+
+        path = os.path.join(folder, name)
+
+        if mask & IN_ISDIR:
+            # Symlinks never have IN_ISDIR set, so only the folder name needs checking
+            if mask & (IN_CREATE | IN_MOVED_TO) and self.film_processor.should_walk_folder(
+                name, is_symlink=False
+            ):
+                self.add_folder_watches(path, queue_existing_films=True)
+        elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE):
+            # Hardlinks and symlinks only send IN_CREATE. Films still being
+            # written are held back until their size stops changing
+            if self.film_processor.is_film_file_name(name):
+                self.queue_film(path)
+
+    def check_films(self, film_paths: list[Path]) -> None:
+        """
+        Parse, search and dupe check a batch of new films,
+        then add them to the existing film list.
+        """
+        film_records = []
+        for path in film_paths:
+            try:
+                film_records.append(FileRecord.from_path(path))
+            except OSError:
+                logging.warning("%s no longer exists, skipping.", path.stem)
+
+        film_list_df = self.film_processor.parse_film_info_from_file_records(
+            film_records
+        )
+        if film_list_df.empty:
+            return
+
+        logging.info("\nChecking %s new films on ANT...", len(film_list_df))
+
+        film_searcher = FilmSearcher(
+            film_list_df,
+            self.api_key,
+            search_cache=self.search_cache,
+            rate_limiter=self.rate_limiter,
+            search_workers=self.search_workers,
+            ant_url=self.ant_url,
+        )
+        films_to_dupe_check = film_searcher.check_if_films_exist_on_ant()
+
+        dupe_checker = DupeChecker(films_to_dupe_check)
+        checked_films = dupe_checker.check_if_films_can_be_uploaded()
+
+        for film_title, verdict in zip(
+            checked_films["Parsed film title"], checked_films["Already on ANT?"]
+        ):
+            logging.info("%s: %s", film_title, verdict)
+
+        self.add_checked_films_to_output(checked_films)
+
+    def add_checked_films_to_output(self, checked_films: pd.DataFrame) -> None:
+        """
+        Replace any rows for the same files in the existing film list
+        with the newly checked films, then re-write the output file.
+        """
+        film_list = checked_films
+
+        if self.film_processor.check_if_existing_film_csv_exists():
+            existing_film_list = self.film_processor.read_existing_film_list()
+
+            if self.film_processor.check_if_existing_csv_is_compatible(
+                existing_film_list
+            ):
+                existing_film_list = convert_to_film_list_df_types(
+                    existing_film_list, self.film_processor.film_list_df_types
+                )
+                is_rechecked = existing_film_list["Full file path"].isin(
+                    checked_films["Full file path"]
+                )
+                film_list = pd.concat(
+                    [existing_film_list.loc[~is_rechecked], checked_films]
+                ).sort_values(
+                    by=["Already on ANT?", "Parsed film title"], ascending=[False, True]
+                )
+                film_list = restore_compact_df_types(film_list, checked_films.dtypes)
+
+        write_film_list_to_csv(film_list, self.film_processor.output_folder)
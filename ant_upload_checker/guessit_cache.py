@@ -0,0 +1,135 @@
+import json
+import logging
+import sqlite3
+import time
+from importlib.metadata import version
+from pathlib import Path, PurePath
+from typing import Any, Union
+
+
+class GuessitCache:
+    """
+    On-disk SQLite cache of the film properties guessit extracts from a file path.
+    Guessit output only depends on the path, the guessit/rebulk versions and
+    the options guessit is called with, so the cache is cleared whenever any of
+    these change, using the parser revision to track the options.
+    Once it holds more than max_entries paths, the least recently used are evicted.
+    """
+
+    def __init__(
+        self,
+        cache_file_path: Path,
+        max_entries: int = 500000,
+        parser_revision: str = "",
+    ):
+        self.cache_file_path: Path = cache_file_path
+        self.max_entries: int = max_entries
+        self.cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection: sqlite3.Connection = sqlite3.connect(cache_file_path)
+        self.guessit_version: str = (
+            f"guessit-{version('guessit')}-rebulk-{version('rebulk')}"
+            f"-{parser_revision}"
+        )
+        # SQLite limits the number of parameters in a single query
+        self.lookup_batch_size: int = 500
+
+        self.create_tables()
+        self.clear_cache_if_guessit_changed()
+
+    def create_tables(self) -> None:
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS guesses ("
+                "path TEXT PRIMARY KEY, properties TEXT, last_used INTEGER)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS guesses_last_used ON guesses (last_used)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_info (key TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    def clear_cache_if_guessit_changed(self) -> None:
+        row = self.connection.execute(
+            "SELECT value FROM cache_info WHERE key = 'guessit_version'"
+        ).fetchone()
+
+        if row is not None and row[0] == self.guessit_version:
+            return
+
+        if row is not None:
+            logging.info("Guessit has been updated, clearing cached film information")
+
+        with self.connection:
+            self.connection.execute("DELETE FROM guesses")
+            self.connection.execute(
+                "INSERT OR REPLACE INTO cache_info VALUES ('guessit_version', ?)",
+                (self.guessit_version,),
+            )
+
+    def normalise_path(self, file_path: Union[str, PurePath]) -> str:
+        if not isinstance(file_path, PurePath):
+            file_path = Path(file_path)
+
+        return file_path.as_posix()
+
+    def get_cached_guesses(
+        self, file_paths: list[Union[str, Path]]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Return the cached properties of any of the given paths, keyed by
+        normalised path, marking them as recently used.
+        """
+        keys = list(dict.fromkeys(self.normalise_path(path) for path in file_paths))
+
+        cached_guesses = {}
+        for batch_start in range(0, len(keys), self.lookup_batch_size):
+            batch = keys[batch_start : batch_start + self.lookup_batch_size]
+            rows = self.connection.execute(
+                "SELECT path, properties FROM guesses "
+                f"WHERE path IN ({','.join('?' * len(batch))})",
+                batch,
+            )
+            cached_guesses.update(
+                (path, json.loads(properties)) for path, properties in rows
+            )
+
+        last_used = time.time_ns()
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE guesses SET last_used = ? WHERE path = ?",
+                [(last_used, path) for path in cached_guesses],
+            )
+
+        return cached_guesses
+
+    def store_guesses(
+        self, file_paths: list[Union[str, Path]], guesses: list[dict[str, Any]]
+    ) -> None:
+        last_used = time.time_ns()
+        rows = [
+            (self.normalise_path(path), json.dumps(guess, default=str), last_used)
+            for path, guess in zip(file_paths, guesses)
+        ]
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO guesses VALUES (?, ?, ?)", rows
+            )
+            self.evict_least_recently_used()
+
+    def evict_least_recently_used(self) -> None:
+        (entry_count,) = self.connection.execute(
+            "SELECT COUNT(*) FROM guesses"
+        ).fetchone()
+        excess_entries = entry_count - self.max_entries
+
+        if excess_entries > 0:
+            self.connection.execute(
+                "DELETE FROM guesses WHERE path IN "
+                "(SELECT path FROM guesses ORDER BY last_used LIMIT ?)",
+                (excess_entries,),
+            )
+
+    def close(self) -> None:
+        self.connection.close()
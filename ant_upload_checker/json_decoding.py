@@ -0,0 +1,22 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+ORJSON_INSTALLED = orjson is not None
+
+
+def decode_json(content: bytes) -> Any:
+    """
+    Decode JSON with orjson where installed, as it decodes large search
+    responses much faster, otherwise with the standard library.
+    Both raise a ValueError for invalid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+
+    return json.loads(content)
@@ -4,28 +4,97 @@ from ant_upload_checker.film_processor import FilmProcessor
 from ant_upload_checker.film_searcher import FilmSearcher
 from ant_upload_checker.output import write_film_list_to_csv
 from ant_upload_checker.dupe_checker import DupeChecker
+from ant_upload_checker.film_watcher import FilmWatcher
+from ant_upload_checker.run_journal import RunJournal, read_journaled_searches
+from ant_upload_checker.search_cache import SearchCache
+from ant_upload_checker.search_planner import SearchPlanner
+from ant_upload_checker.search_strategies import SearchStrategyStats
 
 
 def main():
+    arguments = setup_functions.parse_arguments()
     setup_functions.setup_logging()
     logging.info("Starting ANT upload checker...")
 
     setup_functions.save_user_info_to_env()
     api_key, input_folders, output_folder = setup_functions.load_env_file()
 
-    films = FilmProcessor(input_folders, output_folder)
-    film_file_paths = films.get_film_file_paths()
-    film_list_df = films.get_film_info_from_file_paths(film_file_paths)
+    films = FilmProcessor(
+        input_folders,
+        output_folder,
+        scan_workers=arguments.scan_workers,
+        reparse_films=arguments.reparse,
+        full_scan=arguments.full_scan,
+        parse_workers=arguments.parse_workers,
+        compact_dtypes=arguments.compact_dtypes,
+    )
+
+    search_cache = SearchCache(
+        films.search_cache_file_path,
+        found_ttl_hours=arguments.found_cache_hours,
+        not_found_ttl_hours=arguments.not_found_cache_hours,
+        refresh=arguments.refresh_searches,
+    )
+
+    if arguments.watch:
+        FilmWatcher(
+            films,
+            api_key,
+            search_cache=search_cache,
+            search_workers=arguments.search_workers,
+            ant_url=arguments.ant_url,
+        ).watch()
+        search_cache.close()
+        return
+
+    film_file_records = films.get_film_file_records()
+    film_list_df = films.get_film_info_from_file_records(film_file_records)
 
     film_list_combined = films.combine_with_existing_film_csv(film_list_df)
 
-    film_searcher = FilmSearcher(film_list_combined, api_key)
+    journaled_titles = (
+        set(read_journaled_searches(films.run_journal_file_path))
+        if arguments.resume
+        else set()
+    )
+    search_planner = SearchPlanner(film_list_combined, journaled_titles, search_cache)
+    search_plan = search_planner.plan_searches()
+    search_planner.log_search_plan(search_plan)
+
+    if arguments.dry_run:
+        search_planner.log_estimated_search_time(search_plan)
+        logging.info("\nDry run, ending the process before searching ANT")
+        search_cache.close()
+        return
+
+    if films.film_list_changed and search_planner.check_if_nothing_to_search(
+        search_plan
+    ):
+        # Save the film list without deleted films before ending early
+        write_film_list_to_csv(film_list_combined, output_folder)
+    search_planner.stop_process_if_nothing_to_search(search_plan)
+
+    run_journal = RunJournal(films.run_journal_file_path, resume=arguments.resume)
+
+    strategy_stats = SearchStrategyStats(films.strategy_stats_file_path)
+    film_searcher = FilmSearcher(
+        film_list_combined,
+        api_key,
+        run_journal,
+        search_cache,
+        search_workers=arguments.search_workers,
+        strategy_stats=strategy_stats,
+        ant_url=arguments.ant_url,
+    )
     films_to_dupe_check = film_searcher.check_if_films_exist_on_ant()
+    search_cache.close()
+    strategy_stats.save()
 
     dupe_checker = DupeChecker(films_to_dupe_check)
     films_checked_on_ant = dupe_checker.check_if_films_can_be_uploaded()
 
     write_film_list_to_csv(films_checked_on_ant, output_folder)
+    run_journal.finish()
 
     logging.info("\nScript has ended")
 
@@ -0,0 +1,236 @@
+"""
+Local stand-in for the ANT search API, for testing and benchmarking
+FilmSearcher without searching the real tracker.
+
+Usage: python -m ant_upload_checker.mock_ant_server [--port N] [--latency SECONDS]
+       [--responses FILE] [--rate-limit-every N] [--server-error-rate RATE] [--gzip]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+from ant_upload_checker.search_cache import normalise_search_title
+
+
+class MockAntServer:
+    """
+    Serve ANT style search responses on localhost. Responses come from
+    recorded_responses, keyed by search query, or are otherwise made up,
+    with found_rate of queries finding a film.
+
+    Of every rate_limit_every requests, the last rate_limit_burst get
+    a 429 with a Retry-After. A server_error_rate share of the remaining
+    requests get a 500. Each response is delayed by latency_seconds, and the
+    body is sent in chunks over slow_body_seconds. With gzip_responses,
+    bodies are compressed for clients that accept gzip, as ANT does.
+    """
+
+    def __init__(
+        self,
+        recorded_responses: Optional[dict[str, list[dict[str, Any]]]] = None,
+        found_rate: float = 0.5,
+        latency_seconds: float = 0,
+        slow_body_seconds: float = 0,
+        rate_limit_every: int = 0,
+        rate_limit_burst: int = 1,
+        retry_after_seconds: float = 1,
+        server_error_rate: float = 0,
+        gzip_responses: bool = False,
+        port: int = 0,
+        seed: int = 0,
+    ):
+        self.recorded_responses: dict[str, list[dict[str, Any]]] = {
+            normalise_search_title(query): response
+            for query, response in (recorded_responses or {}).items()
+        }
+        self.found_rate: float = found_rate
+        self.latency_seconds: float = latency_seconds
+        self.slow_body_seconds: float = slow_body_seconds
+        self.rate_limit_every: int = rate_limit_every
+        self.rate_limit_burst: int = rate_limit_burst
+        self.retry_after_seconds: float = retry_after_seconds
+        self.server_error_rate: float = server_error_rate
+        self.gzip_responses: bool = gzip_responses
+        self.randomiser: random.Random = random.Random(seed)
+        self.lock: threading.Lock = threading.Lock()
+
+        self.request_count: int = 0
+        self.status_counts: dict[int, int] = {}
+        self.queries: list[str] = []
+
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer(
+            ("127.0.0.1", port), self.create_request_handler()
+        )
+        self.server.daemon_threads = True
+        self.server_thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/api.php"
+
+    def __enter__(self) -> "MockAntServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        )
+        self.server_thread.start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def create_request_handler(self) -> type[BaseHTTPRequestHandler]:
+        mock_server = self
+
+        class MockAntRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query).get("q", [""])[0]
+                status_code, body, headers = mock_server.get_response(query)
+                accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+                if mock_server.gzip_responses and accepts_gzip:
+                    body = gzip.compress(body)
+                    headers["Content-Encoding"] = "gzip"
+
+                time.sleep(mock_server.latency_seconds)
+                self.send_response(status_code)
+                for header, value in headers.items():
+                    self.send_header(header, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                mock_server.write_body(self.wfile, body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return MockAntRequestHandler
+
+    def get_response(self, query: str) -> tuple[int, bytes, dict[str, str]]:
+        with self.lock:
+            self.request_count += 1
+            self.queries.append(query)
+
+            if self.is_rate_limited(self.request_count):
+                status_code = 429
+            elif self.randomiser.random() < self.server_error_rate:
+                status_code = 500
+            else:
+                status_code = 200
+            self.status_counts[status_code] = (
+                self.status_counts.get(status_code, 0) + 1
+            )
+
+            if status_code == 200:
+                items = self.get_items(query)
+
+        if status_code == 429:
+            return (
+                status_code,
+                b"Too many requests",
+                {"Retry-After": str(self.retry_after_seconds)},
+            )
+        if status_code == 500:
+            return status_code, b"Internal server error", {}
+
+        body = json.dumps({"response": {"total": len(items)}, "item": items})
+        return status_code, body.encode(), {"Content-Type": "application/json"}
+
+    def is_rate_limited(self, request_number: int) -> bool:
+        if not self.rate_limit_every:
+            return False
+
+        request_in_window = (request_number - 1) % self.rate_limit_every
+        return request_in_window >= self.rate_limit_every - self.rate_limit_burst
+
+    def get_items(self, query: str) -> list[dict[str, Any]]:
+        normalised_query = normalise_search_title(query)
+        if normalised_query in self.recorded_responses:
+            return self.recorded_responses[normalised_query]
+
+        # Made up responses depend only on the query, so repeat searches match
+        query_randomiser = random.Random(normalised_query)
+        if query_randomiser.random() >= self.found_rate:
+            return []
+
+        return [
+            {
+                "guid": f"https://anthelion.me/torrents.php?torrentid={torrent_id}",
+                "resolution": query_randomiser.choice(["1080p", "2160p", "720p"]),
+                "codec": query_randomiser.choice(["H264", "H265", "x264"]),
+                "media": query_randomiser.choice(["Blu-ray", "WEB", "DVD"]),
+                "files": [
+                    {"name": f"{query}.{torrent_id}.mkv", "size": "1000000000"}
+                ],
+            }
+            for torrent_id in range(query_randomiser.randint(1, 5))
+        ]
+
+    def write_body(self, body_file, body: bytes) -> None:
+        if not self.slow_body_seconds:
+            body_file.write(body)
+            return
+
+        chunk_count = 10
+        chunk_size = -(-len(body) // chunk_count)
+        for chunk_start in range(0, len(body), chunk_size):
+            body_file.write(body[chunk_start : chunk_start + chunk_size])
+            body_file.flush()
+            time.sleep(self.slow_body_seconds / chunk_count)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--slow-body", type=float, default=0)
+    parser.add_argument(
+        "--responses",
+        type=Path,
+        help="JSON file of recorded responses, mapping each search query "
+        "to the list of torrents ANT returned",
+    )
+    parser.add_argument("--found-rate", type=float, default=0.5)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--rate-limit-burst", type=int, default=1)
+    parser.add_argument("--server-error-rate", type=float, default=0)
+    parser.add_argument("--gzip", action="store_true")
+    arguments = parser.parse_args()
+
+    recorded_responses = (
+        json.loads(arguments.responses.read_text(encoding="utf-8"))
+        if arguments.responses
+        else None
+    )
+    mock_server = MockAntServer(
+        recorded_responses,
+        found_rate=arguments.found_rate,
+        latency_seconds=arguments.latency,
+        slow_body_seconds=arguments.slow_body,
+        rate_limit_every=arguments.rate_limit_every,
+        rate_limit_burst=arguments.rate_limit_burst,
+        server_error_rate=arguments.server_error_rate,
+        gzip_responses=arguments.gzip,
+        port=arguments.port,
+    )
+    print(f"Serving mock ANT searches at {mock_server.url}, stop with Ctrl+C")
+
+    try:
+        mock_server.server.serve_forever()
+    except KeyboardInterrupt:
+        mock_server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
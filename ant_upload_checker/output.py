@@ -1,6 +1,12 @@
 from pathlib import Path
 import logging
+import os
 import pandas as pd
+from ant_upload_checker.film_list_types import PYARROW_INSTALLED
+
+
+CACHE_FOLDER_NAME = ".ant_upload_checker"
+FILM_LIST_STATE_FILE_NAME = "Film list.parquet"
 
 
 def write_film_list_to_csv(output_df: pd.DataFrame, output_folder: Path) -> None:
@@ -17,6 +23,48 @@ def write_film_list_to_csv(output_df: pd.DataFrame, output_folder: Path) -> None
 
         logging.info("Writing list of films to %s...", output_file_path)
 
-        output_df.to_csv(output_file_path, index=False, encoding="utf-8-sig")
+        write_csv_atomically(output_df, output_file_path)
+        write_film_list_state_file(output_df, output_folder)
     else:
         logging.warning("\nThe film list is empty, no file is being created.")
+
+
+def write_csv_atomically(output_df: pd.DataFrame, output_file_path: Path) -> None:
+    """
+    Write the CSV to a temporary file first, then swap it into place,
+    so a run stopped mid-write never leaves a half-written film list.
+    """
+    temporary_file_path = output_file_path.with_name(f"{output_file_path.name}.tmp")
+
+    try:
+        with open(
+            temporary_file_path, "w", encoding="utf-8-sig", newline=""
+        ) as temporary_file:
+            output_df.to_csv(temporary_file, index=False)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        os.replace(temporary_file_path, output_file_path)
+    finally:
+        temporary_file_path.unlink(missing_ok=True)
+
+
+def write_film_list_state_file(output_df: pd.DataFrame, output_folder: Path) -> None:
+    """
+    Save the film list as a Parquet file alongside the CSV. It keeps the column
+    types, so is much quicker to load on the next run than re-reading the CSV.
+    Writing Parquet files needs the optional pyarrow package.
+    """
+    if not PYARROW_INSTALLED:
+        return
+
+    state_file_path = Path(output_folder) / CACHE_FOLDER_NAME / FILM_LIST_STATE_FILE_NAME
+    state_file_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_file_path = state_file_path.with_suffix(".parquet.tmp")
+
+    try:
+        output_df.to_parquet(temporary_file_path, index=False)
+        os.replace(temporary_file_path, state_file_path)
+    except (OSError, ValueError, TypeError) as err:
+        # The CSV has been written, so the next run can still load that
+        logging.warning("Could not save the film list state file: %s", err)
+        temporary_file_path.unlink(missing_ok=True)
@@ -0,0 +1,109 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting how often ANT is searched.
+    Up to burst searches can be made at once, then tokens refill at
+    rate_per_second. When ANT responds that requests are too frequent,
+    the rate is halved and searches pause, honouring any Retry-After.
+    Each successful search then moves the rate back towards the configured rate.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int = 1,
+        max_slowdown: float = 32,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate_per_second: float = rate_per_second
+        self.burst: int = burst
+        self.max_slowdown: float = max_slowdown
+        self.clock: Callable[[], float] = clock
+        self.sleep: Callable[[float], None] = sleep
+        self.lock: threading.Lock = threading.Lock()
+
+        self.tokens: float = burst
+        self.last_refill: float = clock()
+        self.slowdown: float = 1
+        self.paused_until: float = 0
+        self.waited_seconds: float = 0
+
+    @property
+    def current_rate_per_second(self) -> float:
+        return self.rate_per_second / self.slowdown
+
+    def refill(self, now: float) -> None:
+        elapsed = max(now - max(self.last_refill, self.paused_until), 0)
+        self.tokens = min(
+            self.tokens + elapsed * self.current_rate_per_second, self.burst
+        )
+        self.last_refill = max(now, self.last_refill)
+
+    def acquire(self) -> None:
+        """
+        Wait until a search can be made, then take a token for it.
+        """
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.refill(now)
+
+                if now < self.paused_until:
+                    wait_seconds = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait_seconds = (1 - self.tokens) / self.current_rate_per_second
+
+                self.waited_seconds += wait_seconds
+
+            self.sleep(wait_seconds)
+
+    def back_off(self, retry_after_seconds: Optional[float] = None) -> None:
+        with self.lock:
+            now = self.clock()
+            self.slowdown = min(self.slowdown * 2, self.max_slowdown)
+            # Allow a single search once the pause is over, then the slower rate applies
+            self.tokens = 1
+            self.last_refill = now
+
+            pause_seconds = (
+                retry_after_seconds
+                if retry_after_seconds is not None
+                else 1 / self.current_rate_per_second
+            )
+            self.paused_until = max(self.paused_until, now + pause_seconds)
+
+    def recover(self) -> None:
+        with self.lock:
+            self.slowdown = max(self.slowdown * 0.75, 1)
+
+
+def parse_retry_after(retry_after: Optional[str]) -> Optional[float]:
+    """
+    Retry-After is either a number of seconds or an HTTP date.
+    """
+    if not retry_after:
+        return None
+
+    try:
+        return max(float(retry_after), 0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
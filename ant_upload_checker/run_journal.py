@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+from ant_upload_checker.search_cache import normalise_search_title
+from ant_upload_checker.torrent import Torrent, parse_api_response, serialise_torrents
+
+
+def read_journaled_searches(journal_file_path: Path) -> dict[str, list[Torrent]]:
+    """
+    Read the searches recorded by an unfinished run without changing the journal.
+    A partly written last entry is ignored.
+    """
+    if not journal_file_path.is_file():
+        return {}
+
+    journal_content = journal_file_path.read_bytes()
+    complete_length = journal_content.rfind(b"\n") + 1
+
+    searches = {}
+    for line in journal_content[:complete_length].splitlines():
+        entry = json.loads(line)
+        if entry["type"] == "search":
+            searches[entry["title"]] = parse_api_response(entry["response"])
+
+    return searches
+
+
+class RunJournal:
+    """
+    Append-only JSON lines journal of the searches completed during a run.
+    Each entry is flushed to disk as soon as it is written, so an interrupted
+    run can be resumed without searching ANT again for films it had already
+    searched for. Dupe checks only take a moment, so they are simply redone.
+    """
+
+    def __init__(self, journal_file_path: Path, resume: bool = False):
+        self.journal_file_path: Path = journal_file_path
+        # Keyed by normalised title, as FilmSearcher searches once per normalised title
+        self.searches: dict[str, list[Torrent]] = {}
+        # Concurrent searches record their results from several threads
+        self.lock: threading.Lock = threading.Lock()
+        self.journal_file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if resume:
+            self.replay()
+        elif self.journal_file_path.is_file():
+            self.keep_unfinished_journal()
+
+        self.journal_file = open(
+            self.journal_file_path, "a" if resume else "w", encoding="utf-8"
+        )
+
+    def replay(self) -> None:
+        """
+        Load the searches recorded by an unfinished run. A partly written
+        last entry, from the run being stopped mid-write, is discarded.
+        """
+        if not self.journal_file_path.is_file():
+            logging.info("No unfinished run was found to resume, starting a new run.")
+            return
+
+        complete_length = self.journal_file_path.read_bytes().rfind(b"\n") + 1
+        with open(self.journal_file_path, "r+b") as journal_file:
+            journal_file.truncate(complete_length)
+
+        self.searches = {
+            normalise_search_title(film_title): api_response
+            for film_title, api_response in read_journaled_searches(
+                self.journal_file_path
+            ).items()
+        }
+
+        logging.info(
+            "Resuming the previous run, %s searches were already completed",
+            len(self.searches),
+        )
+
+    @property
+    def unfinished_journal_file_path(self) -> Path:
+        return self.journal_file_path.with_name(
+            f"{self.journal_file_path.stem}_unfinished{self.journal_file_path.suffix}"
+        )
+
+    def keep_unfinished_journal(self) -> None:
+        """
+        Move an unfinished run's journal aside rather than overwriting it,
+        so its searches are not lost if --resume was forgotten.
+        """
+        os.replace(self.journal_file_path, self.unfinished_journal_file_path)
+        logging.warning(
+            "The previous run did not finish, starting a new run. Its progress "
+            "was moved to %s. To continue it instead, stop this run, rename that "
+            "file to %s and use --resume.",
+            self.unfinished_journal_file_path,
+            self.journal_file_path.name,
+        )
+
+    def get_search(self, film_title: str) -> Optional[list[Torrent]]:
+        return self.searches.get(normalise_search_title(film_title))
+
+    def record_search(self, film_title: str, api_response: list[Torrent]) -> None:
+        self.searches[normalise_search_title(film_title)] = api_response
+        self.append(
+            [
+                {
+                    "type": "search",
+                    "title": film_title,
+                    "response": serialise_torrents(api_response),
+                }
+            ]
+        )
+
+    def append(self, entries: list[dict[str, Any]]) -> None:
+        with self.lock:
+            self.journal_file.writelines(
+                json.dumps(entry, default=str) + "\n" for entry in entries
+            )
+            self.journal_file.flush()
+            os.fsync(self.journal_file.fileno())
+
+    def finish(self) -> None:
+        """
+        Remove the journal once the run's output has been written,
+        as there is nothing left to resume.
+        """
+        self.close()
+        self.journal_file_path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        self.journal_file.close()
@@ -0,0 +1,222 @@
+import json
+import logging
+import sqlite3
+from importlib.metadata import version
+from pathlib import Path
+from typing import NamedTuple
+import pandas as pd
+from ant_upload_checker.file_record import FileRecord
+
+
+# Bump when the way film information is parsed changes, to force a re-parse
+SCAN_INDEX_VERSION = "2"
+
+
+class IndexedFilm(NamedTuple):
+    size: int
+    mtime: float
+    is_film: bool
+    title: str
+    resolution: str
+    codec: str
+    source: str
+    release_group: str
+
+
+class ScannedFolder(NamedTuple):
+    mtime: float
+    film_records: list[FileRecord]
+    sub_folders: list[str]
+
+
+class ScanIndex:
+    """
+    On-disk SQLite index of parsed film information, keyed by file path,
+    size and modification time. Lets later runs only parse new or changed files.
+    Also stores the listing of each scanned folder, so folders that have not
+    changed since the last run do not need to be listed again.
+    """
+
+    def __init__(self, index_file_path: Path, parser_revision: str = ""):
+        self.index_file_path: Path = index_file_path
+        self.index_file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection: sqlite3.Connection = sqlite3.connect(index_file_path)
+        self.parser_version: str = (
+            f"{SCAN_INDEX_VERSION}-guessit-{version('guessit')}-{parser_revision}"
+        )
+
+        self.create_tables()
+        self.clear_index_if_parser_changed()
+
+    def create_tables(self) -> None:
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS parsed_films ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime REAL, is_film INTEGER, "
+                "title TEXT, resolution TEXT, codec TEXT, source TEXT, release_group TEXT)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS scanned_folders ("
+                "path TEXT PRIMARY KEY, mtime REAL, film_records TEXT, sub_folders TEXT)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS index_info (key TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    def clear_index_if_parser_changed(self) -> None:
+        """
+        Parsed film information depends on the guessit version and the
+        parser revision (the fast parser and guessit options), so drop every
+        indexed film if either has changed since the last run.
+        """
+        row = self.connection.execute(
+            "SELECT value FROM index_info WHERE key = 'parser_version'"
+        ).fetchone()
+
+        if row is not None and row[0] == self.parser_version:
+            return
+
+        if row is not None:
+            logging.info("Film parser has been updated, re-parsing all films...")
+
+        with self.connection:
+            self.connection.execute("DELETE FROM parsed_films")
+            self.connection.execute("DELETE FROM scanned_folders")
+            self.connection.execute(
+                "INSERT OR REPLACE INTO index_info VALUES ('parser_version', ?)",
+                (self.parser_version,),
+            )
+
+    def load_indexed_films(self) -> dict[str, IndexedFilm]:
+        rows = self.connection.execute(
+            "SELECT path, size, mtime, is_film, title, resolution, codec, source, "
+            "release_group FROM parsed_films"
+        )
+
+        return {row[0]: IndexedFilm(*row[1:]) for row in rows}
+
+    def split_unchanged_films(
+        self, film_records: list[FileRecord]
+    ) -> tuple[list[tuple[FileRecord, IndexedFilm]], list[FileRecord]]:
+        """
+        Split file records into those whose path, size and mtime match the index,
+        paired with their indexed film information, and those that need parsing.
+        Indexed files that were found not to be films are dropped entirely.
+        """
+        indexed_films = self.load_indexed_films()
+
+        unchanged_films = []
+        changed_records = []
+        for record in film_records:
+            indexed_film = indexed_films.get(str(record.path))
+
+            if (
+                indexed_film is None
+                or indexed_film.size != record.size
+                or indexed_film.mtime != record.mtime
+            ):
+                changed_records.append(record)
+            elif indexed_film.is_film:
+                unchanged_films.append((record, indexed_film))
+
+        return unchanged_films, changed_records
+
+    def update(
+        self,
+        changed_records: list[FileRecord],
+        parsed_film_df: pd.DataFrame,
+        current_records: list[FileRecord],
+    ) -> None:
+        """
+        Store the parsed information of new or changed files, then remove
+        any indexed files that no longer exist. Changed files missing from
+        the parsed DataFrame were not films, and are stored as such.
+        """
+        parsed_films = {
+            film[0]: film[1:]
+            for film in parsed_film_df[
+                [
+                    "Full file path",
+                    "Parsed film title",
+                    "Resolution",
+                    "Codec",
+                    "Source",
+                    "Release group",
+                ]
+            ].itertuples(index=False)
+        }
+
+        rows = []
+        for record in changed_records:
+            path = str(record.path)
+            film = parsed_films.get(path)
+            if film is not None:
+                rows.append((path, record.size, record.mtime, True, *film))
+            else:
+                rows.append((path, record.size, record.mtime, False, "", "", "", "", ""))
+
+        current_paths = {str(record.path) for record in current_records}
+        indexed_paths = {
+            row[0] for row in self.connection.execute("SELECT path FROM parsed_films")
+        }
+        deleted_paths = [(path,) for path in indexed_paths - current_paths]
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO parsed_films VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.connection.executemany(
+                "DELETE FROM parsed_films WHERE path = ?", deleted_paths
+            )
+
+        if deleted_paths:
+            logging.info(
+                "Removed %s deleted files from the scan index", len(deleted_paths)
+            )
+
+    def load_scanned_folders(self) -> dict[str, ScannedFolder]:
+        rows = self.connection.execute(
+            "SELECT path, mtime, film_records, sub_folders FROM scanned_folders"
+        )
+
+        return {
+            path: ScannedFolder(
+                mtime,
+                [
+                    FileRecord(Path(file_path), size, file_mtime, inode)
+                    for file_path, size, file_mtime, inode in json.loads(film_records)
+                ],
+                json.loads(sub_folders),
+            )
+            for path, mtime, film_records, sub_folders in rows
+        }
+
+    def save_scanned_folders(self, scanned_folders: dict[str, ScannedFolder]) -> None:
+        """
+        Replace the stored folder listings with those from the latest scan,
+        which also drops any folders that no longer exist.
+        """
+        rows = [
+            (
+                path,
+                folder.mtime,
+                json.dumps(
+                    [
+                        (str(record.path), record.size, record.mtime, record.inode)
+                        for record in folder.film_records
+                    ]
+                ),
+                json.dumps(folder.sub_folders),
+            )
+            for path, folder in scanned_folders.items()
+        ]
+
+        with self.connection:
+            self.connection.execute("DELETE FROM scanned_folders")
+            self.connection.executemany(
+                "INSERT INTO scanned_folders VALUES (?, ?, ?, ?)", rows
+            )
+
+    def close(self) -> None:
+        self.connection.close()
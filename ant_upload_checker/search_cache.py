@@ -0,0 +1,127 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from ant_upload_checker.torrent import Torrent, parse_api_response, serialise_torrents
+
+
+def normalise_search_title(film_title: str) -> str:
+    """
+    ANT search ignores case and extra spaces,
+    so titles differing only by these give the same results.
+    """
+    return " ".join(film_title.split()).casefold()
+
+
+class SearchCache:
+    """
+    On-disk SQLite cache of ANT search responses, keyed by normalised search query.
+    Films not found on ANT may be uploaded at any time, so empty responses
+    can be kept for less time than responses that found a film.
+    Once it holds more than max_entries queries, the least recently used are evicted.
+    """
+
+    def __init__(
+        self,
+        cache_file_path: Path,
+        found_ttl_hours: float = 24,
+        not_found_ttl_hours: float = 12,
+        max_entries: int = 100000,
+        refresh: bool = False,
+    ):
+        self.cache_file_path: Path = cache_file_path
+        self.found_ttl_seconds: float = found_ttl_hours * 60 * 60
+        self.not_found_ttl_seconds: float = not_found_ttl_hours * 60 * 60
+        self.max_entries: int = max_entries
+        # Refreshing ignores saved responses, but still saves the new ones
+        self.refresh: bool = refresh
+        self.cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+        # Concurrent searches share the connection, taking turns using the lock
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            cache_file_path, check_same_thread=False
+        )
+        self.lock: threading.Lock = threading.Lock()
+
+        self.create_tables()
+
+    def create_tables(self) -> None:
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS searches ("
+                "query TEXT PRIMARY KEY, response TEXT, is_found INTEGER, "
+                "searched_at REAL, last_used INTEGER)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS searches_last_used ON searches (last_used)"
+            )
+
+    def get_search(self, query: str) -> Optional[list[Torrent]]:
+        """
+        Return the saved response for a query if it has not expired,
+        marking it as recently used.
+        """
+        if self.refresh:
+            return None
+
+        normalised_query = normalise_search_title(query)
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT response, is_found, searched_at FROM searches WHERE query = ?",
+                (normalised_query,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            response, is_found, searched_at = row
+            ttl_seconds = (
+                self.found_ttl_seconds if is_found else self.not_found_ttl_seconds
+            )
+            if time.time() - searched_at > ttl_seconds:
+                return None
+
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE searches SET last_used = ? WHERE query = ?",
+                    (time.time_ns(), normalised_query),
+                )
+
+        return parse_api_response(json.loads(response))
+
+    def store_search(self, query: str, api_response: list[Torrent]) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?, ?)",
+                (
+                    normalise_search_title(query),
+                    json.dumps(serialise_torrents(api_response)),
+                    bool(api_response),
+                    time.time(),
+                    time.time_ns(),
+                ),
+            )
+            self.evict_expired_and_least_recently_used()
+
+    def evict_expired_and_least_recently_used(self) -> None:
+        now = time.time()
+        self.connection.execute(
+            "DELETE FROM searches WHERE searched_at < "
+            "CASE WHEN is_found THEN ? ELSE ? END",
+            (now - self.found_ttl_seconds, now - self.not_found_ttl_seconds),
+        )
+
+        (entry_count,) = self.connection.execute(
+            "SELECT COUNT(*) FROM searches"
+        ).fetchone()
+        excess_entries = entry_count - self.max_entries
+
+        if excess_entries > 0:
+            self.connection.execute(
+                "DELETE FROM searches WHERE query IN "
+                "(SELECT query FROM searches ORDER BY last_used LIMIT ?)",
+                (excess_entries,),
+            )
+
+    def close(self) -> None:
+        self.connection.close()
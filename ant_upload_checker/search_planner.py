@@ -0,0 +1,139 @@
+import logging
+import sys
+from datetime import timedelta
+from typing import NamedTuple, Optional
+import pandas as pd
+from ant_upload_checker.film_searcher import (
+    SEARCH_RATE_LIMIT_CALLS,
+    SEARCH_RATE_LIMIT_PERIOD,
+    SKIPPED_VERDICT_REGEX,
+)
+from ant_upload_checker.search_cache import SearchCache, normalise_search_title
+from ant_upload_checker.search_strategies import get_candidate_queries
+
+
+class SearchPlan(NamedTuple):
+    films_to_skip: int
+    films_already_searched: int
+    films_to_search: int
+    minimum_searches: int
+    maximum_searches: int
+
+
+class SearchPlanner:
+    """
+    Work out which films need searching on ANT, and how many API calls
+    that could take, before any searches are made.
+    """
+
+    def __init__(
+        self,
+        film_list_df: pd.DataFrame,
+        journaled_titles: Optional[set[str]] = None,
+        search_cache: Optional[SearchCache] = None,
+    ):
+        self.film_list_df: pd.DataFrame = film_list_df
+        self.journaled_titles: set[str] = journaled_titles or set()
+        self.search_cache: Optional[SearchCache] = search_cache
+
+    def plan_searches(self) -> SearchPlan:
+        should_skip = self.film_list_df["Already on ANT?"].str.contains(
+            SKIPPED_VERDICT_REGEX, regex=True, na=False
+        )
+        titles_to_check = self.film_list_df.loc[~should_skip, "Parsed film title"]
+
+        # FilmSearcher searches once for all copies of a film with the same
+        # normalised title, and looks up journaled searches the same way
+        normalised_titles = titles_to_check.map(normalise_search_title)
+        is_journaled = normalised_titles.isin(
+            {normalise_search_title(title) for title in self.journaled_titles}
+        )
+        titles_to_search = titles_to_check.loc[~is_journaled]
+
+        distinct_titles = titles_to_search.groupby(
+            normalised_titles.loc[~is_journaled], sort=False
+        ).first()
+
+        minimum_searches = 0
+        maximum_searches = 0
+        for film_title in distinct_titles:
+            possible_searches = self.count_possible_searches(film_title)
+            cached_search = (
+                None
+                if self.search_cache is None
+                else self.search_cache.get_search(film_title)
+            )
+
+            if cached_search is None:
+                minimum_searches += 1
+                maximum_searches += possible_searches
+            elif not cached_search:
+                # Only the fallback searches are left to try
+                maximum_searches += possible_searches - 1
+
+        return SearchPlan(
+            films_to_skip=int(should_skip.sum()),
+            films_already_searched=int(is_journaled.sum()),
+            films_to_search=len(titles_to_search),
+            minimum_searches=minimum_searches,
+            maximum_searches=maximum_searches,
+        )
+
+    def count_possible_searches(self, film_title: str) -> int:
+        """
+        Count the searches for a film title if it is not found on ANT,
+        i.e. the initial search plus every fallback search for a modified title.
+        """
+        return len(get_candidate_queries(film_title))
+
+    def estimate_search_time(self, search_count: int) -> timedelta:
+        return timedelta(
+            seconds=search_count * SEARCH_RATE_LIMIT_PERIOD / SEARCH_RATE_LIMIT_CALLS
+        )
+
+    def log_search_plan(self, search_plan: SearchPlan) -> None:
+        logging.info(
+            "\n%s films to search for on ANT, "
+            "%s skipped as already duplicates or banned, "
+            "%s already searched for before resuming",
+            search_plan.films_to_search,
+            search_plan.films_to_skip,
+            search_plan.films_already_searched,
+        )
+        logging.info(
+            "This needs between %s and %s searches, "
+            "depending on how many films need a fallback search for a modified title",
+            search_plan.minimum_searches,
+            search_plan.maximum_searches,
+        )
+
+    def log_estimated_search_time(self, search_plan: SearchPlan) -> None:
+        logging.info(
+            "At the rate limit of %s search(es) every %s seconds, "
+            "searching will take between %s and %s",
+            SEARCH_RATE_LIMIT_CALLS,
+            SEARCH_RATE_LIMIT_PERIOD,
+            self.estimate_search_time(search_plan.minimum_searches),
+            self.estimate_search_time(search_plan.maximum_searches),
+        )
+
+    def check_if_nothing_to_search(self, search_plan: SearchPlan) -> bool:
+        """
+        Check if every film was already found to be a duplicate or banned,
+        so searching would not change any verdicts.
+        """
+        films_to_check = search_plan.films_to_search + search_plan.films_already_searched
+
+        return search_plan.films_to_skip > 0 and films_to_check == 0
+
+    def stop_process_if_nothing_to_search(self, search_plan: SearchPlan) -> None:
+        """
+        End the run before searching if every film was already found
+        to be a duplicate or banned.
+        """
+        if self.check_if_nothing_to_search(search_plan):
+            logging.info(
+                "All films have already been searched and are duplicates or banned. "
+                "\n\nEnding the process early.\n\n----"
+            )
+            sys.exit(0)
@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import NamedTuple, Optional
+from ant_upload_checker.search_cache import normalise_search_title
+
+
+AND_WORD_REGEX = r"(?i)\sand\s"
+AND_SYMBOL_REGEX = r"(?i)\s&\s"
+TIME_REGEX = r"(?<=\b\d\d)(?=\d\d\b)"
+DATE_REGEX = r"(?<=\b\d)(?=\d{1,2}\b)"
+AKA_REGEX = r"(?i)\saka\s"
+TITLE_STRATEGY = "title"
+
+
+class CandidateQuery(NamedTuple):
+    strategy: str
+    query: str
+
+
+def get_candidate_queries(film_title: str) -> list[CandidateQuery]:
+    """
+    Get every query that could find a film on ANT: the title itself, then
+    modified titles for when the title is written differently on ANT.
+    Queries that ANT would treat as the same search are only included once.
+    """
+    candidate_queries = [CandidateQuery(TITLE_STRATEGY, film_title)]
+
+    # e.g. Romeo and Juliet is Romeo & Juliet on ANT, or the other way round
+    if re.search(AND_WORD_REGEX, film_title):
+        candidate_queries.append(
+            CandidateQuery("and", re.sub(AND_WORD_REGEX, " & ", film_title))
+        )
+    elif re.search(AND_SYMBOL_REGEX, film_title):
+        candidate_queries.append(
+            CandidateQuery("and", re.sub(AND_SYMBOL_REGEX, " and ", film_title))
+        )
+
+    # e.g. 1208 East of Bucharest is 12:08 East of Bucharest
+    if re.search(TIME_REGEX, film_title):
+        candidate_queries.append(
+            CandidateQuery("time", re.sub(TIME_REGEX, ":", film_title))
+        )
+
+    # e.g. Fahrenheit 911 is Fahrenheit 9/11
+    if re.search(DATE_REGEX, film_title):
+        candidate_queries.append(
+            CandidateQuery("date", re.sub(DATE_REGEX, "/", film_title))
+        )
+
+    if re.search(AKA_REGEX, film_title):
+        candidate_queries.extend(
+            CandidateQuery("aka", alternate_title)
+            for alternate_title in re.split(AKA_REGEX, film_title)
+        )
+
+    unique_queries = {}
+    for candidate_query in candidate_queries:
+        unique_queries.setdefault(
+            normalise_search_title(candidate_query.query), candidate_query
+        )
+
+    return list(unique_queries.values())
+
+
+class SearchStrategyStats:
+    """
+    Count how many queries each search strategy has sent, and how many
+    found a film, across runs. The fallback strategies that have found
+    the most films are tried first.
+    """
+
+    def __init__(self, stats_file_path: Optional[Path] = None):
+        self.stats_file_path: Optional[Path] = stats_file_path
+        self.queries: Counter[str] = Counter()
+        self.hits: Counter[str] = Counter()
+        self.run_queries: Counter[str] = Counter()
+        self.run_hits: Counter[str] = Counter()
+        self.lock: threading.Lock = threading.Lock()
+
+        if self.stats_file_path is not None and self.stats_file_path.is_file():
+            self.load()
+
+    def load(self) -> None:
+        try:
+            stats = json.loads(self.stats_file_path.read_text(encoding="utf-8"))
+            self.queries.update(stats["queries"])
+            self.hits.update(stats["hits"])
+        except (OSError, ValueError, KeyError) as err:
+            logging.warning("Could not load the search strategy stats: %s", err)
+
+    def get_hit_rate(self, strategy: str) -> float:
+        # Strategies that have not been tried yet start at an even chance
+        return (self.hits[strategy] + 1) / (self.queries[strategy] + 2)
+
+    def order_candidate_queries(
+        self, candidate_queries: list[CandidateQuery]
+    ) -> list[CandidateQuery]:
+        """
+        Always search for the title itself first, then try the fallbacks
+        in order of how often each strategy has found a film before.
+        """
+        return sorted(
+            candidate_queries,
+            key=lambda candidate_query: (
+                candidate_query.strategy != TITLE_STRATEGY,
+                -self.get_hit_rate(candidate_query.strategy),
+            ),
+        )
+
+    def record_query(self, strategy: str, is_found: bool) -> None:
+        with self.lock:
+            self.queries[strategy] += 1
+            self.run_queries[strategy] += 1
+            if is_found:
+                self.hits[strategy] += 1
+                self.run_hits[strategy] += 1
+
+    def log_run_stats(self) -> None:
+        for strategy, query_count in self.run_queries.most_common():
+            logging.info(
+                "-- %s searches: %s sent, %s found a film",
+                strategy.capitalize(),
+                query_count,
+                self.run_hits[strategy],
+            )
+
+    def save(self) -> None:
+        if self.stats_file_path is None:
+            return
+
+        self.stats_file_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_file_path = self.stats_file_path.with_suffix(".json.tmp")
+        temporary_file_path.write_text(
+            json.dumps({"queries": self.queries, "hits": self.hits}),
+            encoding="utf-8",
+        )
+        os.replace(temporary_file_path, self.stats_file_path)
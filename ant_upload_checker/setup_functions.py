@@ -1,8 +1,10 @@
+import argparse
 import logging
 import inquirer
 from pathlib import Path
 from dotenv import set_key, dotenv_values
 from typing import Optional
+from ant_upload_checker.film_searcher import ANT_API_URL
 
 
 ENV_FILE_PATH = Path(".env").resolve()
@@ -12,6 +14,108 @@ def setup_logging() -> None:
     logging.basicConfig(level=logging.INFO, format="%(message)s")
 
 
+def parse_arguments(arguments: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="ant-upload-checker",
+        description="Check if local films have already been uploaded to ANT",
+    )
+    parser.add_argument(
+        "--scan-workers",
+        type=positive_int,
+        default=1,
+        help="Number of threads used to scan the input folders. "
+        "Values above 1 scan folders in parallel, which helps with network drives (default: 1)",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=positive_int,
+        default=1,
+        help="Number of processes used to parse film information from file names. "
+        "Values above 1 parse files in parallel, which helps with large libraries (default: 1)",
+    )
+    parser.add_argument(
+        "--search-workers",
+        type=positive_int,
+        default=1,
+        help="Number of searches sent to ANT at the same time. Searches still keep to "
+        "the rate limit, but waiting for responses overlaps with waiting for the "
+        "rate limit (default: 1)",
+    )
+    parser.add_argument(
+        "--reparse",
+        action="store_true",
+        help="Re-parse every film file, instead of only new or changed files",
+    )
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        help="List every folder again, instead of reusing the stored listing of "
+        "folders that have not changed since the last run. Films in reused "
+        "listings are still checked for changes",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and check new films as they are added to the input folders (Linux only)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue a run that was stopped before it finished, "
+        "without searching again for films it had already searched for",
+    )
+    parser.add_argument(
+        "--found-cache-hours",
+        type=positive_int,
+        default=24,
+        help="Hours to reuse saved search results for films found on ANT (default: 24)",
+    )
+    parser.add_argument(
+        "--not-found-cache-hours",
+        type=positive_int,
+        default=12,
+        help="Hours to reuse saved search results for films not found on ANT (default: 12)",
+    )
+    parser.add_argument(
+        "--refresh-searches",
+        action="store_true",
+        help="Search ANT again for every film, instead of reusing recently saved search results",
+    )
+    parser.add_argument(
+        "--ant-url",
+        default=ANT_API_URL,
+        help="Address of the ANT search API. Only needs changing to test against "
+        "a local mock server, e.g. one started with "
+        "python -m ant_upload_checker.mock_ant_server",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show how many films would be searched for on ANT and roughly how long "
+        "that would take, then stop without searching",
+    )
+    parser.add_argument(
+        "--compact-dtypes",
+        action="store_true",
+        help="Store the film list with compact column types, "
+        "which uses much less memory for very large film lists",
+    )
+
+    return parser.parse_args(arguments)
+
+
+def positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a whole number")
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"'{value}' must be 1 or greater")
+
+    return number
+
+
 def check_if_user_wants_to_override_env_file() -> bool:
     question = [
         inquirer.List(
@@ -1,4 +1,6 @@
 from ant_upload_checker.dupe_checker import DupeChecker
+from ant_upload_checker.film_list_types import get_film_list_df_types
+from ant_upload_checker.torrent import parse_api_response
 import pandas as pd
 import pytest
 
@@ -240,7 +242,37 @@ def test_check_if_film_is_duplicate(test_input, test_output):
         test_input[2],
         test_input[3],
         test_input[4],
-        test_input[5],
+        parse_api_response(test_input[5]),
     )
 
     assert actual_return == test_output
+
+
+@pytest.mark.parametrize("compact_dtypes", [False, True])
+def test_check_if_films_can_be_uploaded(compact_dtypes):
+    test_df = pd.DataFrame(
+        {
+            "Full file path": [values[0] for values in test_values],
+            "Parsed film title": [f"Film {x:02}" for x in range(len(test_values))],
+            "Film size (GB)": [1.0] * len(test_values),
+            "Resolution": [values[1] for values in test_values],
+            "Codec": [values[2] for values in test_values],
+            "Source": [values[3] for values in test_values],
+            "Release group": [values[4] for values in test_values],
+            "Already on ANT?": [""] * len(test_values),
+            "Info": [""] * len(test_values),
+        }
+    ).astype(get_film_list_df_types(compact_dtypes))
+    test_df["Should skip"] = False
+    test_df["API response"] = [parse_api_response(values[5]) for values in test_values]
+
+    actual_df = DupeChecker(test_df).check_if_films_can_be_uploaded()
+
+    actual_verdicts = actual_df.sort_values(by="Parsed film title")[
+        ["Already on ANT?", "Info"]
+    ]
+
+    assert list(actual_verdicts.itertuples(index=False, name=None)) == expected_values
+    assert isinstance(actual_df["Already on ANT?"].dtype, pd.CategoricalDtype) is (
+        compact_dtypes
+    )
@@ -0,0 +1,28 @@
+import os
+from pathlib import Path
+from ant_upload_checker.file_record import FileRecord
+
+
+def test_from_dir_entry(tmp_path):
+    film_file = tmp_path / "Film (2001).nfo"
+    film_file.write_text("Test film")
+
+    with os.scandir(tmp_path) as entries:
+        (entry,) = list(entries)
+        actual_record = FileRecord.from_dir_entry(entry)
+        expected_inode = entry.inode()
+
+    assert actual_record == FileRecord(
+        film_file, 9, film_file.stat().st_mtime, expected_inode
+    )
+    assert actual_record == FileRecord.from_path(film_file)
+
+
+def test_file_records_are_hashable():
+    record = FileRecord(Path("/films/A film.mkv"), 100, 1.5, 1)
+    same_record = FileRecord(Path("/films/A film.mkv"), 100, 1.5, 1)
+    changed_record = FileRecord(Path("/films/A film.mkv"), 200, 1.5, 1)
+
+    assert hash(record) == hash(same_record)
+    assert {record, same_record, changed_record} == {record, changed_record}
+    assert {record: "A film"}[same_record] == "A film"
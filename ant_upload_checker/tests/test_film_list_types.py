@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+from ant_upload_checker.film_list_types import (
+    COMPACT_STRING_TYPE,
+    FILM_LIST_DF_TYPES,
+    convert_to_film_list_df_types,
+    get_film_list_df_types,
+    restore_compact_df_types,
+)
+
+
+def test_get_film_list_df_types():
+    assert get_film_list_df_types() == FILM_LIST_DF_TYPES
+
+    actual_types = get_film_list_df_types(compact_dtypes=True)
+    expected_types = {
+        "Full file path": COMPACT_STRING_TYPE,
+        "Parsed film title": COMPACT_STRING_TYPE,
+        "Film size (GB)": "float64",
+        "Resolution": "category",
+        "Codec": "category",
+        "Source": "category",
+        "Release group": "category",
+        "Already on ANT?": "category",
+        "Info": COMPACT_STRING_TYPE,
+    }
+
+    assert actual_types == expected_types
+
+
+def test_convert_to_film_list_df_types_fills_missing_text():
+    test_df = pd.DataFrame(
+        {
+            "Parsed film title": ["Heat", "Aftersun"],
+            "Film size (GB)": [1.5, np.nan],
+            "Resolution": ["1080p", np.nan],
+        }
+    )
+
+    actual_df = convert_to_film_list_df_types(
+        test_df, get_film_list_df_types(compact_dtypes=True)
+    )
+
+    assert list(actual_df["Resolution"]) == ["1080p", ""]
+    assert isinstance(actual_df["Resolution"].dtype, pd.CategoricalDtype)
+    assert np.isnan(actual_df["Film size (GB)"][1])
+
+
+def test_restore_compact_df_types():
+    original_df = pd.DataFrame(
+        {"Resolution": ["1080p"], "Already on ANT?": [""]}
+    ).astype("category")
+    test_df = pd.concat(
+        [
+            original_df,
+            pd.DataFrame({"Resolution": ["720p"], "Already on ANT?": ["Duplicate"]}),
+        ]
+    )
+
+    actual_df = restore_compact_df_types(test_df, original_df.dtypes)
+
+    assert list(actual_df["Already on ANT?"]) == ["", "Duplicate"]
+    assert all(
+        isinstance(column_type, pd.CategoricalDtype) for column_type in actual_df.dtypes
+    )
+
+
+def test_restore_compact_df_types_leaves_standard_types():
+    original_df = pd.DataFrame({"Resolution": ["1080p"]}).astype("string")
+    test_df = pd.DataFrame({"Resolution": ["1080p"]}, dtype=object)
+
+    actual_df = restore_compact_df_types(test_df, original_df.dtypes)
+
+    assert actual_df is test_df
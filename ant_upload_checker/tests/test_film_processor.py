@@ -1,7 +1,14 @@
 import pytest
 import logging
+import os
 from pathlib import Path
-from ant_upload_checker.film_processor import FilmProcessor
+from guessit import guessit
+from ant_upload_checker.film_processor import (
+    FilmProcessor,
+    GUESSIT_PROPERTIES,
+    guess_film_properties,
+)
+from ant_upload_checker.file_record import FileRecord
 import pandas as pd
 import numpy as np
 from collections import OrderedDict
@@ -9,7 +16,7 @@ from collections import OrderedDict
 LOGGER = logging.getLogger(__name__)
 
 
-def test_get_film_file_paths(tmp_path):
+def test_get_film_file_records(tmp_path):
     temp_mp4_file = tmp_path / "test.mp4"
     temp_mp4_file.write_text("Test")
 
@@ -18,38 +25,151 @@ def test_get_film_file_paths(tmp_path):
     temp_mp4_file_to_be_removed = tmp_path / "Extras" / "test_2.mp4"
     temp_mp4_file_to_be_removed.write_text("Test")
 
-    fp = FilmProcessor(input_folders=[tmp_path.parent], output_folder="")
+    fp = FilmProcessor(input_folders=[tmp_path.parent], output_folder=tmp_path)
 
-    actual_output = fp.get_film_file_paths()
+    actual_output = fp.get_film_file_records()
     expected_output = [temp_mp4_file]
 
-    assert actual_output == expected_output
+    assert [record.path for record in actual_output] == expected_output
+    assert actual_output[0].size == 4
 
 
-@pytest.fixture
-def test_extras_file_paths():
-    test_paths = [
-        r"C:/The Extras 2030/The Extras 2030.mkv",
-        r"C:/The Extras 2030/Extras/Bloopers.mkv",
-        r"C:/Godzilla: King of the Monsters (2019)/Godzilla: King of the Monsters (2019).mkv",
-        r"C:/Godzilla: King of the Monsters (2019)/Extras/Godzilla extras (2019).mkv",
-        r"C:/Godzilla: King of the Monsters (2019)/Extras/Godzilla: King of the Monsters (2019).mkv",
+def test_scan_folder_for_film_records(tmp_path):
+    film_folder = tmp_path / "Film (2001)"
+    nested_extras_folder = film_folder / "Extras" / "Featurettes"
+    nested_extras_folder.mkdir(parents=True)
+
+    film_files = [
+        tmp_path / "Another film.avi",
+        film_folder / "Film (2001).mkv",
+        film_folder / "Film (2001).m2ts",
     ]
-    test_paths = [Path(x) for x in test_paths]
-    return test_paths
+    skipped_files = [
+        film_folder / "Film (2001).nfo",
+        nested_extras_folder / "Making of.mkv",
+    ]
+    for file in film_files + skipped_files:
+        file.write_text("Test")
 
+    fp = FilmProcessor(input_folders=[tmp_path], output_folder="")
 
-def test_remove_paths_containing_extras_folder(test_extras_file_paths):
-    fp = FilmProcessor("test", "test")
-    actual_list = fp.remove_paths_containing_extras_folder(test_extras_file_paths)
+    actual_output = sorted(
+        record.path for record in fp.scan_folder_for_film_records(tmp_path)
+    )
+    expected_output = sorted(film_files)
 
-    expected_list = [
-        r"C:/The Extras 2030/The Extras 2030.mkv",
-        r"C:/Godzilla: King of the Monsters (2019)/Godzilla: King of the Monsters (2019).mkv",
+    assert actual_output == expected_output
+
+
+def test_get_film_file_records_in_parallel(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+
+    input_folders = [tmp_path / "Films", tmp_path / "Old films"]
+    for folder in input_folders:
+        for film in ["A film (2001)", "B film (2002)", "C film (2003)"]:
+            (folder / film / "Extras").mkdir(parents=True)
+            (folder / film / f"{film}.mkv").write_text("Test")
+            (folder / film / "Extras" / f"{film} bloopers.mkv").write_text("Test")
+        (folder / "Loose film.mp4").write_text("Test")
+
+    serial_fp = FilmProcessor(
+        input_folders=input_folders, output_folder=tmp_path, full_scan=True
+    )
+    parallel_fp = FilmProcessor(
+        input_folders=input_folders,
+        output_folder=tmp_path,
+        scan_workers=4,
+        full_scan=True,
+    )
+
+    expected_output = serial_fp.get_film_file_records()
+    actual_output = parallel_fp.get_film_file_records()
+
+    assert len(actual_output) == 8
+    assert actual_output == expected_output
+    for folder in input_folders:
+        assert f"Scanned {folder} in" in caplog.text
+
+
+def test_scan_single_folder_skips_unopenable_files(tmp_path, caplog):
+    temp_mkv_file = tmp_path / "Film (2001).mkv"
+    temp_mkv_file.write_text("Test film")
+    (tmp_path / "Broken link (2002).mkv").symlink_to(tmp_path / "Missing.mkv")
+
+    fp = FilmProcessor(input_folders=[tmp_path], output_folder="")
+    actual_records, actual_sub_folders = fp.scan_single_folder(tmp_path)
+
+    file_stat = temp_mkv_file.stat()
+    expected_records = [
+        FileRecord(
+            temp_mkv_file, file_stat.st_size, file_stat.st_mtime, file_stat.st_ino
+        )
     ]
-    expected_list = [Path(x) for x in expected_list]
 
-    assert actual_list == expected_list
+    assert actual_records == expected_records
+    assert actual_sub_folders == []
+    assert (
+        "Broken link (2002) could not be opened or does not exist, skipping."
+        in caplog.text
+    )
+
+
+def test_get_film_file_records_reuses_unchanged_folders(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+
+    input_folder = tmp_path / "Films"
+    unchanged_folder = input_folder / "A film (2001)"
+    changed_folder = input_folder / "B film (2002)"
+    for folder in [unchanged_folder, changed_folder]:
+        folder.mkdir(parents=True)
+        (folder / f"{folder.name}.mkv").write_text("Test")
+
+    fp = FilmProcessor(input_folders=[input_folder], output_folder=tmp_path)
+    first_scan = fp.get_film_file_records()
+
+    new_film = changed_folder / "B film (2002) 2160p.mkv"
+    new_film.write_text("Test")
+
+    listed_folders = []
+    scandir = os.scandir
+
+    def mock_scandir(folder):
+        listed_folders.append(Path(folder))
+        return scandir(folder)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(os, "scandir", mock_scandir)
+        second_scan = fp.get_film_file_records()
+
+    assert listed_folders == [changed_folder]
+    assert [record for record in second_scan if record.path != new_film] == first_scan
+    assert new_film in [record.path for record in second_scan]
+    assert "2 of 3 folders were unchanged since the last run" in caplog.text
+
+    full_fp = FilmProcessor(
+        input_folders=[input_folder], output_folder=tmp_path, full_scan=True
+    )
+    assert full_fp.get_film_file_records() == second_scan
+
+
+def test_get_film_file_records_restats_films_in_unchanged_folders(tmp_path):
+    input_folder = tmp_path / "Films"
+    input_folder.mkdir()
+    replaced_film = input_folder / "A film (2001).mkv"
+    replaced_film.write_text("Test")
+
+    fp = FilmProcessor(input_folders=[input_folder], output_folder=tmp_path)
+    (first_record,) = fp.get_film_file_records()
+
+    folder_mtime = input_folder.stat().st_mtime_ns
+    replaced_film.write_text("A longer test film")
+    assert input_folder.stat().st_mtime_ns == folder_mtime
+
+    (second_record,) = fp.get_film_file_records()
+
+    assert first_record.size == 4
+    assert second_record == FileRecord.from_path(replaced_film)
+    assert second_record.size == 18
 
 
 @pytest.fixture
@@ -174,119 +294,290 @@ def test_guessit_films():
         },
     ]
 
-    ordered_dict_guessit_films = [OrderedDict(x) for x in test_guessit_films]
+    ordered_dict_guessit_films = [
+        OrderedDict(x, type="movie") for x in test_guessit_films
+    ]
 
     return ordered_dict_guessit_films
 
 
-def test_get_guessit_info_from_film_paths(test_film_paths):
-    fp = FilmProcessor("test", "test")
+def test_get_guessit_info_from_film_paths(test_film_paths, tmp_path):
+    fp = FilmProcessor("test", tmp_path)
     actual_guessit_films = fp.get_guessit_info_from_film_paths(test_film_paths)
 
-    expected_type = OrderedDict
-    assert all([isinstance(x, expected_type) for x in actual_guessit_films])
-    assert all([x["type"] == "movie" for x in actual_guessit_films])
+    assert len(actual_guessit_films) == len(test_film_paths)
+    assert all([type(x) is dict for x in actual_guessit_films])
+    # Guessit does not recognise 2100 as a year, so takes those files for episodes
+    assert [x["type"] for x in actual_guessit_films] == (
+        ["movie"] * 4
+        + ["episode", "movie", "movie"]
+        + ["episode"] * 4
+        + ["movie"] * 2
+        + ["episode"]
+    )
+    assert all([set(x) <= set(GUESSIT_PROPERTIES) for x in actual_guessit_films])
+
 
+def test_get_guessit_info_from_film_paths_in_parallel(test_film_paths, tmp_path):
+    serial_fp = FilmProcessor("test", tmp_path / "serial")
+    parallel_fp = FilmProcessor("test", tmp_path / "parallel", parse_workers=2)
 
-def test_get_film_attribute_from_guessed_film(test_guessit_films):
+    expected_guessit_films = serial_fp.get_guessit_info_from_film_paths(
+        test_film_paths
+    )
+    actual_guessit_films = parallel_fp.get_guessit_info_from_film_paths(
+        test_film_paths
+    )
+
+    assert actual_guessit_films == expected_guessit_films
+
+
+def test_get_guessit_info_from_film_paths_uses_cache(
+    test_film_paths, tmp_path, monkeypatch, caplog
+):
+    caplog.set_level(logging.INFO)
+
+    fp = FilmProcessor("test", tmp_path)
+    expected_guessit_films = fp.get_guessit_info_from_film_paths(test_film_paths)
+
+    def mock_guess_film_properties(file_paths):
+        assert file_paths == []
+        return []
+
+    monkeypatch.setattr(
+        fp, "guess_film_properties_from_paths", mock_guess_film_properties
+    )
+    actual_guessit_films = fp.get_guessit_info_from_film_paths(test_film_paths)
+
+    assert actual_guessit_films == expected_guessit_films
+    assert "for 0 files (14 already cached)" in caplog.text
+
+
+@pytest.fixture
+def test_release_name_paths():
+    test_list = [
+        r"C:/Films/Heat.1995.1080p.BluRay.x264-GROUP.mkv",
+        r"C:/Films/The.Matrix.1999.2160p.UHD.BluRay.x265-GROUP.mkv",
+        r"C:/Films/The Matrix (1999)/The.Matrix.1999.1080p.BluRay.x264-GROUP.mkv",
+        r"C:/Films/Spider-Man.2002.720p.WEB-DL.x264-FLUX.mkv",
+        r"C:/Films/Ocean's.Eleven.2001.1080p.WEBRip.x265-RARBG.mkv",
+        r"C:/Films/Fast.and.Furious.2009.1080p.BluRay.REMUX.AVC.DTS-FGT.mkv",
+        r"C:/Films/Heat.1995.2160p.BluRay.HDR.10bit.x265.TrueHD.Atmos-FraMeSToR.mkv",
+        r"C:/Films/Heat.1995.576p.DVDRip.XviD-GROUP.avi",
+        r"C:/Films/Heat.1995.1080P.BLURAY.X264-GROUP.mkv",
+        r"C:/Films/Heat.1995.2160p.WEB.H265-NTb.mkv",
+        r"C:/Films/Heat.1995.1080p.HDTV.x264-EVO.mkv",
+        r"C:/Films/Alien.2023.1080p.UHD.BDRip.x264-SPARKS.mkv",
+        r"C:/Films/Alien.2023.2160p.BluRay.REMUX.HDR.DV.HEVC.TrueHD.Atmos-SPARKS.mkv",
+        r"C:/Films/Heat.1995.1080p.BluRay.x264-sample.mkv",
+        r"C:/Films/Trailer.2018.1080p.BluRay.x264-GROUP.mkv",
+        r"C:/Films/Soft.Skin.1964.1080p.BluRay.x264-GROUP.mkv",
+        r"C:/Films/Directors.Cut.1985.1080p.BluRay.x264-GROUP.mkv",
+        r"C:/Films/Dune.Part.Two.2024.2160p.WEB-DL.x265-GROUP.mkv",
+        r"C:/Films/French.1956.1080p.BluRay.x264-GROUP.mkv",
+        r"C:/Films/L.A.Confidential.1997.1080p.BluRay.x264-GROUP.mkv",
+        r"C:/Films/E.T.1982.1080p.BluRay.x264-GROUP.mkv",
+        r"C:/Films/Other Film (2001)/Heat.1995.1080p.BluRay.x264-GROUP.mkv",
+        r"C:/Films/Season 1/Heat.1995.1080p.BluRay.x264-GROUP.mkv",
+        r"C:/Films/Heat.1995.1080p.WEB-DL.DDP5.1.H.264-GROUP.mkv",
+        r"C:/Films/Amelie.2001.FRENCH.1080p.BluRay.x264-GROUP.mkv",
+        r"C:/Films/Alien.2023.1080p.WEB.HDR.H264-SPARKS.mkv",
+        r"C:/Films/Alien.2023.2160p.WEB.HDR10.H265-SPARKS.mkv",
+        r"C:/Films/Alien.2023.2160p.WEB.HDR.DV.H265-SPARKS.mkv",
+        r"C:/Films/Alien.2023.1080p.BDRip.UHD.x264-SPARKS.mkv",
+        r"C:/Films/Alien.2023.1080p.BluRay.x264.DTS.HDR-SPARKS.mkv",
+        r"C:/Films/Heat.1995.1080p.PROPER.BluRay.x264-GROUP.mkv",
+        r"C:/Films/Love.1968.1080p.BDRip.HDR.h265.DTS-x264.mkv",
+        r"C:/Films/Love.1968.1080p.BDRip.HDR.h265-DTS-HDR.mkv",
+        r"C:/Films/Annie.1999.720p.BRRip.REMUX.H264-2160p.mkv",
+        r"C:/Films/Annie.1999.720p.BRRip.H264-REMUX.mkv",
+        r"C:/Films/Annie.1999.720p.BRRip.H264.AAC-Hes.mkv",
+        r"C:/Films/Annie.1999.720p.BRRip.H264.AAC-ScrBD.mkv",
+        r"C:/Films/Love.1968.1080p.BDRip.h265.DTS-DTSES.mkv",
+        r"C:/Films/Love.1968.1080p.BDRip.h265-TVRip.mkv",
+        r"C:/Films/Love.1968.1080p.BDRip.h265-CD1.mkv",
+        r"C:/Films/Love.1968.1080p.BDRip.h265-xyz.mkv",
+        r"C:/Films/Love.1968.1080p.BDRip.h265-By.mkv",
+        r"C:/Films/Heat.1995.2160p.BluRay.x265-W4NK3R.mkv",
+    ]
+    test_list = [Path(x) for x in test_list]
+
+    return test_list
+
+
+def test_fast_parse_film_properties_matches_guessit(
+    test_film_paths, test_release_name_paths
+):
+    """
+    Conformance test: every name the fast parser accepts must be parsed
+    exactly as guessit would parse it.
+    """
+    fp = FilmProcessor("test", "test")
+
+    fast_parsed_paths = []
+    for path in test_film_paths + test_release_name_paths:
+        fast_parsed_film = fp.fast_parse_film_properties(path)
+        if fast_parsed_film is not None:
+            fast_parsed_paths.append(path)
+            assert fast_parsed_film == guess_film_properties(path), path
+
+    assert fast_parsed_paths == test_release_name_paths[:13]
+
+
+def test_guessit_options_do_not_change_film_properties(
+    test_film_paths, test_release_name_paths
+):
+    for path in test_film_paths + test_release_name_paths:
+        guessed_media = guessit(path)
+        expected_film = {
+            film_property: guessed_media[film_property]
+            for film_property in GUESSIT_PROPERTIES
+            if film_property in guessed_media
+        }
+
+        assert guess_film_properties(path) == expected_film, path
+
+
+def test_fast_parse_film_properties_leaves_ambiguous_names_to_guessit(
+    test_release_name_paths,
+):
     fp = FilmProcessor("test", "test")
 
     actual_list = [
-        fp.get_film_attribute_from_guessed_film(x, "title") for x in test_guessit_films
-    ]
-    expected_list = [
-        "Atlantics",
-        "tick tick BOOM!",
-        "Da 5 Bloods",
-        "Short term 12",
-        "X: First Class",
-        "Nick Fury: Agent of S.H.I.E.L.D.",
-        "L A Confidential",
-        "A I Artificial Intelligence",
-        "G I Jane",
-        "E T the Extra-Terrestrial",
-        "S.W.A.T.",
-        "T E S Test film",
-        "T E.S.T Test film",
-        "Test film",
+        fp.fast_parse_film_properties(path) for path in test_release_name_paths[13:]
     ]
 
-    assert actual_list == expected_list
+    assert actual_list == [None] * 30
 
 
-def test_get_source_film_attribute_from_guessed_film(test_guessit_films):
-    fp = FilmProcessor("test", "test")
+def test_get_guessit_info_from_film_paths_counts_parsers(
+    test_film_paths, test_release_name_paths, tmp_path, caplog
+):
+    caplog.set_level(logging.INFO)
 
-    actual_list = fp.get_source_from_guessed_films(test_guessit_films)
+    fp = FilmProcessor("test", tmp_path)
+    fp.get_guessit_info_from_film_paths(test_film_paths + test_release_name_paths)
 
-    expected_list = [
-        "Blu-ray",  # Ultra-HD blu ray gets converted into blu-ray
-        "DVD",
-        "Blu-ray",
-        "Blu-ray",
-        "Blu-ray",
-        "Blu-ray",
-        "Blu-ray",
-        "Blu-ray",
-        "Blu-ray",
-        "Blu-ray",
-        "Blu-ray",
-        "Blu-ray",
-        "Blu-ray",
-        "Blu-ray, DVD",  # list of sources gets put into string
+    assert fp.parsed_film_counts == {
+        "fast parser": 13,
+        "guessit cache": 0,
+        "guessit": 44,
+    }
+    assert "Parsed 13 files with the fast parser" in caplog.text
+
+    fp.get_guessit_info_from_film_paths(test_film_paths + test_release_name_paths)
+
+    assert fp.parsed_film_counts == {
+        "fast parser": 13,
+        "guessit cache": 44,
+        "guessit": 0,
+    }
+
+
+@pytest.fixture
+def test_guessit_film_records(test_guessit_films):
+    test_records = [
+        FileRecord(Path(f"C:/Film {position}.mkv"), 1073741824 * position, 0, 0)
+        for position in range(len(test_guessit_films))
     ]
 
-    assert actual_list == expected_list
+    return test_records
 
 
-def test_get_codec_film_attribute_from_guessed_films(test_guessit_films):
+def test_create_film_list_dataframe_from_guessed_media(
+    test_guessit_films, test_guessit_film_records
+):
     fp = FilmProcessor("test", "test")
 
-    actual_list = fp.get_codec_from_guessed_films(test_guessit_films)
+    actual_df = fp.create_film_list_dataframe_from_guessed_media(
+        test_guessit_film_records, test_guessit_films
+    )
 
-    expected_list = [
-        "H265",
-        "MPEG-2",
-        "H264",
-        "H264",
-        "H264",
-        "H264",
-        "H264",
-        "H264",
-        "H264",
-        "H264",
-        "H264",
-        "H264",
-        "H264",
-        "H264",
+    expected_titles = [
+        "Atlantics",
+        "tick tick BOOM!",
+        "Da 5 Bloods",
+        "Short term 12",
+        "X: First Class",
+        "Nick Fury: Agent of S.H.I.E.L.D.",
+        "L.A. Confidential",
+        "A.I. Artificial Intelligence",
+        "G.I. Jane",
+        "E.T. the Extra-Terrestrial",
+        "S.W.A.T.",
+        "T.E.S. Test film",
+        "T.E.S.T. Test film",
+        "Test film",
     ]
+    expected_resolutions = [
+        "2160p",
+        "720p",
+        "1080p",
+        "1080p",
+        "1080p",
+        "1080p",
+        "1080p",
+        "1080p",
+        "",  # File name for G.I. Jane has no resolution - expect ""
+        "1080p",
+        "1080p",
+        "1080p",
+        "1080p",
+        "1080p",
+    ]
+    expected_codecs = ["H265", "MPEG-2"] + ["H264"] * 12
+    expected_sources = (
+        # Ultra-HD blu ray gets converted into blu-ray
+        ["Blu-ray", "DVD"]
+        + ["Blu-ray"] * 11
+        # list of sources gets put into string
+        + ["Blu-ray, DVD"]
+    )
+    expected_release_groups = ["test"] * 11 + [""] * 3
 
-    assert actual_list == expected_list
+    assert list(actual_df["Full file path"]) == [
+        str(record.path) for record in test_guessit_film_records
+    ]
+    assert list(actual_df["Film size (GB)"]) == list(range(14))
+    assert list(actual_df["Parsed film title"]) == expected_titles
+    assert list(actual_df["Resolution"]) == expected_resolutions
+    assert list(actual_df["Codec"]) == expected_codecs
+    assert list(actual_df["Source"]) == expected_sources
+    assert list(actual_df["Release group"]) == expected_release_groups
 
 
-def test_get_release_group_from_guessed_films(test_guessit_films):
+def test_create_film_list_dataframe_from_guessed_media_skips_non_films(
+    test_guessit_films, test_guessit_film_records
+):
     fp = FilmProcessor("test", "test")
+    test_guessit_films[1]["type"] = "episode"
+    test_guessit_films[5]["type"] = "episode"
 
-    actual_list = fp.get_release_groups_from_guessed_films(test_guessit_films)
+    actual_df = fp.create_film_list_dataframe_from_guessed_media(
+        test_guessit_film_records, test_guessit_films
+    )
 
-    expected_list = [
-        "test",
-        "test",
-        "test",
-        "test",
-        "test",
-        "test",
-        "test",
-        "test",
-        "test",
-        "test",
-        "test",
-        "",
-        "",
-        "",
+    kept_positions = [x for x in range(14) if x not in [1, 5]]
+
+    assert list(actual_df["Full file path"]) == [
+        f"C:/Film {x}.mkv" for x in kept_positions
+    ]
+    assert list(actual_df["Film size (GB)"]) == kept_positions
+    assert list(actual_df["Parsed film title"][:5]) == [
+        "Atlantics",
+        "Da 5 Bloods",
+        "Short term 12",
+        "X: First Class",
+        "L.A. Confidential",
     ]
 
-    assert actual_list == expected_list
+
+def test_format_guessed_property():
+    fp = FilmProcessor("test", "test")
+
+    assert fp.format_guessed_property("Blu-ray") == "Blu-ray"
+    assert fp.format_guessed_property(["Blu-ray", "DVD"]) == "Blu-ray, DVD"
+    assert fp.format_guessed_property(None) == ""
 
 
 def test_fix_title_if_contains_acronym():
@@ -329,51 +620,26 @@ def test_fix_title_if_contains_acronym():
     assert actual_list == expected_list
 
 
-def test_get_formatted_titles_from_guessed_films(test_guessit_films):
+def test_fix_titles_if_contain_acronyms():
     fp = FilmProcessor("test", "test")
-    actual_list = fp.get_formatted_titles_from_guessed_films(test_guessit_films)
 
-    expected_list = [
+    test_list = [
         "Atlantics",
-        "tick tick BOOM!",
+        "L A Confidential",
         "Da 5 Bloods",
-        "Short term 12",
-        "X: First Class",
-        "Nick Fury: Agent of S.H.I.E.L.D.",
-        "L.A. Confidential",
-        "A.I. Artificial Intelligence",
-        "G.I. Jane",
-        "E.T. the Extra-Terrestrial",
         "S.W.A.T.",
-        "T.E.S. Test film",
-        "T.E.S.T. Test film",
-        "Test film",
+        "T E.S.T Test film",
+        "L A Confidential",
+        "",
+        "E T the Extra-Terrestrial\n",
+        "A.I",
     ]
 
-    assert actual_list == expected_list
-
-
-def test_get_film_resolutions_from_guessed_film(test_guessit_films):
-    fp = FilmProcessor("test", "test")
-    actual_list = fp.get_film_resolutions_from_guessed_films(test_guessit_films)
-    expected_list = [
-        "2160p",
-        "720p",
-        "1080p",
-        "1080p",
-        "1080p",
-        "1080p",
-        "1080p",
-        "1080p",
-        "",  # File name for G.I. Jane has no resolution - expect ""
-        "1080p",
-        "1080p",
-        "1080p",
-        "1080p",
-        "1080p",
-    ]
+    actual_list = fp.fix_titles_if_contain_acronyms(test_list)
+    expected_list = [fp.fix_title_if_contains_acronym(x) for x in test_list]
 
     assert actual_list == expected_list
+    assert actual_list[1] == actual_list[5] == "L.A. Confidential"
 
 
 def test_create_film_list_dataframe():
@@ -493,26 +759,109 @@ def test_combine_current_film_list_with_existing_csv(tmp_path, caplog):
     expected_df = pd.DataFrame(
         {
             "Full file path": [
-                "New film",
                 "test_path",
+                "New film",
             ],
-            "Parsed film title": ["New film", "test"],
-            "Film size (GB)": [9.9, 10.4],
+            "Parsed film title": ["test", "New film"],
+            "Film size (GB)": [10.4, 9.9],
             "Resolution": ["test", "test"],
             "Codec": ["test", "test"],
             "Source": ["test", "test"],
             "Release group": ["test", "test"],
             "Already on ANT?": [
-                "",
                 "NOT FOUND",
-            ],  # Note first np.nan was filled with empty string
-            "Info": ["", ""],
+                "",
+            ],
+            "Info": ["", ""],  # Note np.nan from the CSV was filled with empty string
         }
     ).astype(expected_dtypes)
 
     pd.testing.assert_frame_equal(actual_df, expected_df)
 
 
+def test_combine_current_film_list_with_existing_csv_is_keyed_on_file_path(
+    tmp_path, caplog
+):
+    caplog.set_level(logging.INFO)
+
+    test_existing_film_df = pd.DataFrame(
+        {
+            "Full file path": [
+                "C:/Heat (1995) 1080p.mkv",
+                "C:/Heat (1995) 2160p.mkv",
+                "C:/Resized (2001).mkv",
+                "C:/Renamed (2002).mkv",
+                "C:/Deleted (2003).mkv",
+            ],
+            "Parsed film title": ["Heat", "Heat", "Resized", "Old title", "Deleted"],
+            "Film size (GB)": [10.4, 40.1, 5.0, 6.0, 7.0],
+            "Resolution": ["1080p", "2160p", "", "", ""],
+            "Codec": ["", "", "", "", ""],
+            "Source": ["", "", "", "", ""],
+            "Release group": ["", "", "", "", ""],
+            "Already on ANT?": ["Duplicate", "Uploadable", "Uploadable", "Banned", ""],
+            "Info": ["link_1", "link_2", "link_3", "link_4", "link_5"],
+        }
+    )
+
+    fp = FilmProcessor(input_folders="", output_folder=tmp_path)
+    test_current_film_list = fp.create_film_list_dataframe(
+        [
+            "C:/Heat (1995) 1080p.mkv",
+            "C:/Heat (1995) 2160p.mkv",
+            "C:/Resized (2001).mkv",
+            "C:/Renamed (2002).mkv",
+            "C:/New (2004).mkv",
+        ],
+        [10.4, 40.1, 5.5, 6.0, 8.0],
+        ["Heat", "Heat", "Resized", "Renamed", "New"],
+        ["1080p", "2160p", "", "", ""],
+        ["", "", "", "", ""],
+        ["", "", "", "", ""],
+        ["", "", "", "", ""],
+    )
+
+    actual_df = fp.combine_current_film_list_with_existing_csv(
+        test_existing_film_df, test_current_film_list
+    )
+
+    assert list(actual_df["Full file path"]) == list(
+        test_current_film_list["Full file path"]
+    )
+    assert list(actual_df["Already on ANT?"]) == ["Duplicate", "Uploadable", "", "", ""]
+    assert list(actual_df["Info"]) == ["link_1", "link_2", "", "", ""]
+    assert actual_df.dtypes.to_dict() == test_current_film_list.dtypes.to_dict()
+    assert (
+        "Reusing the existing results of 2 unchanged files, "
+        "3 files are new or changed, 1 deleted files were dropped" in caplog.text
+    )
+    assert fp.film_list_changed is True
+
+
+def test_combine_current_film_list_with_existing_csv_tracks_changes(tmp_path):
+    fp = FilmProcessor(input_folders="", output_folder=tmp_path)
+    test_existing_film_df = fp.create_film_list_dataframe(
+        ["C:/Heat (1995).mkv", "C:/Deleted (2003).mkv"],
+        [10.4, 7.0],
+        ["Heat", "Deleted"],
+        ["1080p", ""],
+        ["", ""],
+        ["", ""],
+        ["", ""],
+    )
+    test_existing_film_df["Already on ANT?"] = ["Duplicate", "Banned"]
+
+    fp.combine_current_film_list_with_existing_csv(
+        test_existing_film_df, test_existing_film_df
+    )
+    assert fp.film_list_changed is False
+
+    fp.combine_current_film_list_with_existing_csv(
+        test_existing_film_df, test_existing_film_df.iloc[:1]
+    )
+    assert fp.film_list_changed is True
+
+
 def test_check_if_existing_film_csv_exists(tmp_path, caplog):
     caplog.set_level(logging.INFO)
 
@@ -597,3 +946,115 @@ def test_true_check_if_existing_csv_is_compatible(tmp_path, caplog):
 
     assert fp.check_if_existing_csv_is_compatible(test_existing_film_df) is True
     assert not Path.is_file(tmp_path.joinpath("Film list old version backup.csv"))
+
+
+def test_get_film_info_from_file_records_uses_scan_index(tmp_path, monkeypatch):
+    input_folder = tmp_path / "Films"
+    input_folder.mkdir()
+    film_names = [
+        "Da.5.Bloods.2020.1080p.BluRay.x264-GROUP.mkv",
+        "Atlantics.2019.2160p.WEB-DL.x265-TEST.mkv",
+    ]
+    for film_name in film_names:
+        (input_folder / film_name).write_text("Test")
+
+    fp = FilmProcessor(input_folders=[input_folder], output_folder=tmp_path)
+    first_run_df = fp.get_film_info_from_file_records(fp.get_film_file_records())
+
+    assert fp.scan_index_file_path.is_file()
+    assert list(first_run_df["Parsed film title"]) == ["Atlantics", "Da 5 Bloods"]
+
+    new_film = input_folder / "Aftersun.2022.1080p.BluRay.x264-NEW.mkv"
+    new_film.write_text("Test")
+    (input_folder / film_names[1]).unlink()
+
+    parsed_paths = []
+    parse_film_info = fp.parse_film_info_from_file_records
+
+    def mock_parse_film_info(film_file_records):
+        parsed_paths.extend(record.path for record in film_file_records)
+        return parse_film_info(film_file_records)
+
+    monkeypatch.setattr(fp, "parse_film_info_from_file_records", mock_parse_film_info)
+
+    second_run_df = fp.get_film_info_from_file_records(fp.get_film_file_records())
+
+    assert parsed_paths == [new_film]
+    assert list(second_run_df["Parsed film title"]) == ["Aftersun", "Da 5 Bloods"]
+    assert list(second_run_df["Release group"]) == ["new", "group"]
+    assert second_run_df.dtypes.to_dict() == first_run_df.dtypes.to_dict()
+
+
+def test_parse_film_info_from_file_records_keeps_paths_and_sizes_aligned(tmp_path):
+    film_names = [
+        "Da.5.Bloods.2020.1080p.BluRay.x264-GROUP.mkv",
+        "The.Pitt.S01E01.700.A.M.2160p.MAX.WEB-DL.DDP5.1.x265-NTb.mkv",
+        "Atlantics.2019.2160p.WEB-DL.x265-TEST.mkv",
+    ]
+    film_records = [
+        FileRecord(Path(f"C:/{film_name}"), 1073741824 * (position + 1), 0, 0)
+        for position, film_name in enumerate(film_names)
+    ]
+
+    fp = FilmProcessor("test", tmp_path)
+    actual_df = fp.parse_film_info_from_file_records(film_records)
+
+    assert list(actual_df["Full file path"]) == [
+        str(film_records[0].path),
+        str(film_records[2].path),
+    ]
+    assert list(actual_df["Parsed film title"]) == ["Da 5 Bloods", "Atlantics"]
+    assert list(actual_df["Film size (GB)"]) == [1, 3]
+
+
+def test_compact_dtypes_are_kept_when_combining_film_lists(tmp_path):
+    input_folder = tmp_path / "Films"
+    input_folder.mkdir()
+    (input_folder / "Da.5.Bloods.2020.1080p.BluRay.x264-GROUP.mkv").write_text("Test")
+
+    fp = FilmProcessor(
+        input_folders=[input_folder], output_folder=tmp_path, compact_dtypes=True
+    )
+    first_run_df = fp.get_film_info_from_file_records(fp.get_film_file_records())
+    first_run_df.assign(**{"Already on ANT?": "Uploadable"}).to_csv(
+        fp.csv_file_path, index=False
+    )
+
+    (input_folder / "Atlantics.2019.2160p.WEB-DL.x265-TEST.mkv").write_text("Test")
+    second_run_df = fp.get_film_info_from_file_records(fp.get_film_file_records())
+    combined_df = fp.combine_with_existing_film_csv(second_run_df)
+
+    assert list(combined_df["Parsed film title"]) == ["Atlantics", "Da 5 Bloods"]
+    assert list(combined_df["Already on ANT?"]) == ["", "Uploadable"]
+    for film_list_df in [first_run_df, second_run_df, combined_df]:
+        assert isinstance(film_list_df["Resolution"].dtype, pd.CategoricalDtype)
+        assert isinstance(film_list_df["Already on ANT?"].dtype, pd.CategoricalDtype)
+
+
+def test_read_existing_film_list_prefers_newer_state_file(
+    tmp_path, monkeypatch, caplog
+):
+    fp = FilmProcessor(input_folders="", output_folder=tmp_path)
+    csv_film_list = pd.DataFrame({"Parsed film title": ["From CSV"]})
+    csv_film_list.to_csv(fp.csv_file_path, index=False)
+    fp.state_file_path.parent.mkdir(parents=True)
+    fp.state_file_path.write_text("Test")
+
+    state_film_list = pd.DataFrame({"Parsed film title": ["From state file"]})
+    monkeypatch.setattr(pd, "read_parquet", lambda path: state_film_list)
+
+    csv_mtime = fp.csv_file_path.stat().st_mtime
+    os.utime(fp.state_file_path, (csv_mtime + 10, csv_mtime + 10))
+    assert fp.read_existing_film_list() is state_film_list
+
+    # The CSV was edited after the state file was saved
+    os.utime(fp.state_file_path, (csv_mtime - 10, csv_mtime - 10))
+    pd.testing.assert_frame_equal(fp.read_existing_film_list(), csv_film_list)
+
+    def mock_read_parquet(path):
+        raise ImportError("pyarrow is not installed")
+
+    monkeypatch.setattr(pd, "read_parquet", mock_read_parquet)
+    os.utime(fp.state_file_path, (csv_mtime + 10, csv_mtime + 10))
+    pd.testing.assert_frame_equal(fp.read_existing_film_list(), csv_film_list)
+    assert "Could not load the film list state file" in caplog.text
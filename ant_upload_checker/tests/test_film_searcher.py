@@ -1,8 +1,17 @@
+import json
+import time
 import pandas as pd
 import numpy as np
 import pytest
+import requests
 import logging
+from ant_upload_checker.film_list_types import get_film_list_df_types
 from ant_upload_checker.film_searcher import FilmSearcher
+from ant_upload_checker.mock_ant_server import MockAntServer
+from ant_upload_checker.rate_limiter import RateLimiter
+from ant_upload_checker.run_journal import RunJournal
+from ant_upload_checker.search_cache import SearchCache
+from ant_upload_checker.torrent import Torrent
 
 LOGGER = logging.getLogger(__name__)
 
@@ -20,7 +29,7 @@ def return_mock_search_for_film_on_ant_not_found(monkeypatch):
 @pytest.fixture
 def return_mock_search_for_film_on_ant_torrentid(monkeypatch):
     def mockreturn(test_arg, test_arg_2):
-        return [{"guid": "url/torrentid=1"}]
+        return [Torrent("url/torrentid=1")]
 
     monkeypatch.setattr(
         "test_film_searcher.FilmSearcher.search_for_film_title_on_ant", mockreturn
@@ -187,174 +196,288 @@ def test_check_if_film_exists_on_ant_true(
     actual_return = fs.check_if_film_exists_on_ant(film_title)
 
     assert f"Searching for {film_title}" in caplog.text
-    assert actual_return == [{"guid": "url/torrentid=1"}]
+    assert actual_return == [Torrent("url/torrentid=1")]
     assert "--- Not found on ANT ---" not in caplog.text
 
 
-def test_replace_word_and_re_search(
-    return_mock_search_for_film_on_ant_not_found, caplog
+def test_check_if_films_exist_on_ant_keeps_compact_dtypes(
+    return_mock_search_for_film_on_ant_not_found,
 ):
-    caplog.set_level(logging.INFO)
-    fs = FilmSearcher("test", "test_api_key")
-
-    test_film = "Test film biscuit"
-    test_regex = "biscuit"
-    test_replacement = "jaffa"
+    test_df = pd.DataFrame(
+        {
+            "Full file path": ["C:/Heat (1995).mkv", "C:/Aftersun (2022).mkv"],
+            "Parsed film title": ["Heat", "Aftersun"],
+            "Film size (GB)": [1.5, 2.5],
+            "Resolution": ["1080p", ""],
+            "Codec": ["H264", ""],
+            "Source": ["Blu-ray", ""],
+            "Release group": ["group", ""],
+            "Already on ANT?": ["Duplicate", ""],
+            "Info": ["test_link", ""],
+        }
+    ).astype(get_film_list_df_types(compact_dtypes=True))
 
-    actual_return = fs.replace_word_and_re_search(
-        test_film, test_regex, test_replacement
-    )
+    fs = FilmSearcher(test_df, "test_api_key")
+    actual_df = fs.check_if_films_exist_on_ant()
 
-    assert actual_return == []
-    assert "Searching for Test film jaffa as well..." in caplog.text
+    assert list(actual_df["Parsed film title"]) == ["Aftersun", "Heat"]
+    assert list(actual_df["Already on ANT?"]) == ["", "Duplicate"]
+    assert list(actual_df["Should skip"]) == [False, True]
+    for column in ["Resolution", "Codec", "Source", "Release group", "Already on ANT?"]:
+        assert isinstance(actual_df[column].dtype, pd.CategoricalDtype)
+    for column in ["Full file path", "Parsed film title", "Info"]:
+        assert actual_df[column].dtype == test_df[column].dtype
 
 
-films_four_numbers = {
-    "1208 East of Bucharest": "Searching for 12:08 East of Bucharest as well...",
-    "Test film 1508": "Searching for Test film 15:08 as well...",
-    "Film 1000 test": "Searching for Film 10:00 test as well...",
-}
+def test_check_if_films_exist_on_ant_reuses_journaled_searches(
+    tmp_path, monkeypatch
+):
+    journal_file_path = tmp_path / "run_journal.jsonl"
+    run_journal = RunJournal(journal_file_path)
+    run_journal.record_search("Heat", [Torrent("test_link")])
+    run_journal.close()
 
+    searched_titles = []
 
-@pytest.mark.parametrize("test_film", films_four_numbers)
-def test_search_for_film_if_contains_potential_time_true(
-    return_mock_search_for_film_on_ant_not_found, caplog, test_film
-):
-    caplog.set_level(logging.INFO)
-    fs = FilmSearcher("test", "test_api_key")
+    def mock_search_for_film_title_on_ant(self, film_title):
+        searched_titles.append(film_title)
+        return []
 
-    actual_return = fs.search_for_film_if_contains_potential_date_or_time(
-        test_film, format="time"
+    monkeypatch.setattr(
+        FilmSearcher, "search_for_film_title_on_ant", mock_search_for_film_title_on_ant
     )
 
-    assert actual_return == []
-    expected_log_info = films_four_numbers[test_film]
-    assert expected_log_info in caplog.text
-    assert "Film title may contain a date or time" in caplog.text
-
+    test_df = pd.DataFrame(
+        {
+            "Parsed film title": ["Heat", "Aftersun"],
+            "Already on ANT?": ["", ""],
+        }
+    )
+    resumed_journal = RunJournal(journal_file_path, resume=True)
+    fs = FilmSearcher(test_df, "test_api_key", resumed_journal)
+    actual_df = fs.check_if_films_exist_on_ant()
+    resumed_journal.close()
 
-films_five_numbers = ["12345 test film", "Test film 12345", "Film 12345 test"]
+    assert searched_titles == ["Aftersun"]
+    assert list(actual_df["API response"]) == [[], [Torrent("test_link")]]
+    assert RunJournal(journal_file_path, resume=True).searches == {
+        "heat": [Torrent("test_link")],
+        "aftersun": [],
+    }
 
 
-@pytest.mark.parametrize("test_film", films_five_numbers)
-def test_search_for_film_if_contains_potential_time_false(
-    return_mock_search_for_film_on_ant_torrentid, caplog, test_film
-):
-    # Film search mock return is the torrentid. This should never be returned
-    # If the film does not contain 4 numbers, as the search is skipped.
+def test_check_if_films_exist_on_ant_searches_each_title_once(monkeypatch, caplog):
     caplog.set_level(logging.INFO)
+    searched_titles = []
 
-    fs = FilmSearcher("test", "test_api_key")
+    def mock_search_for_film_title_on_ant(self, film_title):
+        searched_titles.append(film_title)
+        return [Torrent(f"{film_title} link")]
 
-    actual_return = fs.search_for_film_if_contains_potential_date_or_time(
-        test_film, format="time"
+    monkeypatch.setattr(
+        FilmSearcher, "search_for_film_title_on_ant", mock_search_for_film_title_on_ant
     )
 
-    assert actual_return == []
-    assert "Film title may contain a date or time" not in caplog.text
+    test_df = pd.DataFrame(
+        {
+            "Parsed film title": ["Heat", "Aftersun", "heat", "Heat ", "Aftersun"],
+            "Already on ANT?": ["", "", "", "", "Duplicate"],
+        }
+    )
+    fs = FilmSearcher(test_df, "test_api_key")
+    actual_df = fs.check_if_films_exist_on_ant()
 
+    assert searched_titles == ["Aftersun", "Heat"]
+    assert list(actual_df["API response"]) == [
+        [],
+        [Torrent("Aftersun link")],
+        [Torrent("Heat link")],
+        [Torrent("Heat link")],
+        [Torrent("Heat link")],
+    ]
+    assert "Searching for 2 distinct titles, saving 2 searches" in caplog.text
 
-films_with_dates_numbers = {
-    "77 One Day in London": "Searching for 7/7 One Day in London as well...",
-    "Test film 11": "Searching for Test film 1/1 as well...",
-    "Film 89 test": "Searching for Film 8/9 test as well...",
-    "911 film": "Searching for 9/11 film as well...",
-    "Fahrenheit 911": "Searching for Fahrenheit 9/11 as well...",
-    "Film 112 test": "Searching for Film 1/12 test as well...",
-}
 
+def test_check_if_film_exists_on_ant_reuses_cached_searches(tmp_path, monkeypatch):
+    searched_titles = []
 
-@pytest.mark.parametrize("test_film", films_with_dates_numbers)
-def test_search_for_film_if_contains_potential_date_true(
-    return_mock_search_for_film_on_ant_not_found, caplog, test_film
-):
-    caplog.set_level(logging.INFO)
-    fs = FilmSearcher("test", "test_api_key")
+    def mock_search_for_film_title_on_ant(self, film_title):
+        searched_titles.append(film_title)
+        return []
 
-    actual_return = fs.search_for_film_if_contains_potential_date_or_time(
-        test_film, format="date"
+    monkeypatch.setattr(
+        FilmSearcher, "search_for_film_title_on_ant", mock_search_for_film_title_on_ant
     )
 
-    assert actual_return == []
-    expected_log_info = films_with_dates_numbers[test_film]
-    assert expected_log_info in caplog.text
-    assert "Film title may contain a date or time" in caplog.text
+    search_cache = SearchCache(tmp_path / "search_cache.sqlite")
+    search_cache.store_search("Romeo and Juliet", [])
+    fs = FilmSearcher(pd.DataFrame(), "test_api_key", search_cache=search_cache)
 
+    assert fs.check_if_film_exists_on_ant("Romeo and Juliet") == []
+    assert searched_titles == ["Romeo & Juliet"]
+    assert search_cache.get_search("Romeo & Juliet") == []
+    assert fs.cached_search_count == 1
+    # Only the search sent to ANT counts towards the strategy stats
+    assert fs.strategy_stats.queries == {"and": 1}
 
-films_with_numbers_not_dates = [
-    "7777 One Day in London",
-    "Test film 1112",
-    "Film 8910 test",
-    "9 film",
-    "Fahrenheit 91144",
-    "Film 112444 test",
-]
 
+class MockResponse:
+    def __init__(self, status_code, response_json=None, headers=None):
+        self.status_code = status_code
+        self.response_json = response_json
+        self.headers = headers or {}
 
-@pytest.mark.parametrize("test_film", films_five_numbers)
-def test_search_for_film_if_contains_potential_date_false(
-    return_mock_search_for_film_on_ant_torrentid, caplog, test_film
-):
-    # Film search mock return is the torrentid. This should never be returned
-    # If the film does not contain 4 numbers, as the search is skipped.
-    caplog.set_level(logging.INFO)
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error")
 
-    fs = FilmSearcher("test", "test_api_key")
+    @property
+    def content(self):
+        return json.dumps(self.response_json).encode()
 
-    actual_return = fs.search_for_film_if_contains_potential_date_or_time(
-        test_film, format="date"
-    )
 
-    assert actual_return == []
-    assert "Film title may contain a date or time" not in caplog.text
+def test_search_for_film_title_on_ant_backs_off_when_rate_limited(monkeypatch):
+    found_json = {"response": {"total": 1}, "item": [{"guid": "test_link"}]}
+    responses = [
+        MockResponse(429, headers={"Retry-After": "7"}),
+        MockResponse(503),
+        MockResponse(200, found_json),
+    ]
+    back_offs = []
 
+    fs = FilmSearcher(pd.DataFrame(), "test_api_key")
+    monkeypatch.setattr(fs.session, "get", lambda url, params: responses.pop(0))
+    monkeypatch.setattr(fs.rate_limiter, "acquire", lambda: None)
+    monkeypatch.setattr(fs.rate_limiter, "back_off", back_offs.append)
 
-films_with_alternate_titles = {
-    "Alphaville une etrange aventure de Lemmy Caution AKA Alphaville": (
-        "Alphaville une etrange aventure de Lemmy Caution",
-        "Alphaville",
-    ),
-    "Title 1 aka Title 2": ("Title 1", "Title 2"),
-}
+    assert fs.search_for_film_title_on_ant("Heat") == [Torrent("test_link")]
+    assert back_offs == [7, None]
 
 
-@pytest.mark.parametrize("test_film", films_with_alternate_titles)
-def test_search_for_film_if_contains_aka_true(
-    return_mock_search_for_film_on_ant_not_found, caplog, test_film
+def test_search_for_film_title_on_ant_stops_when_still_rate_limited(
+    monkeypatch, caplog
 ):
-    caplog.set_level(logging.INFO)
+    fs = FilmSearcher(pd.DataFrame(), "test_api_key")
+    monkeypatch.setattr(fs.session, "get", lambda url, params: MockResponse(429))
+    monkeypatch.setattr(fs.rate_limiter, "acquire", lambda: None)
+    monkeypatch.setattr(fs.rate_limiter, "back_off", lambda retry_after: None)
 
-    fs = FilmSearcher("test", "test_api_key")
-    actual_return = fs.search_for_film_if_contains_aka(test_film)
+    with pytest.raises(SystemExit):
+        fs.search_for_film_title_on_ant("Heat")
 
-    assert actual_return == []
-    assert "Film title may contain an alternate title" in caplog.text
-    assert (
-        f"Searching for {films_with_alternate_titles[test_film][0]} as well..."
-        in caplog.text
-    )
-    assert (
-        f"Searching for {films_with_alternate_titles[test_film][1]} as well..."
-        in caplog.text
-    )
+    assert "ANT is still limiting searches after slowing down 5 times" in caplog.text
 
 
-films_with_no_alternate_title = [
-    "Aka Test film",
-    "Test film aka",
-    "Film with baka in it",
-]
+@pytest.fixture
+def mock_ant_server():
+    recorded_responses = {
+        film_title: [{"guid": film_title}]
+        for film_title in ["Heat", "Romeo & Juliet", "Oldboy"]
+    }
 
+    with MockAntServer(
+        recorded_responses, found_rate=0, latency_seconds=0.05
+    ) as mock_server:
+        yield mock_server
 
-@pytest.mark.parametrize("test_film", films_with_no_alternate_title)
-def test_search_for_film_if_contains_aka_false(
-    return_mock_search_for_film_on_ant_not_found, caplog, test_film
-):
-    caplog.set_level(logging.INFO)
 
-    fs = FilmSearcher("test", "test_api_key")
-    actual_return = fs.search_for_film_if_contains_aka(test_film)
+def test_concurrent_searches_match_one_at_a_time(mock_ant_server):
+    test_df = pd.DataFrame(
+        {
+            "Parsed film title": [
+                "Heat",
+                "Romeo and Juliet",
+                "Aftersun",
+                "Oldboy",
+                "Lady Vengeance aka Oldboy",
+                "Dogville",
+            ],
+            "Already on ANT?": ["", "", "", "", "", ""],
+        }
+    )
 
-    assert actual_return == []
-    assert "Film title may contain an alternate title" not in caplog.text
-    assert f"Searching for Test film as well" not in caplog.text
+    actual_responses = {}
+    for search_workers in [1, 4]:
+        fs = FilmSearcher(
+            test_df.copy(),
+            "test_api_key",
+            rate_limiter=RateLimiter(1000),
+            search_workers=search_workers,
+            ant_url=mock_ant_server.url,
+        )
+        actual_df = fs.check_if_films_exist_on_ant()
+        actual_responses[search_workers] = list(actual_df["API response"])
+
+    assert actual_responses[4] == actual_responses[1]
+    assert actual_responses[1] == [
+        [],
+        [],
+        [Torrent("Heat")],
+        [Torrent("Oldboy")],
+        [Torrent("Oldboy")],
+        [Torrent("Romeo & Juliet")],
+    ]
+
+
+def test_search_each_title_once_stops_searching_after_an_error(monkeypatch):
+    searched_titles = []
+
+    def mock_search(film_title):
+        searched_titles.append(film_title)
+        if film_title == "Film 0":
+            raise SystemExit("Invalid API key")
+        time.sleep(0.001)
+        return []
+
+    fs = FilmSearcher(pd.DataFrame(), "test_api_key", search_workers=2)
+    monkeypatch.setattr(fs, "check_if_film_exists_on_ant", mock_search)
+
+    with pytest.raises(SystemExit):
+        fs.search_each_title_once(pd.Series([f"Film {i}" for i in range(1000)]))
+
+    assert len(searched_titles) < 1000
+
+
+def test_search_for_film_title_on_ant_recovers_from_rate_limit_burst():
+    with MockAntServer(
+        {"Heat": [{"guid": "test_link"}]},
+        rate_limit_every=3,
+        rate_limit_burst=2,
+        retry_after_seconds=0,
+    ) as mock_server:
+        fs = FilmSearcher(
+            pd.DataFrame(),
+            "test_api_key",
+            rate_limiter=RateLimiter(1000),
+            ant_url=mock_server.url,
+        )
+
+        assert fs.search_for_film_title_on_ant("Heat") == [Torrent("test_link")]
+        assert fs.search_for_film_title_on_ant("Heat") == [Torrent("test_link")]
+        assert mock_server.status_counts == {200: 2, 429: 2}
+
+
+def test_search_for_film_title_on_ant_decodes_gzipped_responses():
+    recorded_api_item = {
+        "guid": "test_link",
+        "resolution": "1080p",
+        "codec": "H264",
+        "media": "Blu-ray",
+        "files": [{"size": "100", "name": "Heat.mkv"}],
+    }
+
+    with MockAntServer(
+        {"Heat": [recorded_api_item]}, gzip_responses=True
+    ) as mock_server:
+        fs = FilmSearcher(
+            pd.DataFrame(),
+            "test_api_key",
+            rate_limiter=RateLimiter(1000),
+            ant_url=mock_server.url,
+        )
+
+        actual_return = fs.search_for_film_title_on_ant("Heat")
+
+    assert actual_return == [
+        Torrent("test_link", "1080p", "H264", "Blu-ray", frozenset(["Heat.mkv"]))
+    ]
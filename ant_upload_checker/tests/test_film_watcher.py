@@ -0,0 +1,159 @@
+import os
+import sys
+import pandas as pd
+import pytest
+from ant_upload_checker.film_processor import FilmProcessor
+from ant_upload_checker.film_watcher import FilmWatcher
+from ant_upload_checker.mock_ant_server import MockAntServer
+from ant_upload_checker.search_cache import SearchCache
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is only available on Linux"
+)
+
+
+@pytest.fixture
+def return_mock_search_for_film_on_ant_not_found(monkeypatch):
+    def mockreturn(test_arg, test_arg_2):
+        return []
+
+    monkeypatch.setattr(
+        "ant_upload_checker.film_searcher.FilmSearcher.search_for_film_title_on_ant",
+        mockreturn,
+    )
+
+
+def test_wait_for_settled_films(tmp_path):
+    input_folder = tmp_path / "Films"
+    (input_folder / "Extras").mkdir(parents=True)
+    downloads_folder = tmp_path / "Downloads" / "Aftersun (2022)"
+    downloads_folder.mkdir(parents=True)
+
+    fp = FilmProcessor(input_folders=[input_folder], output_folder=tmp_path)
+    watcher = FilmWatcher(fp, "test_api_key", settle_seconds=0.1)
+    watcher.add_folder_watches(input_folder)
+
+    new_film = input_folder / "Da.5.Bloods.2020.1080p.BluRay.x264-GROUP.mkv"
+    new_film.write_text("Test")
+    (input_folder / "Da.5.Bloods.2020.1080p.BluRay.x264-GROUP.nfo").write_text("Test")
+    (input_folder / "Extras" / "Bloopers.mkv").write_text("Test")
+
+    (downloads_folder / "Aftersun.2022.1080p.WEB-DL.x264-TEST.mkv").write_text("Test")
+    downloads_folder.rename(input_folder / "Aftersun (2022)")
+
+    actual_return = watcher.wait_for_settled_films(max_wait=2)
+    watcher.close()
+
+    expected_return = [
+        input_folder / "Aftersun (2022)" / "Aftersun.2022.1080p.WEB-DL.x264-TEST.mkv",
+        new_film,
+    ]
+
+    assert actual_return == expected_return
+
+
+def test_wait_for_settled_films_waits_for_size_to_stop_changing(tmp_path):
+    fp = FilmProcessor(input_folders=[tmp_path], output_folder=tmp_path)
+    watcher = FilmWatcher(fp, "test_api_key", settle_seconds=0.1)
+    watcher.add_folder_watches(tmp_path)
+
+    downloading_film = tmp_path / "Aftersun.2022.1080p.WEB-DL.x264-TEST.mkv"
+    with open(downloading_film, "w") as film_file:
+        film_file.write("Test")
+        film_file.flush()
+        watcher.queue_film(str(downloading_film))
+        watcher.pending_films[str(downloading_film)] -= watcher.settle_seconds
+
+        # Written to without being closed, so no new inotify event is sent
+        film_file.write(" film")
+        film_file.flush()
+        assert watcher.wait_for_settled_films(max_wait=0) == []
+
+    assert watcher.wait_for_settled_films(max_wait=2) == [downloading_film]
+    watcher.close()
+
+
+def test_wait_for_settled_films_finds_linked_films(tmp_path):
+    input_folder = tmp_path / "Films"
+    input_folder.mkdir()
+    downloads_folder = tmp_path / "Downloads"
+    downloads_folder.mkdir()
+    downloaded_film = downloads_folder / "Aftersun.2022.1080p.WEB-DL.x264-TEST.mkv"
+    downloaded_film.write_text("Test")
+
+    fp = FilmProcessor(input_folders=[input_folder], output_folder=tmp_path)
+    watcher = FilmWatcher(fp, "test_api_key", settle_seconds=0.1)
+    watcher.add_folder_watches(input_folder)
+
+    linked_film = input_folder / downloaded_film.name
+    os.link(downloaded_film, linked_film)
+
+    actual_return = watcher.wait_for_settled_films(max_wait=2)
+    watcher.close()
+
+    assert actual_return == [linked_film]
+
+
+def test_wait_for_settled_films_timeout(tmp_path):
+    fp = FilmProcessor(input_folders=[tmp_path], output_folder=tmp_path)
+    watcher = FilmWatcher(fp, "test_api_key", settle_seconds=0.1)
+    watcher.add_folder_watches(tmp_path)
+
+    assert watcher.wait_for_settled_films(max_wait=0.2) == []
+    watcher.close()
+
+
+def test_check_films(tmp_path, return_mock_search_for_film_on_ant_not_found):
+    existing_film_df = pd.DataFrame(
+        {
+            "Full file path": ["/films/Dogville.2003.1080p.BluRay.x265-TAoE.mkv"],
+            "Parsed film title": ["Dogville"],
+            "Film size (GB)": [11.06],
+            "Resolution": ["1080p"],
+            "Codec": ["H265"],
+            "Source": ["Blu-ray"],
+            "Release group": ["taoe"],
+            "Already on ANT?": ["Duplicate"],
+            "Info": ["A film with 1080p/H265/Blu-ray already exists: test_link"],
+        }
+    )
+    existing_film_df.to_csv(tmp_path / "Film list.csv", index=False)
+
+    new_film = tmp_path / "Aftersun.2022.1080p.WEB-DL.x264-TEST.mkv"
+    new_film.write_text("Test")
+
+    fp = FilmProcessor(input_folders=[tmp_path], output_folder=tmp_path)
+    watcher = FilmWatcher(fp, "test_api_key")
+    watcher.check_films([new_film])
+    watcher.close()
+
+    actual_df = pd.read_csv(tmp_path / "Film list.csv", keep_default_na=False)
+
+    assert list(actual_df["Parsed film title"]) == ["Aftersun", "Dogville"]
+    assert list(actual_df["Already on ANT?"]) == [
+        "Uploadable - potentially",
+        "Duplicate",
+    ]
+
+
+def test_check_films_uses_search_options(tmp_path):
+    new_film = tmp_path / "Aftersun.2022.1080p.WEB-DL.x264-TEST.mkv"
+    new_film.write_text("Test")
+
+    fp = FilmProcessor(input_folders=[tmp_path], output_folder=tmp_path)
+    search_cache = SearchCache(tmp_path / "search_cache.sqlite")
+
+    with MockAntServer(found_rate=0) as mock_server:
+        watcher = FilmWatcher(
+            fp,
+            "test_api_key",
+            search_cache=search_cache,
+            search_workers=2,
+            ant_url=mock_server.url,
+        )
+        watcher.check_films([new_film])
+        watcher.check_films([new_film])
+        watcher.close()
+
+    assert mock_server.request_count == 1
+    assert search_cache.get_search("Aftersun") == []
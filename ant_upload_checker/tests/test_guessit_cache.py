@@ -0,0 +1,77 @@
+import sqlite3
+from pathlib import PureWindowsPath
+from ant_upload_checker.guessit_cache import GuessitCache
+
+
+def test_store_and_get_cached_guesses(tmp_path):
+    guessit_cache = GuessitCache(tmp_path / "guessit_cache.sqlite")
+
+    test_paths = ["/films/A film (2001).mkv", "/films/B film (2002).mkv"]
+    test_guesses = [
+        {"title": "A film", "year": 2001, "type": "movie"},
+        {"title": "B film", "source": ["Blu-ray", "DVD"], "type": "movie"},
+    ]
+    guessit_cache.store_guesses(test_paths, test_guesses)
+
+    actual_return = guessit_cache.get_cached_guesses(
+        test_paths + ["/films/Not cached.mkv"]
+    )
+    expected_return = dict(zip(test_paths, test_guesses))
+
+    assert actual_return == expected_return
+
+
+def test_normalise_path(tmp_path):
+    guessit_cache = GuessitCache(tmp_path / "guessit_cache.sqlite")
+    test_path = PureWindowsPath(r"C:\Films\A film (2001).mkv")
+
+    assert guessit_cache.normalise_path(test_path) == "C:/Films/A film (2001).mkv"
+
+
+def test_least_recently_used_guesses_evicted(tmp_path):
+    guessit_cache = GuessitCache(tmp_path / "guessit_cache.sqlite", max_entries=2)
+
+    guessit_cache.store_guesses(["/films/Old.mkv"], [{"title": "Old"}])
+    guessit_cache.store_guesses(["/films/Used.mkv"], [{"title": "Used"}])
+    guessit_cache.get_cached_guesses(["/films/Old.mkv"])
+    guessit_cache.store_guesses(["/films/New.mkv"], [{"title": "New"}])
+
+    actual_return = guessit_cache.get_cached_guesses(
+        ["/films/Old.mkv", "/films/Used.mkv", "/films/New.mkv"]
+    )
+
+    assert set(actual_return) == {"/films/Old.mkv", "/films/New.mkv"}
+
+
+def test_cache_cleared_if_guessit_changed(tmp_path):
+    cache_file_path = tmp_path / "guessit_cache.sqlite"
+    guessit_cache = GuessitCache(cache_file_path)
+    guessit_cache.store_guesses(["/films/A film.mkv"], [{"title": "A film"}])
+    guessit_cache.close()
+
+    with sqlite3.connect(cache_file_path) as connection:
+        connection.execute(
+            "UPDATE cache_info SET value = 'guessit-0.0.1' WHERE key = 'guessit_version'"
+        )
+    connection.close()
+
+    assert GuessitCache(cache_file_path).get_cached_guesses(["/films/A film.mkv"]) == {}
+
+
+def test_cache_cleared_if_parser_revision_changed(tmp_path):
+    cache_file_path = tmp_path / "guessit_cache.sqlite"
+    guessit_cache = GuessitCache(cache_file_path, parser_revision="options-1")
+    guessit_cache.store_guesses(["/films/A film.mkv"], [{"title": "A film"}])
+    guessit_cache.close()
+
+    assert GuessitCache(
+        cache_file_path, parser_revision="options-1"
+    ).get_cached_guesses(["/films/A film.mkv"]) == {
+        "/films/A film.mkv": {"title": "A film"}
+    }
+    assert (
+        GuessitCache(cache_file_path, parser_revision="options-2").get_cached_guesses(
+            ["/films/A film.mkv"]
+        )
+        == {}
+    )
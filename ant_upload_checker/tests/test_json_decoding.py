@@ -0,0 +1,26 @@
+import pytest
+from ant_upload_checker import json_decoding
+from ant_upload_checker.json_decoding import decode_json
+
+
+test_content = '{"response": {"total": 1}, "item": [{"guid": "Amélie"}]}'.encode()
+expected_json = {"response": {"total": 1}, "item": [{"guid": "Amélie"}]}
+
+
+def test_decode_json():
+    assert decode_json(test_content) == expected_json
+
+
+def test_decode_json_without_orjson(monkeypatch):
+    monkeypatch.setattr(json_decoding, "orjson", None)
+
+    assert decode_json(test_content) == expected_json
+
+
+@pytest.mark.parametrize("without_orjson", [False, True])
+def test_decode_json_invalid(monkeypatch, without_orjson):
+    if without_orjson:
+        monkeypatch.setattr(json_decoding, "orjson", None)
+
+    with pytest.raises(ValueError):
+        decode_json(b"<html>Not JSON</html>")
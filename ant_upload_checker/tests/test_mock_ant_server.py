@@ -0,0 +1,68 @@
+import time
+import requests
+from ant_upload_checker.mock_ant_server import MockAntServer
+
+
+def search_mock_server(mock_server, query):
+    return requests.get(mock_server.url, params={"q": query, "t": "movie"})
+
+
+def test_mock_ant_server_serves_recorded_responses():
+    with MockAntServer({"Heat": [{"guid": "test_link"}]}, found_rate=0) as mock_server:
+        found_response = search_mock_server(mock_server, "heat")
+        not_found_response = search_mock_server(mock_server, "Aftersun")
+
+    assert found_response.json() == {
+        "response": {"total": 1},
+        "item": [{"guid": "test_link"}],
+    }
+    assert not_found_response.json() == {"response": {"total": 0}, "item": []}
+    assert mock_server.queries == ["heat", "Aftersun"]
+
+
+def test_mock_ant_server_made_up_responses_repeat():
+    with MockAntServer(found_rate=1) as mock_server:
+        first_response = search_mock_server(mock_server, "Heat").json()
+        second_response = search_mock_server(mock_server, "Heat").json()
+
+    assert first_response["response"]["total"] > 0
+    assert first_response == second_response
+
+
+def test_mock_ant_server_rate_limit_bursts():
+    with MockAntServer(
+        rate_limit_every=4, rate_limit_burst=2, retry_after_seconds=3
+    ) as mock_server:
+        responses = [search_mock_server(mock_server, "Heat") for _ in range(8)]
+
+    assert [response.status_code for response in responses] == [
+        200,
+        200,
+        429,
+        429,
+        200,
+        200,
+        429,
+        429,
+    ]
+    assert responses[2].headers["Retry-After"] == "3"
+
+
+def test_mock_ant_server_errors_and_slow_bodies():
+    with MockAntServer(server_error_rate=1) as mock_server:
+        assert search_mock_server(mock_server, "Heat").status_code == 500
+
+    with MockAntServer(found_rate=1, slow_body_seconds=0.1) as mock_server:
+        start = time.perf_counter()
+        response = search_mock_server(mock_server, "Heat")
+
+    assert time.perf_counter() - start >= 0.09
+    assert response.json()["response"]["total"] > 0
+
+
+def test_mock_ant_server_gzips_responses():
+    with MockAntServer(found_rate=1, gzip_responses=True) as mock_server:
+        response = search_mock_server(mock_server, "Heat")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.json()["response"]["total"] > 0
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+from ant_upload_checker import output
+from ant_upload_checker.film_processor import FilmProcessor
+
+
+@pytest.fixture
+def test_film_list():
+    test_df = pd.DataFrame(
+        {
+            "Full file path": ["C:/Heat (1995).mkv", "C:/Aftersun (2022).mkv"],
+            "Parsed film title": ["Heat", "Aftersun"],
+            "Film size (GB)": [1.5, 2.5],
+            "Resolution": ["1080p", ""],
+            "Codec": ["H264", ""],
+            "Source": ["Blu-ray", ""],
+            "Release group": ["group", ""],
+            "Already on ANT?": ["Duplicate", "Uploadable"],
+            "Info": ["test_link", ""],
+        }
+    )
+
+    return test_df
+
+
+def test_write_film_list_to_csv_skips_state_file_without_pyarrow(
+    test_film_list, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(output, "PYARROW_INSTALLED", False)
+
+    output.write_film_list_to_csv(test_film_list, tmp_path)
+
+    assert (tmp_path / "Film list.csv").is_file()
+    assert not (tmp_path / output.CACHE_FOLDER_NAME).exists()
+
+
+@pytest.mark.parametrize("compact_dtypes", [False, True])
+def test_write_film_list_to_csv_saves_state_file(
+    test_film_list, tmp_path, compact_dtypes
+):
+    pytest.importorskip("pyarrow")
+
+    fp = FilmProcessor(
+        input_folders="", output_folder=tmp_path, compact_dtypes=compact_dtypes
+    )
+    film_list = test_film_list.astype(fp.film_list_df_types)
+
+    output.write_film_list_to_csv(film_list, tmp_path)
+
+    assert fp.state_file_path.is_file()
+    pd.testing.assert_frame_equal(fp.read_existing_film_list(), film_list)
+
+
+def test_write_film_list_to_csv_keeps_existing_file_if_write_fails(
+    test_film_list, tmp_path, monkeypatch
+):
+    output.write_film_list_to_csv(test_film_list, tmp_path)
+    existing_csv = (tmp_path / "Film list.csv").read_bytes()
+
+    def mock_to_csv(self, path_or_buf, **kwargs):
+        path_or_buf.write("Full file path,Parsed")
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(pd.DataFrame, "to_csv", mock_to_csv)
+    with pytest.raises(KeyboardInterrupt):
+        output.write_film_list_to_csv(test_film_list.iloc[:1], tmp_path)
+
+    assert (tmp_path / "Film list.csv").read_bytes() == existing_csv
+    assert list(tmp_path.glob("*.tmp")) == []
@@ -0,0 +1,100 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import pytest
+from ant_upload_checker.rate_limiter import RateLimiter, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
+
+
+def test_rate_limiter_waits_between_searches(fake_clock):
+    rate_limiter = RateLimiter(0.5, clock=fake_clock, sleep=fake_clock.sleep)
+
+    acquired_at = []
+    for _ in range(3):
+        rate_limiter.acquire()
+        acquired_at.append(fake_clock.now)
+
+    assert acquired_at == [0, 2, 4]
+    assert rate_limiter.waited_seconds == 4
+
+
+def test_rate_limiter_allows_bursts(fake_clock):
+    rate_limiter = RateLimiter(0.5, burst=3, clock=fake_clock, sleep=fake_clock.sleep)
+
+    acquired_at = []
+    for _ in range(4):
+        rate_limiter.acquire()
+        acquired_at.append(fake_clock.now)
+
+    assert acquired_at == [0, 0, 0, 2]
+
+
+def test_rate_limiter_backs_off_and_recovers(fake_clock):
+    rate_limiter = RateLimiter(0.5, clock=fake_clock, sleep=fake_clock.sleep)
+    rate_limiter.acquire()
+
+    rate_limiter.back_off(retry_after_seconds=10)
+    assert rate_limiter.current_rate_per_second == 0.25
+
+    rate_limiter.acquire()
+    assert fake_clock.now == 10
+
+    rate_limiter.acquire()
+    assert fake_clock.now == 14
+
+    for _ in range(5):
+        rate_limiter.recover()
+    assert rate_limiter.current_rate_per_second == 0.5
+
+
+def test_rate_limiter_is_thread_safe():
+    rate_limiter = RateLimiter(1000)
+    acquired_count = []
+
+    def acquire_searches():
+        for _ in range(20):
+            rate_limiter.acquire()
+            acquired_count.append(1)
+
+    threads = [threading.Thread(target=acquire_searches) for _ in range(5)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(acquired_count) == 100
+    assert time.monotonic() - start >= 0.099
+    assert rate_limiter.waited_seconds > 0
+
+
+@pytest.mark.parametrize(
+    "test_value, expected_value",
+    [(None, None), ("", None), ("5", 5), ("-1", 0), ("not a date", None)],
+)
+def test_parse_retry_after(test_value, expected_value):
+    assert parse_retry_after(test_value) == expected_value
+
+
+def test_parse_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+    actual_value = parse_retry_after(format_datetime(retry_at, usegmt=True))
+
+    assert 25 < actual_value <= 30
@@ -0,0 +1,88 @@
+import json
+from ant_upload_checker.run_journal import RunJournal, read_journaled_searches
+from ant_upload_checker.torrent import Torrent
+
+
+def test_run_journal_replays_searches_when_resuming(tmp_path):
+    journal_file_path = tmp_path / ".ant_upload_checker" / "run_journal.jsonl"
+
+    run_journal = RunJournal(journal_file_path)
+    run_journal.record_search("Heat", [Torrent("test_link")])
+    run_journal.record_search("Aftersun", [])
+    run_journal.close()
+
+    resumed_journal = RunJournal(journal_file_path, resume=True)
+
+    assert resumed_journal.get_search("Heat") == [Torrent("test_link")]
+    assert resumed_journal.get_search("Aftersun") == []
+    assert resumed_journal.get_search("Dogville") is None
+    assert resumed_journal.get_search("  HEAT ") == [Torrent("test_link")]
+
+    resumed_journal.record_search("Dogville", [])
+    resumed_journal.close()
+
+    journal_lines = journal_file_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["type"] for line in journal_lines] == [
+        "search",
+        "search",
+        "search",
+    ]
+
+
+def test_run_journal_discards_partly_written_entry(tmp_path):
+    journal_file_path = tmp_path / "run_journal.jsonl"
+    journal_file_path.write_text(
+        '{"type": "search", "title": "Heat", "response": []}\n'
+        '{"type": "search", "title": "Afters',
+        encoding="utf-8",
+    )
+
+    resumed_journal = RunJournal(journal_file_path, resume=True)
+    resumed_journal.record_search("Aftersun", [])
+    resumed_journal.close()
+
+    assert resumed_journal.searches == {"heat": [], "aftersun": []}
+    assert RunJournal(journal_file_path, resume=True).searches == {
+        "heat": [],
+        "aftersun": [],
+    }
+
+
+def test_run_journal_starts_again_without_resume(tmp_path, caplog):
+    journal_file_path = tmp_path / "run_journal.jsonl"
+    run_journal = RunJournal(journal_file_path)
+    run_journal.record_search("Heat", [])
+    run_journal.close()
+
+    new_journal = RunJournal(journal_file_path)
+    new_journal.close()
+
+    unfinished_journal_file_path = tmp_path / "run_journal_unfinished.jsonl"
+    assert new_journal.searches == {}
+    assert journal_file_path.read_text(encoding="utf-8") == ""
+    assert read_journaled_searches(unfinished_journal_file_path) == {"Heat": []}
+    assert f"was moved to {unfinished_journal_file_path}" in caplog.text
+
+
+def test_run_journal_finish_removes_journal(tmp_path):
+    journal_file_path = tmp_path / "run_journal.jsonl"
+    run_journal = RunJournal(journal_file_path)
+    run_journal.record_search("Heat", [])
+
+    run_journal.finish()
+
+    assert not journal_file_path.exists()
+
+
+def test_read_journaled_searches_leaves_journal_unchanged(tmp_path):
+    journal_file_path = tmp_path / "run_journal.jsonl"
+    journal_content = (
+        '{"type": "search", "title": "Heat", "response": []}\n'
+        '{"type": "verdict", "path": "C:/Heat.mkv", "verdict": "", "info": ""}\n'
+        '{"type": "search", "title": "Afters'
+    )
+    journal_file_path.write_text(journal_content, encoding="utf-8")
+
+    assert read_journaled_searches(journal_file_path) == {"Heat": []}
+    assert journal_file_path.read_text(encoding="utf-8") == journal_content
+    assert read_journaled_searches(tmp_path / "missing.jsonl") == {}
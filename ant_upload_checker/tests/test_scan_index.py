@@ -0,0 +1,116 @@
+import sqlite3
+from pathlib import Path
+import pandas as pd
+from ant_upload_checker.file_record import FileRecord
+from ant_upload_checker.scan_index import ScanIndex, IndexedFilm, ScannedFolder
+
+
+def create_parsed_film_df(paths: list[str], titles: list[str]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Full file path": paths,
+            "Parsed film title": titles,
+            "Resolution": ["1080p"] * len(paths),
+            "Codec": ["H264"] * len(paths),
+            "Source": ["Blu-ray"] * len(paths),
+            "Release group": ["group"] * len(paths),
+        }
+    ).astype("string")
+
+
+def test_split_unchanged_films(tmp_path):
+    scan_index = ScanIndex(tmp_path / "scan_index.sqlite")
+
+    film_records = [
+        FileRecord(Path("/films/A film.mkv"), 100, 1.5, 1),
+        FileRecord(Path("/films/Changed film.mkv"), 100, 1.5, 2),
+        FileRecord(Path("/films/Show S01E01.mkv"), 100, 1.5, 3),
+    ]
+    parsed_film_df = create_parsed_film_df(
+        ["/films/A film.mkv", "/films/Changed film.mkv"], ["A film", "Changed film"]
+    )
+    scan_index.update(film_records, parsed_film_df, film_records)
+
+    current_records = [
+        FileRecord(Path("/films/A film.mkv"), 100, 1.5, 1),
+        FileRecord(Path("/films/Changed film.mkv"), 200, 2.5, 2),
+        FileRecord(Path("/films/New film.mkv"), 100, 1.5, 4),
+        FileRecord(Path("/films/Show S01E01.mkv"), 100, 1.5, 3),
+    ]
+    unchanged_films, changed_records = scan_index.split_unchanged_films(
+        current_records
+    )
+
+    assert unchanged_films == [
+        (
+            current_records[0],
+            IndexedFilm(100, 1.5, True, "A film", "1080p", "H264", "Blu-ray", "group"),
+        )
+    ]
+    assert changed_records == current_records[1:3]
+
+
+def test_update_removes_deleted_files(tmp_path):
+    scan_index = ScanIndex(tmp_path / "scan_index.sqlite")
+
+    film_records = [
+        FileRecord(Path("/films/A film.mkv"), 100, 1.5, 1),
+        FileRecord(Path("/films/Deleted film.mkv"), 100, 1.5, 2),
+    ]
+    parsed_film_df = create_parsed_film_df(
+        ["/films/A film.mkv", "/films/Deleted film.mkv"], ["A film", "Deleted film"]
+    )
+    scan_index.update(film_records, parsed_film_df, film_records)
+    scan_index.update([], parsed_film_df.iloc[0:0], film_records[:1])
+
+    assert list(scan_index.load_indexed_films()) == ["/films/A film.mkv"]
+
+
+def test_index_cleared_if_parser_changed(tmp_path):
+    index_file_path = tmp_path / "scan_index.sqlite"
+    scan_index = ScanIndex(index_file_path)
+
+    film_records = [FileRecord(Path("/films/A film.mkv"), 100, 1.5, 1)]
+    parsed_film_df = create_parsed_film_df(["/films/A film.mkv"], ["A film"])
+    scan_index.update(film_records, parsed_film_df, film_records)
+    scan_index.close()
+
+    with sqlite3.connect(index_file_path) as connection:
+        connection.execute(
+            "UPDATE index_info SET value = 'old' WHERE key = 'parser_version'"
+        )
+    connection.close()
+
+    assert ScanIndex(index_file_path).load_indexed_films() == {}
+
+
+def test_index_cleared_if_parser_revision_changed(tmp_path):
+    index_file_path = tmp_path / "scan_index.sqlite"
+    scan_index = ScanIndex(index_file_path, "fast-parser-1")
+
+    film_records = [FileRecord(Path("/films/A film.mkv"), 100, 1.5, 1)]
+    parsed_film_df = create_parsed_film_df(["/films/A film.mkv"], ["A film"])
+    scan_index.update(film_records, parsed_film_df, film_records)
+    scan_index.close()
+
+    assert list(ScanIndex(index_file_path, "fast-parser-1").load_indexed_films()) == [
+        "/films/A film.mkv"
+    ]
+    assert ScanIndex(index_file_path, "fast-parser-2").load_indexed_films() == {}
+
+
+def test_save_and_load_scanned_folders(tmp_path):
+    scan_index = ScanIndex(tmp_path / "scan_index.sqlite")
+
+    scanned_folders = {
+        "/films": ScannedFolder(10.5, [], ["/films/A film (2001)"]),
+        "/films/A film (2001)": ScannedFolder(
+            11.5, [FileRecord(Path("/films/A film (2001)/A film.mkv"), 100, 1.5, 1)], []
+        ),
+    }
+    scan_index.save_scanned_folders(scanned_folders)
+    assert scan_index.load_scanned_folders() == scanned_folders
+
+    del scanned_folders["/films/A film (2001)"]
+    scan_index.save_scanned_folders(scanned_folders)
+    assert scan_index.load_scanned_folders() == scanned_folders
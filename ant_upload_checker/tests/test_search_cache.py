@@ -0,0 +1,69 @@
+import sqlite3
+import time
+from ant_upload_checker.search_cache import SearchCache, normalise_search_title
+from ant_upload_checker.torrent import Torrent
+
+
+def test_normalise_search_title():
+    assert normalise_search_title("  The  Matrix ") == "the matrix"
+
+
+def test_store_and_get_search(tmp_path):
+    search_cache = SearchCache(tmp_path / "search_cache.sqlite")
+
+    search_cache.store_search("Heat", [Torrent("test_link")])
+    search_cache.store_search("Aftersun", [])
+
+    assert search_cache.get_search("heat ") == [Torrent("test_link")]
+    assert search_cache.get_search("Aftersun") == []
+    assert search_cache.get_search("Dogville") is None
+
+
+def test_expired_searches_not_reused(tmp_path):
+    cache_file_path = tmp_path / "search_cache.sqlite"
+    search_cache = SearchCache(
+        cache_file_path, found_ttl_hours=24, not_found_ttl_hours=1
+    )
+    search_cache.store_search("Heat", [Torrent("test_link")])
+    search_cache.store_search("Aftersun", [])
+    search_cache.close()
+
+    two_hours_ago = time.time() - 2 * 60 * 60
+    with sqlite3.connect(cache_file_path) as connection:
+        connection.execute("UPDATE searches SET searched_at = ?", (two_hours_ago,))
+    connection.close()
+
+    search_cache = SearchCache(
+        cache_file_path, found_ttl_hours=24, not_found_ttl_hours=1
+    )
+
+    assert search_cache.get_search("Heat") == [Torrent("test_link")]
+    assert search_cache.get_search("Aftersun") is None
+
+
+def test_least_recently_used_searches_evicted(tmp_path):
+    search_cache = SearchCache(tmp_path / "search_cache.sqlite", max_entries=2)
+
+    search_cache.store_search("Old", [])
+    search_cache.store_search("Used", [])
+    search_cache.get_search("Old")
+    search_cache.store_search("New", [])
+
+    assert search_cache.get_search("Old") == []
+    assert search_cache.get_search("Used") is None
+    assert search_cache.get_search("New") == []
+
+
+def test_refresh_ignores_saved_searches(tmp_path):
+    cache_file_path = tmp_path / "search_cache.sqlite"
+    search_cache = SearchCache(cache_file_path)
+    search_cache.store_search("Heat", [])
+    search_cache.close()
+
+    search_cache = SearchCache(cache_file_path, refresh=True)
+    assert search_cache.get_search("Heat") is None
+
+    search_cache.store_search("Heat", [Torrent("test_link")])
+    search_cache.close()
+
+    assert SearchCache(cache_file_path).get_search("Heat") == [Torrent("test_link")]
@@ -0,0 +1,120 @@
+import pandas as pd
+import pytest
+from datetime import timedelta
+from ant_upload_checker.search_cache import SearchCache
+from ant_upload_checker.search_planner import SearchPlan, SearchPlanner
+from ant_upload_checker.torrent import Torrent
+
+
+@pytest.fixture
+def test_film_list_df():
+    return pd.DataFrame(
+        {
+            "Parsed film title": [
+                "Heat",
+                "Heat",
+                "Romeo and Juliet",
+                "4 Months 3 Weeks and 12 Days",
+                "Aftersun",
+                "Dogville",
+                "Nomadland",
+            ],
+            "Already on ANT?": [
+                "",
+                "Uploadable",
+                "",
+                "",
+                "Duplicate - partial",
+                "Banned",
+                "",
+            ],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "test_title, expected_count",
+    [
+        ("Heat", 1),
+        ("Romeo and Juliet", 2),
+        ("Romeo & Juliet", 2),
+        ("1208 East of Bucharest", 2),
+        ("4 Months 3 Weeks and 12 Days", 3),
+        ("Lady Vengeance aka Sympathy for Lady Vengeance", 3),
+    ],
+)
+def test_count_possible_searches(test_title, expected_count):
+    sp = SearchPlanner(pd.DataFrame())
+
+    assert sp.count_possible_searches(test_title) == expected_count
+
+
+def test_plan_searches(test_film_list_df):
+    sp = SearchPlanner(test_film_list_df, journaled_titles={"Nomadland"})
+
+    actual_plan = sp.plan_searches()
+    expected_plan = SearchPlan(
+        films_to_skip=2,
+        films_already_searched=1,
+        films_to_search=4,
+        minimum_searches=3,
+        maximum_searches=6,
+    )
+
+    assert actual_plan == expected_plan
+
+
+def test_plan_searches_matches_journaled_titles_like_film_searcher():
+    test_df = pd.DataFrame(
+        {
+            "Parsed film title": ["Heat", "heat", "Aftersun", "Dogville"],
+            "Already on ANT?": ["", "", "", ""],
+        }
+    )
+    sp = SearchPlanner(test_df, journaled_titles={"HEAT", "Aftersun "})
+
+    actual_plan = sp.plan_searches()
+
+    assert actual_plan.films_already_searched == 3
+    assert actual_plan.films_to_search == 1
+    assert actual_plan.minimum_searches == 1
+
+
+def test_plan_searches_with_cached_searches(test_film_list_df, tmp_path):
+    search_cache = SearchCache(tmp_path / "search_cache.sqlite")
+    search_cache.store_search("Heat", [Torrent("test_link")])
+    search_cache.store_search("Romeo and Juliet", [])
+    sp = SearchPlanner(test_film_list_df, search_cache=search_cache)
+
+    actual_plan = sp.plan_searches()
+
+    assert actual_plan.films_to_search == 5
+    assert actual_plan.minimum_searches == 2
+    assert actual_plan.maximum_searches == 5
+
+
+def test_estimate_search_time():
+    sp = SearchPlanner(pd.DataFrame())
+
+    assert sp.estimate_search_time(90) == timedelta(minutes=3)
+
+
+def test_stop_process_if_nothing_to_search():
+    test_df = pd.DataFrame(
+        {
+            "Parsed film title": ["Heat", "Aftersun"],
+            "Already on ANT?": ["Duplicate", "Banned"],
+        }
+    )
+    sp = SearchPlanner(test_df)
+
+    assert sp.check_if_nothing_to_search(sp.plan_searches()) is True
+    with pytest.raises(SystemExit):
+        sp.stop_process_if_nothing_to_search(sp.plan_searches())
+
+
+def test_stop_process_continues_with_films_to_search(test_film_list_df):
+    sp = SearchPlanner(test_film_list_df)
+
+    assert sp.check_if_nothing_to_search(sp.plan_searches()) is False
+    sp.stop_process_if_nothing_to_search(sp.plan_searches())
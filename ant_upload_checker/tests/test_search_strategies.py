@@ -0,0 +1,129 @@
+import pytest
+from ant_upload_checker.search_strategies import (
+    CandidateQuery,
+    SearchStrategyStats,
+    get_candidate_queries,
+)
+
+
+def get_fallback_queries(film_title, strategy):
+    return [
+        candidate_query.query
+        for candidate_query in get_candidate_queries(film_title)
+        if candidate_query.strategy == strategy
+    ]
+
+
+@pytest.mark.parametrize(
+    "test_film, expected_query",
+    [
+        ("A film with and in the title", "A film with & in the title"),
+        ("Romeo & Juliet", "Romeo and Juliet"),
+    ],
+)
+def test_get_candidate_queries_and(test_film, expected_query):
+    assert get_fallback_queries(test_film, "and") == [expected_query]
+
+
+films_four_numbers = {
+    "1208 East of Bucharest": "12:08 East of Bucharest",
+    "Test film 1508": "Test film 15:08",
+    "Film 1000 test": "Film 10:00 test",
+}
+
+
+@pytest.mark.parametrize("test_film", films_four_numbers)
+def test_get_candidate_queries_time(test_film):
+    assert get_fallback_queries(test_film, "time") == [films_four_numbers[test_film]]
+
+
+films_five_numbers = ["12345 test film", "Test film 12345", "Film 12345 test"]
+
+
+@pytest.mark.parametrize("test_film", films_five_numbers)
+def test_get_candidate_queries_no_time_or_date(test_film):
+    assert get_candidate_queries(test_film) == [CandidateQuery("title", test_film)]
+
+
+films_with_dates_numbers = {
+    "77 One Day in London": "7/7 One Day in London",
+    "Test film 11": "Test film 1/1",
+    "Film 89 test": "Film 8/9 test",
+    "911 film": "9/11 film",
+    "Fahrenheit 911": "Fahrenheit 9/11",
+    "Film 112 test": "Film 1/12 test",
+}
+
+
+@pytest.mark.parametrize("test_film", films_with_dates_numbers)
+def test_get_candidate_queries_date(test_film):
+    assert get_fallback_queries(test_film, "date") == [
+        films_with_dates_numbers[test_film]
+    ]
+
+
+films_with_alternate_titles = {
+    "Alphaville une etrange aventure de Lemmy Caution AKA Alphaville": [
+        "Alphaville une etrange aventure de Lemmy Caution",
+        "Alphaville",
+    ],
+    "Title 1 aka Title 2": ["Title 1", "Title 2"],
+}
+
+
+@pytest.mark.parametrize("test_film", films_with_alternate_titles)
+def test_get_candidate_queries_aka(test_film):
+    assert get_fallback_queries(test_film, "aka") == films_with_alternate_titles[
+        test_film
+    ]
+
+
+@pytest.mark.parametrize(
+    "test_film", ["Aka Test film", "Test film aka", "Film with baka in it"]
+)
+def test_get_candidate_queries_no_aka(test_film):
+    assert get_fallback_queries(test_film, "aka") == []
+
+
+def test_get_candidate_queries_drops_duplicate_queries():
+    actual_queries = get_candidate_queries("Heat aka heat  aka Heat Redux")
+
+    assert actual_queries == [
+        CandidateQuery("title", "Heat aka heat  aka Heat Redux"),
+        CandidateQuery("aka", "Heat"),
+        CandidateQuery("aka", "Heat Redux"),
+    ]
+
+
+def test_order_candidate_queries_by_hit_rate():
+    strategy_stats = SearchStrategyStats()
+    for _ in range(4):
+        strategy_stats.record_query("and", is_found=False)
+        strategy_stats.record_query("aka", is_found=True)
+        strategy_stats.record_query("title", is_found=False)
+
+    candidate_queries = get_candidate_queries("Romeo and Juliet aka 1208")
+    actual_order = [
+        candidate_query.strategy
+        for candidate_query in strategy_stats.order_candidate_queries(
+            candidate_queries
+        )
+    ]
+
+    assert actual_order == ["title", "aka", "aka", "time", "and"]
+
+
+def test_strategy_stats_saved_between_runs(tmp_path):
+    stats_file_path = tmp_path / "search_strategy_stats.json"
+    strategy_stats = SearchStrategyStats(stats_file_path)
+    strategy_stats.record_query("title", is_found=True)
+    strategy_stats.record_query("and", is_found=False)
+    strategy_stats.save()
+
+    next_run_stats = SearchStrategyStats(stats_file_path)
+    next_run_stats.record_query("and", is_found=True)
+
+    assert next_run_stats.queries == {"title": 1, "and": 2}
+    assert next_run_stats.hits == {"title": 1, "and": 1}
+    assert next_run_stats.run_queries == {"and": 1}
+    assert next_run_stats.run_hits == {"and": 1}
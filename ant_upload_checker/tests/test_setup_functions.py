@@ -76,3 +76,17 @@ def test_get_user_info_api_key_empty(monkeypatch):
         monkeypatch.setattr(inquirer, "prompt", mock_prompt)
 
         setup_functions.get_user_info_api_key()
+
+
+def test_parse_arguments_defaults():
+    actual_return = setup_functions.parse_arguments([])
+
+    assert actual_return.scan_workers == 1
+    assert actual_return.compact_dtypes is False
+    assert actual_return.dry_run is False
+
+
+@pytest.mark.parametrize("test_value", ["0", "-2", "four"])
+def test_parse_arguments_invalid_scan_workers(test_value):
+    with pytest.raises(SystemExit):
+        setup_functions.parse_arguments(["--scan-workers", test_value])
@@ -0,0 +1,46 @@
+from ant_upload_checker.torrent import (
+    Torrent,
+    parse_api_response,
+    serialise_torrents,
+)
+
+
+test_api_item = {
+    "guid": "test_link",
+    "resolution": "1080p",
+    "codec": "H264",
+    "media": "Blu-ray",
+    "size": "1000",
+    "tags": ["drama"],
+    "files": [
+        {"size": "100", "name": "test_film_name.mkv"},
+        {"size": "1", "name": "test_film_name.nfo"},
+    ],
+}
+
+
+def test_torrent_from_api_item():
+    actual_torrent = Torrent.from_api_item(test_api_item)
+    expected_torrent = Torrent(
+        "test_link",
+        "1080p",
+        "H264",
+        "Blu-ray",
+        frozenset(["test_film_name.mkv", "test_film_name.nfo"]),
+    )
+
+    assert actual_torrent == expected_torrent
+    assert not hasattr(actual_torrent, "__dict__")
+
+
+def test_torrent_from_api_item_missing_fields():
+    actual_torrent = Torrent.from_api_item({"resolution": None})
+
+    assert actual_torrent == Torrent(None)
+
+
+def test_serialised_torrents_parse_to_the_same_torrents():
+    torrents = parse_api_response([test_api_item, {"codec": "x264"}])
+
+    assert parse_api_response(serialise_torrents(torrents)) == torrents
+    assert "guid" not in serialise_torrents(torrents)[1]
@@ -0,0 +1,72 @@
+from typing import Any, Optional
+
+
+class Torrent:
+    """
+    The parts of a torrent from an ANT search response needed to dupe check a film.
+    Responses also hold lots of other metadata and details of every file,
+    so keeping only these fields uses far less memory on large runs.
+    """
+
+    __slots__ = ("guid", "resolution", "codec", "media", "file_names")
+
+    def __init__(
+        self,
+        guid: Optional[str],
+        resolution: str = "",
+        codec: str = "",
+        media: str = "",
+        file_names: frozenset[str] = frozenset(),
+    ):
+        self.guid: Optional[str] = guid
+        self.resolution: str = resolution
+        self.codec: str = codec
+        self.media: str = media
+        self.file_names: frozenset[str] = file_names
+
+    @classmethod
+    def from_api_item(cls, api_item: dict[str, Any]) -> "Torrent":
+        return cls(
+            api_item.get("guid"),
+            api_item.get("resolution") or "",
+            api_item.get("codec") or "",
+            api_item.get("media") or "",
+            frozenset(
+                file_info.get("name", "") for file_info in api_item.get("files") or []
+            ),
+        )
+
+    def to_api_item(self) -> dict[str, Any]:
+        """
+        Convert back to the layout of an ANT search response,
+        for saving in the search cache and run journal.
+        """
+        api_item = {
+            "resolution": self.resolution,
+            "codec": self.codec,
+            "media": self.media,
+            "files": [{"name": file_name} for file_name in sorted(self.file_names)],
+        }
+        if self.guid is not None:
+            api_item["guid"] = self.guid
+
+        return api_item
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Torrent):
+            return NotImplemented
+
+        return all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        return f"Torrent({self.guid!r}, {self.resolution!r}, {self.codec!r}, {self.media!r})"
+
+
+def parse_api_response(api_items: list[dict[str, Any]]) -> list[Torrent]:
+    return [Torrent.from_api_item(api_item) for api_item in api_items]
+
+
+def serialise_torrents(torrents: list[Torrent]) -> list[dict[str, Any]]:
+    return [torrent.to_api_item() for torrent in torrents]
@@ -0,0 +1,84 @@
+"""
+Compare the memory used by a film list held with the standard column types
+and with the compact column types enabled by --compact-dtypes.
+
+Usage: python benchmarks/benchmark_film_list_memory.py [--rows N]
+"""
+
+import argparse
+import random
+import pandas as pd
+from ant_upload_checker.film_list_types import (
+    COMPACT_STRING_TYPE,
+    get_film_list_df_types,
+)
+
+
+RESOLUTIONS = ["", "480p", "576p", "720p", "1080p", "2160p"]
+CODECS = ["", "H264", "H265", "XviD", "MPEG-2", "VC-1"]
+SOURCES = ["", "Blu-ray", "Web", "DVD", "HDTV", "Blu-ray, DVD"]
+RELEASE_GROUPS = ["", "fgt", "ntb", "flux", "ctrlhd", "w4nk3r", "playweb", "group"]
+VERDICTS = [
+    "",
+    "Uploadable",
+    "Uploadable - potentially",
+    "Duplicate",
+    "Duplicate - partial",
+    "Duplicate - potentially",
+    "Banned",
+]
+
+
+def create_film_list(row_count: int) -> pd.DataFrame:
+    randomiser = random.Random(0)
+    titles = [f"Film title {number}" for number in range(row_count)]
+
+    return pd.DataFrame(
+        {
+            "Full file path": [f"/mnt/films/{title}/{title}.mkv" for title in titles],
+            "Parsed film title": titles,
+            "Film size (GB)": [
+                round(randomiser.uniform(0.5, 80), 2) for _ in range(row_count)
+            ],
+            "Resolution": randomiser.choices(RESOLUTIONS, k=row_count),
+            "Codec": randomiser.choices(CODECS, k=row_count),
+            "Source": randomiser.choices(SOURCES, k=row_count),
+            "Release group": randomiser.choices(RELEASE_GROUPS, k=row_count),
+            "Already on ANT?": randomiser.choices(VERDICTS, k=row_count),
+            "Info": [
+                f"A film with 1080p/H264/Blu-ray already exists: torrentid={number}"
+                for number in range(row_count)
+            ],
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500000)
+    arguments = parser.parse_args()
+
+    film_list = create_film_list(arguments.rows)
+    standard_df = film_list.astype(get_film_list_df_types())
+    compact_df = film_list.astype(get_film_list_df_types(compact_dtypes=True))
+
+    standard_memory = standard_df.memory_usage(deep=True)
+    compact_memory = compact_df.memory_usage(deep=True)
+
+    print(f"{arguments.rows} rows, text columns stored as {COMPACT_STRING_TYPE}\n")
+    print(f"{'Column':<20}{'Standard (MB)':>15}{'Compact (MB)':>15}")
+    for column in film_list.columns:
+        print(
+            f"{column:<20}{standard_memory[column] / 1e6:>15.1f}"
+            f"{compact_memory[column] / 1e6:>15.1f}"
+        )
+    print(
+        f"{'Total':<20}{standard_memory.sum() / 1e6:>15.1f}"
+        f"{compact_memory.sum() / 1e6:>15.1f}"
+    )
+    memory_saved = 1 - compact_memory.sum() / standard_memory.sum()
+    print(f"\nCompact types use {memory_saved:.0%} less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmark guessit with and without the parsing profile used by FilmProcessor,
+which excludes the guessit properties that are never read.
+
+Checks every film property FilmProcessor reads is unchanged by the profile,
+then reports the time taken per file with and without it.
+
+Usage: python benchmarks/benchmark_guessit_profile.py [--files N] [--repeats N]
+"""
+
+import argparse
+import random
+import time
+from guessit import guessit
+from ant_upload_checker.film_processor import GUESSIT_OPTIONS, GUESSIT_PROPERTIES
+
+
+TITLES = [
+    "Heat",
+    "The Matrix",
+    "Spider-Man",
+    "Ocean's Eleven",
+    "Fast and Furious",
+    "L.A. Confidential",
+    "Dune Part Two",
+    "Blade Runner 2049",
+    "2001 A Space Odyssey",
+    "Da 5 Bloods",
+    "Tick Tick Boom",
+    "Amelie",
+    "Short Term 12",
+    "Nick Fury Agent of S.H.I.E.L.D.",
+    "Trailer Park Boys",
+    "Special",
+    "Uncut Gems",
+    "Soft Skin",
+    "Life of Pi",
+    "The Italian Job",
+]
+TAGS = [
+    "",
+    "REMUX",
+    "EXTENDED",
+    "Directors.Cut",
+    "IMAX",
+    "REMASTERED",
+    "FRENCH",
+    "MULTi",
+    "PROPER",
+    "LIMITED",
+]
+RESOLUTIONS = ["480p", "576p", "720p", "1080p", "2160p"]
+SOURCES = ["BluRay", "UHD.BluRay", "WEB-DL", "AMZN.WEB-DL", "WEBRip", "WEB", "HDTV", "DVDRip"]
+CODECS = ["x264", "x265", "H.264", "HEVC", "AVC", "XviD"]
+AUDIO = ["", "DTS", "DTS-HD.MA.5.1", "DDP5.1", "AAC2.0", "AC3", "TrueHD.Atmos.7.1"]
+RELEASE_GROUPS = ["GROUP", "FGT", "NTb", "FLUX", "W4NK3R", "CtrlHD", "playWEB"]
+FOLDERS = ["C:/Films", "/mnt/disk2/Films", "/volume1/Movies/4K", "/Films/Season 1"]
+
+
+def create_film_paths(file_count: int) -> list[str]:
+    """
+    Create a reproducible mix of scene release names, loosely named files,
+    and films inside their own folder.
+    """
+    randomiser = random.Random(0)
+    film_paths = []
+
+    for _ in range(file_count):
+        title = randomiser.choice(TITLES)
+        year = randomiser.randint(1930, 2024)
+        folder = randomiser.choice(FOLDERS)
+        name_style = randomiser.random()
+
+        if name_style < 0.2:
+            file_name = f"{title} ({year}) {randomiser.choice(RESOLUTIONS)}"
+        else:
+            release_name_parts = [
+                title.replace(" ", "."),
+                str(year),
+                randomiser.choice(TAGS),
+                randomiser.choice(RESOLUTIONS),
+                randomiser.choice(SOURCES),
+                randomiser.choice(AUDIO),
+                randomiser.choice(CODECS),
+            ]
+            file_name = ".".join(part for part in release_name_parts if part)
+            file_name += f"-{randomiser.choice(RELEASE_GROUPS)}"
+
+        if name_style > 0.7:
+            folder = f"{folder}/{title} ({year})"
+
+        film_paths.append(f"{folder}/{file_name}.{randomiser.choice(['mkv', 'mp4'])}")
+
+    return film_paths
+
+
+def guess_required_properties(film_path: str, options: dict) -> dict:
+    guessed_media = guessit(film_path, options)
+
+    return {
+        film_property: guessed_media[film_property]
+        for film_property in GUESSIT_PROPERTIES
+        if film_property in guessed_media
+    }
+
+
+def time_guessit(film_paths: list[str], options: dict) -> float:
+    start = time.perf_counter()
+    for film_path in film_paths:
+        guessit(film_path, options)
+
+    return (time.perf_counter() - start) / len(film_paths)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=5)
+    arguments = parser.parse_args()
+
+    film_paths = create_film_paths(arguments.files)
+    # Guessit builds its rules on first use
+    guessit(film_paths[0])
+
+    changed_paths = [
+        film_path
+        for film_path in film_paths
+        if guess_required_properties(film_path, {})
+        != guess_required_properties(film_path, GUESSIT_OPTIONS)
+    ]
+    print(f"{len(changed_paths)} of {len(film_paths)} files parsed differently")
+    for film_path in changed_paths:
+        print(f"  {film_path}")
+
+    # Alternate between the two, keeping the fastest run of each to reduce noise
+    default_times = []
+    profile_times = []
+    for _ in range(arguments.repeats):
+        default_times.append(time_guessit(film_paths, {}))
+        profile_times.append(time_guessit(film_paths, GUESSIT_OPTIONS))
+
+    default_time = min(default_times)
+    profile_time = min(profile_times)
+    print(f"Default:      {default_time * 1000:.2f} ms per file")
+    print(f"With profile: {profile_time * 1000:.2f} ms per file")
+    print(
+        f"Saved:        {(default_time - profile_time) * 1000:.2f} ms per file "
+        f"({(1 - profile_time / default_time):.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
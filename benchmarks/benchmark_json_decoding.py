@@ -0,0 +1,132 @@
+"""
+Benchmark decoding large ANT search responses into torrents, comparing the
+standard library json module against orjson, if installed.
+
+Uses recorded responses from a JSON file mapping each search query to the
+torrents ANT returned, the same layout as the mock ANT server, or otherwise
+made up responses for popular films with many torrents and files.
+Also reports how much smaller the responses are when sent gzipped.
+
+Usage: python benchmarks/benchmark_json_decoding.py [--responses FILE]
+       [--torrents N] [--files N] [--repeats N]
+"""
+
+import argparse
+import gzip
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable
+from ant_upload_checker.json_decoding import ORJSON_INSTALLED
+from ant_upload_checker.torrent import parse_api_response
+
+if ORJSON_INSTALLED:
+    import orjson
+
+
+def create_api_item(torrent_id: int, file_count: int) -> dict[str, Any]:
+    """
+    A torrent as returned by the ANT search API, with the many fields
+    the dupe check does not use.
+    """
+    return {
+        "guid": f"https://anthelion.me/torrents.php?torrentid={torrent_id}",
+        "title": "A popular film",
+        "year": "1999",
+        "resolution": "1080p",
+        "codec": "H264",
+        "media": "Blu-ray",
+        "container": "MKV",
+        "audioFormat": "DTS-HD MA",
+        "audioChannels": "5.1",
+        "releaseGroup": "GRP",
+        "size": "12345678901",
+        "seeders": "12",
+        "leechers": "0",
+        "snatched": "340",
+        "time": "2020-01-01 00:00:00",
+        "tags": ["drama", "thriller", "crime"],
+        "subtitles": ["English", "French", "German", "Spanish"],
+        "flags": {"freeleech": False, "scene": False, "remaster": True},
+        "files": [
+            {
+                "size": "1000000",
+                "name": f"A.Popular.Film.1999.{torrent_id}.{number}.mkv",
+            }
+            for number in range(file_count)
+        ],
+    }
+
+
+def create_response_bodies(
+    responses_file_path: Path, torrent_count: int, file_count: int
+) -> list[bytes]:
+    if responses_file_path:
+        recorded_responses = responses_file_path.read_text(encoding="utf-8")
+        api_item_lists = list(json.loads(recorded_responses).values())
+    else:
+        api_item_lists = [
+            [
+                create_api_item(
+                    response_number * torrent_count + torrent_id, file_count
+                )
+                for torrent_id in range(torrent_count)
+            ]
+            for response_number in range(20)
+        ]
+
+    return [
+        json.dumps({"response": {"total": len(api_items)}, "item": api_items}).encode()
+        for api_items in api_item_lists
+    ]
+
+
+def time_decoding(
+    decode: Callable[[bytes], Any], bodies: list[bytes], repeats: int
+) -> tuple[float, list]:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        torrents = [parse_api_response(decode(body)["item"]) for body in bodies]
+        times.append(time.perf_counter() - start)
+
+    return min(times), torrents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--responses", type=Path)
+    parser.add_argument("--torrents", type=int, default=40)
+    parser.add_argument("--files", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=20)
+    arguments = parser.parse_args()
+
+    bodies = create_response_bodies(
+        arguments.responses, arguments.torrents, arguments.files
+    )
+    body_size = sum(len(body) for body in bodies)
+    gzipped_size = sum(len(gzip.compress(body)) for body in bodies)
+    print(
+        f"{len(bodies)} responses, {body_size / len(bodies) / 1000:.0f} kB each, "
+        f"{gzipped_size / len(bodies) / 1000:.1f} kB gzipped"
+    )
+
+    json_time, expected_torrents = time_decoding(json.loads, bodies, arguments.repeats)
+    print(f"json:   {json_time / len(bodies) * 1000:.3f} ms per response")
+
+    if not ORJSON_INSTALLED:
+        print("orjson is not installed, skipping")
+        return
+
+    orjson_time, actual_torrents = time_decoding(
+        orjson.loads, bodies, arguments.repeats
+    )
+    if actual_torrents != expected_torrents:
+        raise AssertionError("orjson gave different torrents")
+
+    print(f"orjson: {orjson_time / len(bodies) * 1000:.3f} ms per response")
+    print(f"Speed up: {json_time / orjson_time:.1f}x, torrents identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark the ANT search stage against the local mock ANT server,
+searching one at a time and with several searches in flight.
+
+Reports the total wall time, requests per second and request latency
+percentiles for each number of search workers, along with how many
+requests were rate limited or failed.
+
+Usage: python benchmarks/benchmark_search.py [--titles N] [--workers 1 4]
+       [--rate SEARCHES_PER_SECOND] [--latency SECONDS] [--rate-limit-every N]
+       [--server-error-rate RATE] [--gzip]
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import time
+import pandas as pd
+from ant_upload_checker.film_searcher import FilmSearcher
+from ant_upload_checker.mock_ant_server import MockAntServer
+from ant_upload_checker.rate_limiter import RateLimiter
+
+
+TITLE_WORDS = [
+    "the",
+    "Night",
+    "Return",
+    "and",
+    "of",
+    "Matrix",
+    "Ocean",
+    "Day",
+    "Confidential",
+    "Agent",
+    "Intelligence",
+    "Heat",
+    "River",
+    "aka",
+]
+
+
+def create_titles(title_count: int) -> list[str]:
+    randomiser = random.Random(0)
+
+    return [
+        " ".join(randomiser.choices(TITLE_WORDS, k=randomiser.randint(1, 4)))
+        + f" {title_number:x}"
+        for title_number in range(title_count)
+    ]
+
+
+def time_search_stage(
+    titles: list[str], mock_server: MockAntServer, rate: float, search_workers: int
+) -> tuple[float, list[float], int]:
+    film_list_df = pd.DataFrame(
+        {"Parsed film title": titles, "Already on ANT?": [""] * len(titles)}
+    )
+    fs = FilmSearcher(
+        film_list_df,
+        "benchmark_api_key",
+        rate_limiter=RateLimiter(rate),
+        search_workers=search_workers,
+        ant_url=mock_server.url,
+    )
+
+    request_latencies = []
+    send_request = fs.session.get
+
+    def timed_get(*arguments, **keyword_arguments):
+        start = time.perf_counter()
+        response = send_request(*arguments, **keyword_arguments)
+        request_latencies.append(time.perf_counter() - start)
+        return response
+
+    fs.session.get = timed_get
+
+    start = time.perf_counter()
+    fs.check_if_films_exist_on_ant()
+    wall_time = time.perf_counter() - start
+
+    return wall_time, request_latencies, len(request_latencies)
+
+
+def get_percentile(values: list[float], percentile: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[percentile - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--titles", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=20,
+        help="Searches per second allowed by the rate limiter, kept high so "
+        "the benchmark runs quickly (the real limit is 0.5)",
+    )
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--slow-body", type=float, default=0)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--server-error-rate", type=float, default=0)
+    parser.add_argument("--gzip", action="store_true")
+    arguments = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    titles = create_titles(arguments.titles)
+
+    print(
+        f"{len(titles)} titles, rate limit {arguments.rate}/s, "
+        f"{arguments.latency * 1000:.0f} ms latency"
+    )
+    for search_workers in arguments.workers:
+        with MockAntServer(
+            latency_seconds=arguments.latency,
+            slow_body_seconds=arguments.slow_body,
+            rate_limit_every=arguments.rate_limit_every,
+            retry_after_seconds=0.5,
+            server_error_rate=arguments.server_error_rate,
+            gzip_responses=arguments.gzip,
+        ) as mock_server:
+            wall_time, request_latencies, request_count = time_search_stage(
+                titles, mock_server, arguments.rate, search_workers
+            )
+
+        print(
+            f"{search_workers} worker(s): {wall_time:.2f} s, "
+            f"{request_count / wall_time:.1f} requests/s, "
+            f"latency p50 {get_percentile(request_latencies, 50) * 1000:.0f} ms "
+            f"p95 {get_percentile(request_latencies, 95) * 1000:.0f} ms "
+            f"p99 {get_percentile(request_latencies, 99) * 1000:.0f} ms, "
+            f"responses {dict(sorted(mock_server.status_counts.items()))}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark fixing acronyms in film titles, comparing fixing each title in turn
+with the original uncompiled patterns against the batch title fix.
+
+Checks both give exactly the same titles, then reports the time taken for each.
+
+Usage: python benchmarks/benchmark_title_normalisation.py [--titles N] [--repeats N]
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+from ant_upload_checker.film_processor import FilmProcessor
+
+
+TITLE_WORDS = [
+    "the",
+    "Matrix",
+    "Confidential",
+    "Extra-Terrestrial",
+    "Jane",
+    "Artificial",
+    "Intelligence",
+    "Bloods",
+    "of",
+    "BOOM!",
+    "Agent",
+    "S.H.I.E.L.D.",
+    "Part",
+    "2",
+    "12",
+    "X:",
+    "Ocean's",
+    "Day",
+    "Night",
+    "Return",
+]
+
+
+def fix_title_if_contains_acronym(film_title: str) -> str:
+    """
+    The acronym fix as it was before titles were fixed in batches.
+    """
+    acronym_spaces_as_full_stops = re.sub(
+        r"(?<=\b[A-Za-z]{1})\s(?=[A-Za-z]{1}\b)", ".", film_title
+    )
+
+    acronym_suffixed_with_a_full_stop = re.sub(
+        r"(?<=\.[A-Za-z])(\s|$)(?=[^\s])", ". ", acronym_spaces_as_full_stops
+    )
+
+    acronym_at_end_of_title_suffixed_with_full_stop = re.sub(
+        r"(?<=\..$)",
+        ".",
+        acronym_suffixed_with_a_full_stop,
+    )
+
+    return acronym_at_end_of_title_suffixed_with_full_stop
+
+
+def create_titles(title_count: int) -> list[str]:
+    """
+    Create a reproducible list of titles, around one in ten containing an
+    acronym, and with some titles repeated as they would be in a film library
+    holding several versions of the same film.
+    """
+    randomiser = random.Random(0)
+    titles = []
+
+    for _ in range(title_count):
+        if titles and randomiser.random() < 0.2:
+            titles.append(randomiser.choice(titles))
+            continue
+
+        words = randomiser.choices(TITLE_WORDS, k=randomiser.randint(1, 5))
+        if randomiser.random() < 0.1:
+            acronym = randomiser.choices(string.ascii_letters, k=randomiser.randint(2, 4))
+            acronym_separator = randomiser.choice([" ", "."])
+            words.insert(
+                randomiser.randint(0, len(words)), acronym_separator.join(acronym)
+            )
+        titles.append(" ".join(words))
+
+    return titles
+
+
+def time_function(function, *arguments) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    result = function(*arguments)
+
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--titles", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=5)
+    arguments = parser.parse_args()
+
+    titles = create_titles(arguments.titles)
+    fp = FilmProcessor("", "")
+
+    one_at_a_time_times = []
+    batch_times = []
+    for _ in range(arguments.repeats):
+        one_at_a_time_time, expected_titles = time_function(
+            lambda: [fix_title_if_contains_acronym(title) for title in titles]
+        )
+        batch_time, actual_titles = time_function(
+            fp.fix_titles_if_contain_acronyms, titles
+        )
+        one_at_a_time_times.append(one_at_a_time_time)
+        batch_times.append(batch_time)
+
+        if actual_titles != expected_titles:
+            raise AssertionError("Batch title fix gave different titles")
+
+    print(f"{len(titles)} titles, {len(set(titles))} distinct, output identical")
+    print(f"One at a time: {min(one_at_a_time_times) * 1000:.1f} ms")
+    print(f"Batch:         {min(batch_times) * 1000:.1f} ms")
+    print(f"Speed up:      {min(one_at_a_time_times) / min(batch_times):.1f}x")
+
+
+if __name__ == "__main__":
+    main()